@@ -0,0 +1,193 @@
+"""
+Write-Behind Buffer for Login and Activity Timestamps
+
+Successful logins (``last_login``) and authenticated API calls
+(``last_seen_at``) are recorded in a per-process buffer instead of being
+written to the user row on every request. A background thread flushes the
+buffer every AUTH_ACTIVITY_FLUSH_SECONDS:
+
+- Repeated hits for the same user are coalesced, only the newest
+  timestamp per user and field is kept
+- Postgres: one ``UPDATE auth_user ... FROM (VALUES ...)`` per chunk of
+  FLUSH_CHUNK_SIZE users; other databases: one UPDATE per user in a
+  single transaction
+- Timestamps only move forward (GREATEST), so flushes from several
+  workers can land in any order
+- If the buffer reaches AUTH_ACTIVITY_BUFFER_SIZE users the flusher is
+  woken early (or, without a flusher, the recording request flushes)
+
+Loss window: timestamps are not durable until flushed. A graceful
+shutdown flushes at exit; a crashed or killed worker loses at most the
+last AUTH_ACTIVITY_FLUSH_SECONDS of timestamps it recorded. A failed
+flush puts the rows back and retries on the next tick. No API response
+includes these fields, so a flush does not invalidate the user cache
+(cached User copies may carry older timestamps).
+
+The flusher runs in servers only (enabled by config/wsgi.py and
+config/asgi.py, see background.py), not in management commands or tests.
+
+Related: BET-17 (Database Models and Migrations)
+"""
+
+import threading
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .background import get_flusher
+from .models import User
+
+FIELDS = ('last_login', 'last_seen_at')
+FLUSH_CHUNK_SIZE = 500
+
+
+class ActivityBuffer:
+    """
+    Thread-safe map of user id -> newest (last_login, last_seen_at).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending)
+
+    def record(self, user_id, field, when):
+        """
+        Record ``when`` for ``field`` ('last_login' or 'last_seen_at').
+
+        Returns:
+            int: Number of users pending
+        """
+        index = FIELDS.index(field)
+        with self._lock:
+            entry = self._pending.get(user_id)
+            if entry is None:
+                entry = self._pending[user_id] = [None, None]
+            if entry[index] is None or when > entry[index]:
+                entry[index] = when
+            return len(self._pending)
+
+    def drain(self):
+        """Remove and return all pending rows as {user_id: [last_login, last_seen_at]}."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def restore(self, rows):
+        """Put drained rows back (after a failed flush), keeping newer values."""
+        for user_id, values in rows.items():
+            for field, when in zip(FIELDS, values):
+                if when is not None:
+                    self.record(user_id, field, when)
+
+
+def _update_values(connection, table, rows):
+    """Postgres: one UPDATE ... FROM (VALUES ...) for ``rows``."""
+    qn = connection.ops.quote_name
+    placeholders = ', '.join(['(%s::uuid, %s::timestamptz, %s::timestamptz)'] * len(rows))
+    params = []
+    for user_id, (last_login, last_seen_at) in rows:
+        params.extend([user_id, last_login, last_seen_at])
+    # GREATEST ignores NULLs, so a field missing from the buffer is kept
+    sql = (
+        f'UPDATE {qn(table)} AS u SET '
+        f'{qn("last_login")} = GREATEST(u.{qn("last_login")}, v.last_login), '
+        f'{qn("last_seen_at")} = GREATEST(u.{qn("last_seen_at")}, v.last_seen_at) '
+        f'FROM (VALUES {placeholders}) AS v (id, last_login, last_seen_at) '
+        f'WHERE u.{qn("id")} = v.id'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def _update_rows(alias, rows):
+    """Other databases: one UPDATE per user."""
+    updated = 0
+    for user_id, values in rows:
+        changes = {
+            field: Greatest(Coalesce(F(field), Value(when)), Value(when))
+            for field, when in zip(FIELDS, values)
+            if when is not None
+        }
+        updated += User.objects.using(alias).filter(pk=user_id).update(**changes)
+    return updated
+
+
+def write_activity(pending):
+    """
+    Write drained rows to the user table.
+
+    Args:
+        pending (dict): {user_id: [last_login, last_seen_at]}
+
+    Returns:
+        int: Number of user rows updated
+    """
+    if not pending:
+        return 0
+
+    alias = router.db_for_write(User)
+    connection = connections[alias]
+    rows = sorted(pending.items())
+    updated = 0
+    with transaction.atomic(using=alias):
+        for start in range(0, len(rows), FLUSH_CHUNK_SIZE):
+            chunk = rows[start:start + FLUSH_CHUNK_SIZE]
+            if connection.vendor == 'postgresql':
+                updated += _update_values(connection, User._meta.db_table, chunk)
+            else:
+                updated += _update_rows(alias, chunk)
+    return updated
+
+
+_buffer = ActivityBuffer()
+
+
+def flush():
+    """
+    Write everything buffered in this process.
+
+    On failure the rows are put back for the next flush and the error is
+    re-raised.
+
+    Returns:
+        int: Number of user rows updated
+    """
+    pending = _buffer.drain()
+    try:
+        return write_activity(pending)
+    except Exception:
+        _buffer.restore(pending)
+        raise
+
+
+def _get_flusher():
+    return get_flusher('auth-activity-flusher', flush, settings.AUTH_ACTIVITY_FLUSH_SECONDS)
+
+
+def _record(user_id, field, when):
+    # Token claims carry the id as a string, the login view as a UUID
+    pending = _buffer.record(str(user_id), field, when or timezone.now())
+    flusher = _get_flusher()
+    if flusher is None:
+        if pending >= settings.AUTH_ACTIVITY_BUFFER_SIZE or settings.AUTH_ACTIVITY_FLUSH_SECONDS <= 0:
+            flush()
+    elif pending >= settings.AUTH_ACTIVITY_BUFFER_SIZE:
+        flusher.wake()
+
+
+def record_login(user_id, when=None):
+    """Buffer a successful login for ``user_id`` (sets last_login on flush)."""
+    _record(user_id, 'last_login', when)
+
+
+def record_seen(user_id, when=None):
+    """Buffer an authenticated request for ``user_id`` (sets last_seen_at on flush)."""
+    _record(user_id, 'last_seen_at', when)
@@ -16,8 +16,9 @@ Related: BET-17 (Database Models and Migrations)
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
+from django.utils import timezone
 from django.utils.html import format_html
-from .models import User, PasswordResetToken, AuthUser, AuthAccount, AuthSession
+from .models import User, PasswordResetToken, EmailOutbox, AuthEvent, AuthUser, AuthAccount, AuthSession
 
 
 @admin.register(User)
@@ -76,7 +77,7 @@ class UserAdmin(BaseUserAdmin):
             'fields': ('email_verified', 'email_verified_at'),
         }),
         (_('Important Dates'), {
-            'fields': ('last_login', 'date_joined'),
+            'fields': ('last_login', 'last_seen_at', 'date_joined'),
         }),
     )
 
@@ -101,6 +102,7 @@ class UserAdmin(BaseUserAdmin):
     readonly_fields = [
         'date_joined',
         'last_login',
+        'last_seen_at',
         'email_verified_at',
     ]
 
@@ -197,6 +199,63 @@ class PasswordResetTokenAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    """
+    Admin interface for the transactional email outbox.
+
+    Read-only view of queued emails, used to inspect dead-lettered rows.
+    The "Retry" action puts selected rows back in the queue.
+    """
+
+    list_display = ['user', 'kind', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at']
+    list_filter = ['status', 'kind', 'created_at']
+    search_fields = ['user__email']
+    ordering = ['-created_at']
+    readonly_fields = [
+        'id', 'user', 'kind', 'payload', 'status', 'attempts',
+        'next_attempt_at', 'last_error', 'created_at', 'sent_at',
+    ]
+    actions = ['retry']
+
+    def has_add_permission(self, request):
+        """Disable manual creation (rows are queued by the auth views)."""
+        return False
+
+    @admin.action(description=_('Retry selected emails'))
+    def retry(self, request, queryset):
+        updated = queryset.exclude(status=EmailOutbox.Status.SENT).update(
+            status=EmailOutbox.Status.PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now(),
+        )
+        self.message_user(request, _('%d email(s) queued for retry.') % updated)
+
+
+@admin.register(AuthEvent)
+class AuthEventAdmin(admin.ModelAdmin):
+    """
+    Admin interface for the authentication audit log (read-only).
+    """
+
+    list_display = ['created_at', 'event_type', 'email', 'user_id', 'ip_address']
+    list_filter = ['event_type', 'created_at']
+    search_fields = ['email', 'ip_address']
+    ordering = ['-created_at']
+    date_hierarchy = 'created_at'
+    readonly_fields = ['id', 'created_at', 'event_type', 'user_id', 'email', 'ip_address', 'user_agent']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        """Events expire with their monthly partition (maintain_auth_events)."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 # ==============================================================================
 # OAuth Users Admin (Read-Only)
 # ==============================================================================
@@ -0,0 +1,151 @@
+"""
+Authentication Audit Log Queue
+
+Auth views record events (logins, registrations, password changes and
+resets, email verifications) with ``record_event``. Events are queued in
+process and written to AuthEvent with ``bulk_create`` by a background
+flusher (background.py) every AUTH_AUDIT_FLUSH_SECONDS, so a request
+never waits for an audit INSERT.
+
+- A full batch (AUTH_AUDIT_BATCH_SIZE) wakes the flusher early; without a
+  flusher (management commands, tests) the recording request writes it
+- A failed flush puts the events back; beyond AUTH_AUDIT_QUEUE_SIZE the
+  oldest events are dropped (logged), so a database outage cannot grow
+  the queue without bound
+- Like activity.py, a killed worker loses the events queued since the
+  last flush; a graceful shutdown flushes at exit
+
+Related: BET-30 (Testing y Validación de Seguridad)
+"""
+
+import ipaddress
+import logging
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.throttling import BaseThrottle
+
+from .background import get_flusher
+from .models import AuthEvent
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT_MAX_LENGTH = AuthEvent._meta.get_field('user_agent').max_length
+EMAIL_MAX_LENGTH = AuthEvent._meta.get_field('email').max_length
+
+
+class EventQueue:
+    """Thread-safe bounded FIFO of unsaved AuthEvent instances."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = deque()
+        self.dropped = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._events)
+
+    def put(self, event):
+        """Queue an event. Returns the queue length."""
+        with self._lock:
+            self._events.append(event)
+            self._trim()
+            return len(self._events)
+
+    def drain(self):
+        """Remove and return all queued events, oldest first."""
+        with self._lock:
+            events, self._events = list(self._events), deque()
+        return events
+
+    def restore(self, events):
+        """Put events back in front of newer ones (after a failed flush)."""
+        with self._lock:
+            self._events.extendleft(reversed(events))
+            self._trim()
+
+    def _trim(self):
+        overflow = len(self._events) - settings.AUTH_AUDIT_QUEUE_SIZE
+        if overflow > 0:
+            for _ in range(overflow):
+                self._events.popleft()
+            self.dropped += overflow
+            logger.warning('Audit queue full, dropped %d events', overflow)
+
+
+_queue = EventQueue()
+
+
+def _client_ip(request):
+    # Same client address as the rate limits; anything that is not an IP
+    # (e.g. a malformed X-Forwarded-For) would fail the whole batch
+    ident = BaseThrottle().get_ident(request)
+    try:
+        return str(ipaddress.ip_address(ident))
+    except ValueError:
+        return None
+
+
+def flush():
+    """
+    Write all queued events (bulk_create in AUTH_AUDIT_BATCH_SIZE batches).
+
+    On failure the events are queued again and the error is re-raised.
+
+    Returns:
+        int: Number of events written
+    """
+    events = _queue.drain()
+    if not events:
+        return 0
+    try:
+        AuthEvent.objects.bulk_create(events, batch_size=settings.AUTH_AUDIT_BATCH_SIZE)
+    except Exception:
+        _queue.restore(events)
+        raise
+    return len(events)
+
+
+def _get_flusher():
+    return get_flusher('auth-audit-flusher', flush, settings.AUTH_AUDIT_FLUSH_SECONDS)
+
+
+def record_event(event_type, request, user=None, user_id=None, email=''):
+    """
+    Queue an audit event. No database access unless a batch is written
+    inline (no background flusher).
+
+    Args:
+        event_type (str): AuthEvent.EventType value
+        request: DRF request (client IP and User-Agent)
+        user (User): Subject of the event, if known
+        user_id: User id when only the id is known
+        email (str): Email submitted (defaults to the user's)
+    """
+    if user is not None:
+        user_id = user.pk
+        email = email or user.email
+
+    event = AuthEvent(
+        created_at=timezone.now(),
+        event_type=event_type,
+        user_id=user_id,
+        email=(email or '').strip().lower()[:EMAIL_MAX_LENGTH],
+        ip_address=_client_ip(request),
+        user_agent=request.META.get('HTTP_USER_AGENT', '')[:USER_AGENT_MAX_LENGTH],
+    )
+    queued = _queue.put(event)
+
+    flusher = _get_flusher()
+    if flusher is None:
+        if queued >= settings.AUTH_AUDIT_BATCH_SIZE or settings.AUTH_AUDIT_FLUSH_SECONDS <= 0:
+            try:
+                flush()
+            except Exception:
+                # Never fail the auth flow over the audit log (events are requeued)
+                logger.exception('Audit log flush failed')
+    elif queued >= settings.AUTH_AUDIT_BATCH_SIZE:
+        flusher.wake()
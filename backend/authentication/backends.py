@@ -46,13 +46,15 @@ class EmailBackend(ModelBackend):
         - Uses timing-safe password comparison (check_password)
         - Email lookup is case-insensitive
         - Returns None for invalid credentials (no error details)
+        - Outdated hashes (legacy hashers or old Argon2 parameters) are
+          upgraded on success by User.check_password
         """
         if email is None or password is None:
             return None
 
         try:
-            # Case-insensitive email lookup
-            user = User.objects.get(email__iexact=email)
+            # Case-insensitive email lookup (canonical form, uses the unique index)
+            user = User.objects.get_by_email(email)
         except User.DoesNotExist:
             # User not found - run password hasher to prevent timing attacks
             User().set_password(password)
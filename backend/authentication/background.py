@@ -0,0 +1,110 @@
+"""
+Background Flushers
+
+In-process buffers (activity.py timestamps, audit.py events) are written
+to the database by daemon threads instead of by the requests that fill
+them.
+
+- Flushers only run once enabled by ``start_flushers()``, which the
+  WSGI/ASGI entry points call. Management commands and tests never start
+  threads; there the buffers flush inline when full
+- Each flusher is created on first use and re-created in forked workers
+  (threads do not survive fork, e.g. ``gunicorn --preload``)
+- Every flusher runs a final flush at interpreter exit
+
+Related: BET-18 (Backend API Endpoints)
+"""
+
+import atexit
+import logging
+import os
+import threading
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicFlusher:
+    """
+    Daemon thread calling ``flush`` every ``interval`` seconds (or when
+    woken), and once more at interpreter exit.
+    """
+
+    def __init__(self, flush, interval, name):
+        self._flush = flush
+        self.interval = interval
+        self.name = name
+        self.pid = os.getpid()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def wake(self):
+        """Flush now instead of waiting for the next tick."""
+        self._wake.set()
+
+    def stop(self):
+        """Stop the thread and run a final flush in the caller."""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join(timeout=self.interval)
+        self._run_once()
+
+    @property
+    def alive(self):
+        return self.pid == os.getpid() and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stopped.is_set():
+                break
+            self._run_once()
+
+    def _run_once(self):
+        close_old_connections()
+        try:
+            self._flush()
+        except Exception:
+            logger.exception('%s flush failed', self.name)
+        finally:
+            close_old_connections()
+
+
+_enabled = False
+_flushers = {}
+_lock = threading.Lock()
+
+
+def start_flushers():
+    """Allow background flushers in this process (servers only)."""
+    global _enabled
+    _enabled = True
+
+
+def get_flusher(name, flush, interval):
+    """
+    Return the running flusher ``name``, starting it if needed.
+
+    Returns:
+        PeriodicFlusher: Or None if flushers are not enabled or
+        ``interval`` is 0 (caller writes inline)
+    """
+    if not _enabled or interval <= 0:
+        return None
+    flusher = _flushers.get(name)
+    if flusher is None or not flusher.alive:
+        with _lock:
+            flusher = _flushers.get(name)
+            if flusher is None or not flusher.alive:
+                flusher = _flushers[name] = PeriodicFlusher(flush, interval, name).start()
+    return flusher
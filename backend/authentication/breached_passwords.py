@@ -0,0 +1,244 @@
+"""
+Offline Breached-Password Check
+
+BreachedPasswordValidator rejects passwords whose SHA-1 appears in a local
+breached-password corpus (e.g. the Pwned Passwords SHA-1 list), without
+calling any external service.
+
+Index file (BREACHED_PASSWORDS_FILE), built by
+``python manage.py build_breached_password_index``:
+- 24-byte header: magic, record width, record count
+- ``count`` SHA-1 prefixes of ``width`` bytes, sorted and unique
+
+Lookups memory-map the file read-only and binary-search it: about
+log2(count) page reads (~30 for hundreds of millions of entries), served
+from the OS page cache shared by every worker, so no worker loads the
+corpus into its own memory. With 8-byte prefixes a false positive needs a
+64-bit collision.
+
+The index is opened once per process: restart the workers after
+rebuilding it. A missing index disables the check (logged once).
+
+Related: BET-30 (Testing y Validación de Seguridad)
+"""
+
+import hashlib
+import heapq
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext as _
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'BRPWIDX1'
+HEADER = struct.Struct('<8sI4xQ')  # magic, record width, padding, record count
+SHA1_SIZE = hashlib.sha1().digest_size
+
+
+class BreachedHashIndex:
+    """
+    Read-only memory-mapped index of sorted fixed-width SHA-1 prefixes.
+
+    Args:
+        path (str): Index file written by ``write_index``
+
+    Raises:
+        ValueError: Not an index file, or truncated
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < HEADER.size:
+            raise ValueError(f'{path} is not a breached password index')
+        magic, self.width, self.count = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or not 1 <= self.width <= SHA1_SIZE:
+            raise ValueError(f'{path} is not a breached password index')
+        if len(self._mm) != HEADER.size + self.width * self.count:
+            raise ValueError(f'{path} is truncated')
+
+        if hasattr(self._mm, 'madvise'):
+            # Lookups jump around the file: no readahead
+            self._mm.madvise(mmap.MADV_RANDOM)
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, digest):
+        """True if the SHA-1 ``digest`` (bytes) is in the index."""
+        key = digest[:self.width]
+        mm, width, start = self._mm, self.width, HEADER.size
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = start + mid * width
+            record = mm[offset:offset + width]
+            if record < key:
+                lo = mid + 1
+            elif record > key:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def close(self):
+        self._mm.close()
+
+
+@lru_cache(maxsize=None)
+def get_index(path):
+    """
+    Open (once per process) the index at ``path``.
+
+    Returns:
+        BreachedHashIndex: Or None if the file does not exist or is invalid
+    """
+    try:
+        return BreachedHashIndex(path)
+    except FileNotFoundError:
+        logger.warning('Breached password index not found, check disabled: %s', path)
+    except (OSError, ValueError):
+        logger.error('Invalid breached password index: %s', path, exc_info=True)
+    return None
+
+
+def parse_hash(line, width):
+    """
+    Extract the ``width``-byte prefix from a corpus line.
+
+    Accepts ``<hex SHA-1>`` or ``<hex SHA-1>:<count>`` (Pwned Passwords).
+
+    Returns:
+        bytes: Prefix, or None if the line is not a hash of at least
+        ``width`` bytes
+    """
+    value = line.split(':', 1)[0].strip()
+    if len(value) < width * 2 or len(value) > SHA1_SIZE * 2:
+        return None
+    try:
+        return bytes.fromhex(value[:width * 2])
+    except ValueError:
+        return None
+
+
+def _write_run(keys, directory):
+    keys.sort()
+    run = tempfile.TemporaryFile(dir=directory)
+    previous = None
+    for key in keys:
+        if key != previous:
+            run.write(key)
+            previous = key
+    run.seek(0)
+    return run
+
+
+def _read_run(run, width, chunk_records=65536):
+    while True:
+        chunk = run.read(width * chunk_records)
+        if not chunk:
+            return
+        for offset in range(0, len(chunk), width):
+            yield chunk[offset:offset + width]
+
+
+def write_index(lines, output, width=8, run_size=5_000_000):
+    """
+    Build an index file from corpus lines (external merge sort).
+
+    Prefixes are sorted in runs of ``run_size`` in memory, spilled to
+    temporary files next to ``output``, then merged and deduplicated.
+    The file is written to a temporary name and renamed into place, so
+    running workers keep their current mapping until restarted.
+
+    Args:
+        lines (iterable): Corpus lines (see parse_hash)
+        output (str): Index file to write
+        width (int): Bytes kept per SHA-1 (1-20)
+        run_size (int): Prefixes sorted in memory at a time
+
+    Returns:
+        tuple: (records written, lines skipped as invalid)
+    """
+    if not 1 <= width <= SHA1_SIZE:
+        raise ValueError(f'width must be between 1 and {SHA1_SIZE}')
+
+    directory = os.path.dirname(os.path.abspath(output))
+    runs, keys, skipped = [], [], 0
+    try:
+        for line in lines:
+            key = parse_hash(line, width)
+            if key is None:
+                if line.strip():
+                    skipped += 1
+                continue
+            keys.append(key)
+            if len(keys) >= run_size:
+                runs.append(_write_run(keys, directory))
+                keys = []
+        if keys or not runs:
+            runs.append(_write_run(keys, directory))
+        keys = None
+
+        fd, temporary = tempfile.mkstemp(dir=directory, prefix='.breached-')
+        try:
+            count, previous = 0, None
+            with os.fdopen(fd, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, width, 0))
+                for key in heapq.merge(*(_read_run(run, width) for run in runs)):
+                    if key != previous:
+                        f.write(key)
+                        previous = key
+                        count += 1
+                f.seek(0)
+                f.write(HEADER.pack(MAGIC, width, count))
+            os.chmod(temporary, 0o644)  # mkstemp creates 0600
+            os.replace(temporary, output)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+    finally:
+        for run in runs:
+            run.close()
+
+    return count, skipped
+
+
+class BreachedPasswordValidator:
+    """
+    Reject passwords found in the breached-password index.
+
+    Usage:
+        # In settings.py
+        AUTH_PASSWORD_VALIDATORS = [
+            ...
+            {'NAME': 'authentication.breached_passwords.BreachedPasswordValidator'},
+        ]
+
+    Args:
+        index_file (str): Index path (default: BREACHED_PASSWORDS_FILE)
+    """
+
+    def __init__(self, index_file=None):
+        self.index_file = index_file
+
+    def validate(self, password, user=None):
+        index = get_index(str(self.index_file or settings.BREACHED_PASSWORDS_FILE))
+        if index is None:
+            return
+        if hashlib.sha1(password.encode('utf-8')).digest() in index:
+            raise ValidationError(
+                _('This password has appeared in a data breach.'),
+                code='password_breached',
+            )
+
+    def get_help_text(self):
+        return _('Your password can’t be one that has appeared in a known data breach.')
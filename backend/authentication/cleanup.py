@@ -0,0 +1,79 @@
+"""
+Token Table Cleanup
+
+Prunes expired and used rows from the legacy token tables
+(PasswordResetToken, EmailVerificationToken) without long locks:
+
+- Keyset pagination on the primary key: each batch selects the next
+  ``batch_size`` prunable ids after the last one seen (index range scan,
+  no OFFSET, no COUNT)
+- One raw ``DELETE ... WHERE id IN (...)`` per batch in its own short
+  transaction. Nothing references the token tables, so Django's
+  collector (which loads every object for cascades/signals) is skipped
+- Optional sleep between batches to leave room for production traffic
+
+Used by the ``cleanup_auth_tokens`` management command.
+
+Related: BET-17 (Database Models and Migrations)
+"""
+
+import time
+
+from django.db import connections, router, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+
+def prunable(model, now):
+    """Rows that can be deleted: expired or already used."""
+    return model.objects.filter(Q(expires_at__lt=now) | Q(is_used=True))
+
+
+def prune_tokens(model, batch_size=1000, sleep=0.0, now=None, progress=None):
+    """
+    Delete expired and used tokens of ``model`` in keyset-paginated batches.
+
+    Args:
+        model: Token model (must have expires_at and is_used)
+        batch_size (int): Rows deleted per statement
+        sleep (float): Seconds to pause between batches
+        now (datetime): Expiry cutoff (default: now)
+        progress (callable): Called as progress(model, deleted_in_batch, total)
+
+    Returns:
+        int: Number of rows deleted
+    """
+    now = now or timezone.now()
+    alias = router.db_for_write(model)
+    connection = connections[alias]
+    table = connection.ops.quote_name(model._meta.db_table)
+    pk_field = model._meta.pk
+    pk_column = connection.ops.quote_name(pk_field.column)
+
+    total = 0
+    last_pk = None
+    while True:
+        batch = prunable(model, now).using(alias)
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        pks = list(batch.order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            break
+
+        params = [pk_field.get_db_prep_value(pk, connection) for pk in pks]
+        placeholders = ', '.join(['%s'] * len(params))
+        with transaction.atomic(using=alias), connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {table} WHERE {pk_column} IN ({placeholders})', params)
+            deleted = cursor.rowcount
+
+        total += deleted
+        last_pk = pks[-1]
+        if progress:
+            progress(model, deleted, total)
+
+        if len(pks) < batch_size:
+            break
+        if sleep:
+            time.sleep(sleep)
+
+    return total
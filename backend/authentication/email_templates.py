@@ -0,0 +1,194 @@
+"""
+Precompiled Email Templates
+
+This module renders the transactional emails sent by email_service.
+
+Templates live in templates/emails/:
+- layout.html: shared document (header, inline styles, footer slot)
+- <locale>/<name>.html: first line ``Subject: ...``, then the message body
+- <locale>/footer.html: footer text
+
+Compilation (once per process and (name, locale), cached):
+- The message and footer are inserted into the layout and the result is
+  minified (comments and indentation whitespace removed)
+- The result is split at its $placeholders into literal chunks, so a
+  render only joins the chunks with the HTML-escaped values
+Workers must be restarted to pick up template changes.
+
+Related: BET-29 (Email Service)
+"""
+
+import html
+import re
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+
+from django.conf import settings
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / 'templates' / 'emails'
+
+SUPPORTED_LOCALES = ('es', 'en')
+
+_COMMENT_RE = re.compile(r'<!--.*?-->', re.S)
+_BETWEEN_TAGS_RE = re.compile(r'>\s+<')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def minify_html(source):
+    """Remove HTML comments and collapse whitespace (no <pre> in emails)."""
+    source = _COMMENT_RE.sub('', source)
+    source = _BETWEEN_TAGS_RE.sub('><', source)
+    return _WHITESPACE_RE.sub(' ', source).strip()
+
+
+def _match_locale(locale):
+    if locale in SUPPORTED_LOCALES:
+        return locale
+    if locale:
+        primary = re.split(r'[-_]', locale.lower(), maxsplit=1)[0]
+        if primary in SUPPORTED_LOCALES:
+            return primary
+    return None
+
+
+def resolve_locale(locale=None):
+    """
+    Map a language code (``es``, ``en-US``, ``es_MX``) to a supported locale.
+
+    Falls back to settings.EMAIL_DEFAULT_LOCALE.
+    """
+    return _match_locale(locale) or settings.EMAIL_DEFAULT_LOCALE
+
+
+def locale_from_request(request):
+    """
+    Email locale for the client that made ``request``.
+
+    Languages in the Accept-Language header are tried in preference (q)
+    order; falls back to settings.EMAIL_DEFAULT_LOCALE.
+    """
+    languages = []
+    for index, item in enumerate(request.META.get('HTTP_ACCEPT_LANGUAGE', '').split(',')):
+        code, _, params = item.partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                continue
+        if quality > 0:
+            languages.append((-quality, index, code.strip()))
+
+    for _, _, code in sorted(languages):
+        locale = _match_locale(code)
+        if locale:
+            return locale
+    return resolve_locale()
+
+
+class CompiledEmail:
+    """
+    A message compiled into its layout.
+
+    The subject and HTML are split once into literal chunks and
+    placeholder slots, so a render only fills the slots and joins.
+    """
+
+    def __init__(self, subject, html_template):
+        self.subject = self._split(subject)
+        self.html = self._split(html_template)
+
+    @staticmethod
+    def _split(source):
+        """Split string.Template syntax into (chunks, [(index, name), ...])."""
+        chunks, slots = [], []
+        literal, position = [], 0
+        for match in Template.pattern.finditer(source):
+            literal.append(source[position:match.start()])
+            position = match.end()
+            if match.group('escaped') is not None:
+                literal.append('$')
+                continue
+            name = match.group('named') or match.group('braced')
+            if name is None:
+                raise ValueError(f'Invalid placeholder in email template at offset {match.start()}')
+            chunks.append(''.join(literal))
+            literal = []
+            slots.append((len(chunks), name))
+            chunks.append(None)
+        literal.append(source[position:])
+        chunks.append(''.join(literal))
+        return chunks, slots
+
+    @staticmethod
+    def _fill(compiled, values):
+        chunks, slots = compiled
+        parts = chunks.copy()
+        for index, name in slots:
+            parts[index] = values[name]
+        return ''.join(parts)
+
+    def render(self, **context):
+        """
+        Render the message.
+
+        Values are HTML-escaped in the body; the subject is plain text.
+
+        Returns:
+            tuple: (subject, html)
+
+        Raises:
+            KeyError: A placeholder has no value
+        """
+        context.setdefault('year', date.today().year)
+        plain = {key: str(value) for key, value in context.items()}
+        escaped = {key: html.escape(value) for key, value in plain.items()}
+        return self._fill(self.subject, plain), self._fill(self.html, escaped)
+
+
+@lru_cache(maxsize=None)
+def _layout():
+    # Comments are dropped first: the layout's own comment mentions ${...}
+    return Template(minify_html((TEMPLATE_DIR / 'layout.html').read_text(encoding='utf-8')))
+
+
+@lru_cache(maxsize=None)
+def get_template(name, locale):
+    """
+    Compile (once) and return the template for a message and locale.
+
+    Args:
+        name (str): Message name (password_reset, email_verification, ...)
+        locale (str): Supported locale
+
+    Returns:
+        CompiledEmail
+    """
+    locale_dir = TEMPLATE_DIR / locale
+    first_line, _, body = (locale_dir / f'{name}.html').read_text(encoding='utf-8').partition('\n')
+    if not first_line.startswith('Subject:'):
+        raise ValueError(f'Email template {locale}/{name}.html must start with "Subject:"')
+
+    footer = (locale_dir / 'footer.html').read_text(encoding='utf-8')
+    # Inserted values are not re-scanned, so the message placeholders
+    # ($user_name, ...) survive for render time
+    document = _layout().substitute(lang=locale, content=body, footer=footer)
+    return CompiledEmail(first_line[len('Subject:'):].strip(), minify_html(document))
+
+
+def render_email(name, locale=None, **context):
+    """
+    Render a transactional email.
+
+    Args:
+        name (str): Message name (template file name without .html)
+        locale (str): Language code, defaults to EMAIL_DEFAULT_LOCALE
+        **context: Placeholder values
+
+    Returns:
+        tuple: (subject, html)
+    """
+    return get_template(name, resolve_locale(locale)).render(**context)
@@ -0,0 +1,209 @@
+"""
+Email Transport for the Resend API
+
+This module contains the HTTP transport used by email_service to deliver
+emails through Resend's REST API.
+
+ResendTransport:
+- One persistent requests.Session per process: connections are kept alive
+  and reused from a pool, so only the first email pays the TCP + TLS
+  handshake
+- Separate connect / read timeouts (a hung provider never blocks a worker)
+- Circuit breaker: after EMAIL_CIRCUIT_FAILURE_THRESHOLD consecutive
+  failures the circuit opens and sends fail immediately with CircuitOpen
+  for EMAIL_CIRCUIT_RESET_SECONDS; then a single trial request decides
+  whether to close it again
+
+The API base URL is configurable (RESEND_API_URL), which also lets
+benchmarks/email_stub_server.py stand in for Resend offline.
+
+Related: BET-29 (Email Service)
+"""
+
+import logging
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class EmailTransportError(Exception):
+    """The email provider did not accept the request."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class CircuitOpen(EmailTransportError):
+    """
+    The circuit breaker is open: the provider is considered down.
+
+    ``retry_after`` is the number of seconds until the breaker lets a
+    trial request through.
+    """
+
+    def __init__(self, message, retry_after=0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker (closed -> open -> half-open).
+
+    Thread-safe; shared by all threads of a process.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold, reset_timeout, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def before_request(self):
+        """Raise CircuitOpen unless a request may be attempted now."""
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                # Let exactly one request probe the provider
+                self._trial_in_flight = True
+                return
+            # Half-open with a trial in flight: check back shortly
+            retry_after = max(self.reset_timeout - (self._clock() - self._opened_at), 1)
+        raise CircuitOpen('Email provider circuit is open', retry_after=retry_after)
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning('Email provider circuit opened', extra={'failures': self._failures})
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+
+class ResendTransport:
+    """
+    Pooled keep-alive client for POST {api_url}/emails.
+
+    Args:
+        api_url (str): API base URL (https://api.resend.com)
+        api_key (str): Resend API key
+        connect_timeout (float): Seconds to establish a connection
+        read_timeout (float): Seconds to wait for the response
+        pool_size (int): Connections kept alive per host
+        breaker (CircuitBreaker): Shared circuit breaker
+    """
+
+    def __init__(self, api_url, api_key, connect_timeout, read_timeout, pool_size, breaker):
+        self.url = f"{api_url.rstrip('/')}/emails"
+        self.timeout = (connect_timeout, read_timeout)
+        self.breaker = breaker
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': 'application/json',
+        })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def send(self, params):
+        """
+        Send one email.
+
+        Args:
+            params (dict): Resend email payload (from, to, subject, html)
+
+        Returns:
+            dict: Provider response (contains the email ``id``)
+
+        Raises:
+            CircuitOpen: Provider is down, request not attempted
+            EmailTransportError: Request failed or was rejected
+        """
+        self.breaker.before_request()
+
+        try:
+            response = self.session.post(self.url, json=params, timeout=self.timeout)
+        except Exception as e:
+            # Timeouts, connection errors (and anything unexpected, so a
+            # half-open trial is never left in flight)
+            self.breaker.record_failure()
+            raise EmailTransportError(f'Email provider unreachable: {e}') from e
+
+        if response.status_code >= 500 or response.status_code == 429:
+            # Provider-side trouble: counts towards opening the circuit
+            self.breaker.record_failure()
+            raise EmailTransportError(
+                f'Email provider error {response.status_code}', status_code=response.status_code
+            )
+
+        # Any other answer means the provider is up
+        self.breaker.record_success()
+        if response.status_code >= 400:
+            raise EmailTransportError(
+                f'Email rejected {response.status_code}: {response.text[:200]}',
+                status_code=response.status_code,
+            )
+        return response.json()
+
+    def close(self):
+        self.session.close()
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport():
+    """Return the process-wide ResendTransport (created on first use)."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = ResendTransport(
+                    api_url=settings.RESEND_API_URL,
+                    api_key=settings.RESEND_API_KEY,
+                    connect_timeout=settings.EMAIL_TRANSPORT_CONNECT_TIMEOUT,
+                    read_timeout=settings.EMAIL_TRANSPORT_READ_TIMEOUT,
+                    pool_size=settings.EMAIL_TRANSPORT_POOL_SIZE,
+                    breaker=CircuitBreaker(
+                        failure_threshold=settings.EMAIL_CIRCUIT_FAILURE_THRESHOLD,
+                        reset_timeout=settings.EMAIL_CIRCUIT_RESET_SECONDS,
+                    ),
+                )
+    return _transport
@@ -0,0 +1,66 @@
+"""
+Password Hashers
+
+This module contains the project's Argon2id hasher with host-calibrated
+parameters.
+
+CalibratedArgon2PasswordHasher:
+- Reads time_cost / memory_cost / parallelism from ARGON2_PARAMETERS_FILE,
+  written by ``python manage.py calibrate_argon2``
+- Falls back to Django's Argon2 defaults when the file does not exist
+- Uses the same ``argon2`` algorithm identifier as Django's hasher, so
+  existing hashes keep verifying. Hashes made with other parameters (or
+  with the legacy PBKDF2/bcrypt hashers) are upgraded on the next
+  successful login through ``User.check_password``.
+
+Related: BET-18 (Backend API Endpoints)
+"""
+
+import json
+import logging
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+logger = logging.getLogger(__name__)
+
+PARAMETER_NAMES = ('time_cost', 'memory_cost', 'parallelism')
+
+
+@lru_cache(maxsize=None)
+def load_argon2_parameters(path):
+    """
+    Load calibrated Argon2 parameters from a JSON file.
+
+    Cached per process: workers must be restarted after recalibrating.
+
+    Args:
+        path (str): Path to the parameters file
+
+    Returns:
+        dict: time_cost, memory_cost and parallelism (empty if no file)
+    """
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError):
+        logger.error('Invalid Argon2 parameters file: %s', path, exc_info=True)
+        return {}
+
+    return {name: int(data[name]) for name in PARAMETER_NAMES if name in data}
+
+
+class CalibratedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id hasher using the parameters calibrated for this host.
+    """
+
+    def params(self):
+        calibrated = load_argon2_parameters(str(settings.ARGON2_PARAMETERS_FILE))
+        params = super().params()
+        for name, value in calibrated.items():
+            setattr(params, name, value)
+        return params
@@ -0,0 +1,201 @@
+"""
+Password Hashing Service
+
+This module offloads Argon2id hashing and verification to a bounded
+process pool, so password work does not run inline in the request thread.
+
+Features:
+- Process pool sized to the host (PASSWORD_HASHING_WORKERS, default: CPU count)
+- Queue-depth limit (PASSWORD_HASHING_MAX_PENDING): when saturated, requests
+  fail fast with 503 instead of queueing behind each other. A hash counts
+  until it leaves the pool, even if its request timed out
+- Same semantics as django.contrib.auth.hashers (rehash on login, timing
+  hardening for unknown users)
+
+Usage:
+    from authentication.hashing import get_hashing_service
+
+    encoded = get_hashing_service().make_password('SecurePass123')
+    get_hashing_service().check_password('SecurePass123', encoded, setter)
+
+Setting PASSWORD_HASHING_WORKERS=0 disables the pool (hash inline).
+
+Related: BET-18 (Backend API Endpoints)
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+logger = logging.getLogger(__name__)
+
+
+class HashingServiceBusy(APIException):
+    """Raised when the hashing pool is saturated (returned as 503)."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Service temporarily unavailable. Please try again shortly.'
+    default_code = 'hashing_service_busy'
+
+
+def _init_worker():
+    """Set up Django in pool workers so the configured hashers are available."""
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    django.setup()
+
+
+def _make_password(password):
+    return hashers.make_password(password)
+
+
+def _verify_password(password, encoded):
+    return hashers.verify_password(password, encoded)
+
+
+class PasswordHashingService:
+    """
+    Bounded process pool for password hashing.
+
+    Args:
+        max_workers (int): Pool size (0 hashes inline in the calling thread)
+        max_pending (int): Maximum hashes in flight (running + queued)
+        timeout (float): Seconds to wait for a result before giving up
+    """
+
+    def __init__(self, max_workers, max_pending, timeout):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(max_pending, 1))
+        if max_pending < 1:
+            # No capacity at all: every request is rejected
+            self._slots.acquire()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # forkserver: workers never inherit the request threads' locks
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('forkserver'),
+                    initializer=_init_worker,
+                )
+            return self._executor
+
+    def _discard_executor(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, func, *args):
+        if not self.max_workers:
+            return func(*args)
+
+        # Fail fast instead of queueing when the pool is saturated
+        if not self._slots.acquire(blocking=False):
+            logger.warning('Password hashing pool saturated, rejecting request')
+            raise HashingServiceBusy()
+
+        executor = self._get_executor()
+        try:
+            future = executor.submit(func, *args)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._restart_pool(executor)
+            raise HashingServiceBusy()
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is held until the task leaves the pool, not until this
+        # request stops waiting: a timed-out hash still occupies a worker
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            # The request thread only waits on the future (GIL released),
+            # so other requests on this worker keep being served.
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            logger.error('Password hashing timed out after %ss', self.timeout)
+            raise HashingServiceBusy()
+        except BrokenProcessPool:
+            self._restart_pool(executor)
+            raise HashingServiceBusy()
+
+    def _restart_pool(self, executor):
+        logger.error('Password hashing pool broken, restarting', exc_info=True)
+        self._discard_executor(executor)
+
+    def make_password(self, password):
+        """
+        Hash a password with the preferred hasher.
+
+        Args:
+            password (str): Raw password (None creates an unusable password)
+
+        Returns:
+            str: Encoded password hash
+        """
+        if password is None:
+            # Unusable password: no hashing work involved
+            return hashers.make_password(None)
+        return self._run(_make_password, password)
+
+    def check_password(self, password, encoded, setter=None):
+        """
+        Check a raw password against an encoded hash.
+
+        Args:
+            password (str): Raw password
+            encoded (str): Encoded password hash
+            setter (callable): Called with the raw password when the hash
+                must be upgraded (outdated hasher or parameters)
+
+        Returns:
+            bool: True if the password matches
+        """
+        is_correct, must_update = self._run(_verify_password, password, encoded)
+        if setter and is_correct and must_update:
+            setter(password)
+        return is_correct
+
+    def shutdown(self):
+        """Stop the worker processes (used on process exit and in tests)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_hashing_service():
+    """
+    Return the process-wide hashing service, creating it on first use.
+
+    The pool is created lazily so each gunicorn/uvicorn worker gets its own.
+    """
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = PasswordHashingService(
+                    max_workers=settings.PASSWORD_HASHING_WORKERS,
+                    max_pending=settings.PASSWORD_HASHING_MAX_PENDING,
+                    timeout=settings.PASSWORD_HASHING_TIMEOUT_SECONDS,
+                )
+    return _service
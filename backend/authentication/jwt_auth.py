@@ -0,0 +1,77 @@
+"""
+JWT Authentication with a cached user loader
+
+CachedJWTAuthentication is a drop-in replacement for simplejwt's
+JWTAuthentication that loads the user through authentication.user_cache
+instead of querying the database on every authenticated request.
+
+It also rejects revoked tokens (authentication.revocation). The revocation
+check and the user version lookup share one cache round trip.
+
+Each authenticated request is recorded as the user's last_seen_at through
+the write-behind buffer in authentication.activity (no write per request).
+
+Related: BET-18 (Backend API Endpoints)
+"""
+
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from . import user_cache
+from .activity import record_seen
+from .revocation import revoked_key
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that serves the user from cache.
+
+    Usage:
+        # In settings.py
+        REST_FRAMEWORK = {
+            'DEFAULT_AUTHENTICATION_CLASSES': (
+                'authentication.jwt_auth.CachedJWTAuthentication',
+            ),
+        }
+    """
+
+    def get_user(self, validated_token):
+        """
+        Return the user for a validated token (same checks as simplejwt,
+        plus the revocation check).
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            ) from e
+
+        revoked = revoked_key(validated_token[api_settings.JTI_CLAIM])
+        version = user_cache.version_key(user_id)
+        values = cache.get_many([revoked, version])
+
+        if revoked in values:
+            raise AuthenticationFailed(_('Token has been revoked'), code='token_revoked')
+
+        user = user_cache.get_user(user_id, version=values.get(version))
+        if user is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code='password_changed'
+                )
+
+        record_seen(user.pk)
+        return user
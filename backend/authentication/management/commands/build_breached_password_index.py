@@ -0,0 +1,70 @@
+"""
+Build the breached-password index used by BreachedPasswordValidator.
+
+Usage:
+    python manage.py build_breached_password_index pwned-passwords-sha1-ordered-by-hash.txt
+    python manage.py build_breached_password_index part1.txt.gz part2.txt --width 6 --output /srv/breached.bin
+
+Input: one SHA-1 per line in hex, optionally followed by ``:<count>``
+(the Pwned Passwords format); ``.gz`` files are read compressed. The
+output is a sorted fixed-width binary file (see
+authentication.breached_passwords), written atomically. Restart the
+application workers afterwards.
+"""
+
+import gzip
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.breached_passwords import SHA1_SIZE, write_index
+
+
+class Command(BaseCommand):
+    help = 'Convert a breached SHA-1 corpus into the memory-mapped lookup index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('sources', nargs='+', help='Corpus files (.txt or .txt.gz)')
+        parser.add_argument(
+            '--output', default=str(settings.BREACHED_PASSWORDS_FILE),
+            help='Index file to write (default: BREACHED_PASSWORDS_FILE)',
+        )
+        parser.add_argument(
+            '--width', type=int, default=8,
+            help='Bytes kept per SHA-1, 8 makes false positives negligible (default: 8)',
+        )
+        parser.add_argument(
+            '--run-size', type=int, default=5_000_000,
+            help='Hashes sorted in memory at a time (default: 5000000)',
+        )
+
+    def handle(self, *args, **options):
+        if not 1 <= options['width'] <= SHA1_SIZE:
+            raise CommandError(f'--width must be between 1 and {SHA1_SIZE}.')
+        if options['run_size'] < 1:
+            raise CommandError('--run-size must be at least 1.')
+
+        start = time.monotonic()
+        count, skipped = write_index(
+            self.read_lines(options['sources']),
+            options['output'],
+            width=options['width'],
+            run_size=options['run_size'],
+        )
+
+        if skipped:
+            self.stderr.write(self.style.WARNING(f'Skipped {skipped} lines that are not SHA-1 hashes.'))
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {count} hashes to {options['output']} in {time.monotonic() - start:.1f}s. "
+            'Restart the workers to load the new index.'
+        ))
+
+    def read_lines(self, sources):
+        for source in sources:
+            opener = gzip.open if source.endswith('.gz') else open
+            try:
+                with opener(source, 'rt', encoding='ascii', errors='replace') as f:
+                    yield from f
+            except FileNotFoundError as e:
+                raise CommandError(f'Corpus file not found: {source}') from e
@@ -0,0 +1,168 @@
+"""
+Calibrate Argon2id parameters for the current host.
+
+Benchmarks time_cost / memory_cost / parallelism against a target latency
+budget and writes the result to ARGON2_PARAMETERS_FILE, which is read by
+authentication.hashers.CalibratedArgon2PasswordHasher.
+
+Usage:
+    python manage.py calibrate_argon2 --target-ms 250
+    python manage.py calibrate_argon2 --target-ms 300 --max-memory 65536 --dry-run
+
+After writing the file, restart the application workers. Existing hashes
+are upgraded to the new parameters on each user's next successful login.
+"""
+
+import json
+import os
+import platform
+import statistics
+import time
+
+from argon2.low_level import Type, hash_secret_raw
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+# OWASP minimum recommendation for Argon2id: 19 MiB
+MIN_MEMORY_KIB = 19456
+
+
+class Command(BaseCommand):
+    help = 'Benchmark Argon2id on this host and write calibrated hasher parameters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target-ms', type=float, default=250,
+            help='Latency budget for a single hash in milliseconds (default: 250)',
+        )
+        parser.add_argument(
+            '--max-memory', type=int, default=102400,
+            help='Upper bound for memory_cost in KiB (default: 102400)',
+        )
+        parser.add_argument(
+            '--max-time-cost', type=int, default=10,
+            help='Upper bound for time_cost (default: 10)',
+        )
+        parser.add_argument(
+            '--parallelism', type=int, nargs='+', default=[1, 2],
+            help='Parallelism candidates to benchmark (default: 1 2)',
+        )
+        parser.add_argument(
+            '--samples', type=int, default=3,
+            help='Hashes per measurement, the median is used (default: 3)',
+        )
+        parser.add_argument(
+            '--output', default=str(settings.ARGON2_PARAMETERS_FILE),
+            help='Parameters file to write (default: ARGON2_PARAMETERS_FILE)',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Print the calibrated parameters without writing the file',
+        )
+
+    def handle(self, *args, **options):
+        target_ms = options['target_ms']
+        if target_ms <= 0:
+            raise CommandError('--target-ms must be positive.')
+        if options['max_memory'] < MIN_MEMORY_KIB:
+            raise CommandError(f'--max-memory must be at least {MIN_MEMORY_KIB} KiB.')
+
+        cpu_count = os.cpu_count() or 1
+        candidates = sorted({p for p in options['parallelism'] if 1 <= p <= cpu_count}) or [1]
+
+        results = []
+        for parallelism in candidates:
+            result = self.calibrate(
+                parallelism,
+                target_ms,
+                options['max_memory'],
+                options['max_time_cost'],
+                options['samples'],
+            )
+            self.stdout.write(
+                f"p={parallelism}: time_cost={result['time_cost']} "
+                f"memory_cost={result['memory_cost']} KiB -> {result['measured_ms']:.1f} ms"
+            )
+            results.append(result)
+
+        within_budget = [r for r in results if r['measured_ms'] <= target_ms] or results
+        # Hashing strength per core: each login occupies `parallelism` cores
+        best = max(
+            within_budget,
+            key=lambda r: (r['time_cost'] * r['memory_cost'] / r['parallelism'], -r['parallelism']),
+        )
+        if best['measured_ms'] > target_ms:
+            self.stderr.write(self.style.WARNING(
+                f'Minimum parameters take {best["measured_ms"]:.1f} ms, above the '
+                f'{target_ms:.0f} ms budget on this host.'
+            ))
+
+        config = {
+            'time_cost': best['time_cost'],
+            'memory_cost': best['memory_cost'],
+            'parallelism': best['parallelism'],
+            'measured_ms': round(best['measured_ms'], 1),
+            'target_ms': target_ms,
+            'host': platform.node(),
+            'cpu_count': cpu_count,
+            'calibrated_at': timezone.now().isoformat(),
+        }
+
+        if options['dry_run']:
+            self.stdout.write(json.dumps(config, indent=2))
+            return
+
+        with open(options['output'], 'w') as f:
+            json.dump(config, f, indent=2)
+            f.write('\n')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {options['output']}: time_cost={config['time_cost']} "
+            f"memory_cost={config['memory_cost']} parallelism={config['parallelism']}. "
+            'Restart the workers to apply; existing hashes upgrade on next login.'
+        ))
+
+    def calibrate(self, parallelism, target_ms, max_memory, max_time_cost, samples):
+        """
+        Find the strongest (memory_cost, time_cost) within the budget.
+
+        Memory is preferred over passes: start at max_memory and halve it only
+        if a single pass does not fit, then add passes while they fit.
+        """
+        memory_cost = max_memory
+        single_pass_ms = self.measure(1, memory_cost, parallelism, samples)
+        while single_pass_ms > target_ms and memory_cost > MIN_MEMORY_KIB:
+            memory_cost = max(memory_cost // 2, MIN_MEMORY_KIB)
+            single_pass_ms = self.measure(1, memory_cost, parallelism, samples)
+
+        # Latency grows roughly linearly with time_cost: estimate, then verify
+        time_cost = int(max(1, min(max_time_cost, target_ms // max(single_pass_ms, 0.001))))
+        measured_ms = self.measure(time_cost, memory_cost, parallelism, samples)
+        while time_cost > 1 and measured_ms > target_ms:
+            time_cost -= 1
+            measured_ms = self.measure(time_cost, memory_cost, parallelism, samples)
+
+        return {
+            'time_cost': time_cost,
+            'memory_cost': memory_cost,
+            'parallelism': parallelism,
+            'measured_ms': measured_ms,
+        }
+
+    def measure(self, time_cost, memory_cost, parallelism, samples):
+        """Return the median hashing time in milliseconds."""
+        timings = []
+        for _ in range(max(samples, 1)):
+            start = time.perf_counter()
+            hash_secret_raw(
+                b'calibration-password',
+                os.urandom(16),
+                time_cost=time_cost,
+                memory_cost=memory_cost,
+                parallelism=parallelism,
+                hash_len=32,
+                type=Type.ID,
+            )
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
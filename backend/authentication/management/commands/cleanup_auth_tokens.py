@@ -0,0 +1,70 @@
+"""
+Prune expired and used password reset / email verification tokens.
+
+Usage:
+    python manage.py cleanup_auth_tokens
+    python manage.py cleanup_auth_tokens --batch-size 5000 --sleep 0.05
+
+Deletes in keyset-paginated batches with raw DELETE statements (see
+authentication.cleanup), so each statement holds its locks briefly. A
+cache lock skips the run if the previous one is still going, which makes
+it safe to schedule every few minutes.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.cleanup import prune_tokens
+from authentication.models import EmailVerificationToken, PasswordResetToken
+
+LOCK_KEY = 'auth:cleanup_auth_tokens:lock'
+
+
+class Command(BaseCommand):
+    help = 'Delete expired and used authentication tokens in small batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows deleted per statement (default: 1000)',
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=0.1,
+            help='Seconds to pause between batches (default: 0.1)',
+        )
+        parser.add_argument(
+            '--lock-timeout', type=int, default=3600,
+            help='Seconds before a stale run lock expires (default: 3600)',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+
+        if not cache.add(LOCK_KEY, 1, timeout=options['lock_timeout']):
+            self.stdout.write(self.style.WARNING('Another cleanup is running, skipping.'))
+            return
+
+        start = time.monotonic()
+        try:
+            totals = {
+                model._meta.db_table: prune_tokens(
+                    model,
+                    batch_size=options['batch_size'],
+                    sleep=options['sleep'],
+                    progress=self.report,
+                )
+                for model in (PasswordResetToken, EmailVerificationToken)
+            }
+        finally:
+            cache.delete(LOCK_KEY)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {sum(totals.values())} tokens in {time.monotonic() - start:.1f}s ('
+            + ', '.join(f'{table}: {count}' for table, count in totals.items()) + ')'
+        ))
+
+    def report(self, model, deleted, total):
+        self.stdout.write(f'{model._meta.db_table}: deleted {deleted} (total {total})')
@@ -0,0 +1,76 @@
+"""
+Bulk import users from a CSV or JSONL file.
+
+Usage:
+    python manage.py import_users users.csv
+    python manage.py import_users users.jsonl --workers 8 --batch-size 2000
+
+Raw passwords are hashed with Argon2id across --workers processes
+(default: all cores); legacy PBKDF2/bcrypt hashes in ``password_hash``
+are stored as they are and upgraded on first login. Users are inserted
+with bulk_create, one transaction per batch. Existing emails are skipped,
+so the command can be re-run after an interruption. See
+authentication.user_import for the accepted columns.
+"""
+
+import gzip
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.user_import import UserImporter, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Import users from CSV/JSONL, hashing passwords on all cores.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='CSV (with header) or JSONL file, optionally .gz')
+        parser.add_argument(
+            '--format', choices=['csv', 'jsonl'],
+            help='Input format (default: from the file extension)',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Password hashing processes, 0 hashes inline (default: CPU count)',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Users per bulk insert (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        source = options['source']
+        name = source[:-3] if source.endswith('.gz') else source
+        fmt = options['format'] or ('csv' if name.endswith('.csv') else 'jsonl')
+        if options['batch_size'] < 1 or options['workers'] < 0:
+            raise CommandError('--batch-size must be at least 1 and --workers not negative.')
+
+        opener = gzip.open if source.endswith('.gz') else open
+        try:
+            stream = opener(source, 'rt', encoding='utf-8', newline='')
+        except FileNotFoundError as e:
+            raise CommandError(f'File not found: {source}') from e
+
+        importer = UserImporter(
+            workers=options['workers'],
+            batch_size=options['batch_size'],
+            report=self.report,
+            error=self.row_error,
+        )
+        with stream:
+            stats = importer.run(read_rows(stream, fmt))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {stats.imported} users in {stats.elapsed:.1f}s ({stats.rate:.0f} users/s); '
+            f'{stats.existing} already existed, {stats.invalid} invalid, {stats.failed} failed.'
+        ))
+
+    def report(self, stats):
+        self.stdout.write(
+            f'{stats.read} read, {stats.imported} imported ({stats.rate:.0f} users/s)'
+        )
+
+    def row_error(self, number, message):
+        where = f'line {number}: ' if number is not None else ''
+        self.stderr.write(self.style.WARNING(f'{where}{message}'))
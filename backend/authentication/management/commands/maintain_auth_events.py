@@ -0,0 +1,63 @@
+"""
+Maintain the monthly partitions of the auth event audit log.
+
+Usage:
+    python manage.py maintain_auth_events
+    python manage.py maintain_auth_events --months-ahead 3 --retain-months 6
+
+Creates the partitions for the current month and the next --months-ahead
+months, and drops whole partitions older than --retain-months (default:
+AUTH_AUDIT_RETENTION_MONTHS). Dropping a partition is O(1), whatever its
+size. Schedule daily or at least monthly. Without Postgres partitioning
+(development), expired events are deleted instead.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from authentication.partitions import (
+    add_months, create_partition, delete_events_before, drop_partitions_before,
+    is_partitioned, month_start, partition_name,
+)
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming auth event partitions and drop expired ones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead', type=int, default=2,
+            help='Future months to create partitions for (default: 2)',
+        )
+        parser.add_argument(
+            '--retain-months', type=int, default=None,
+            help='Full months kept before the current one (default: AUTH_AUDIT_RETENTION_MONTHS)',
+        )
+
+    def handle(self, *args, **options):
+        retain = options['retain_months']
+        if retain is None:
+            retain = settings.AUTH_AUDIT_RETENTION_MONTHS
+        if retain < 1 or options['months_ahead'] < 0:
+            raise CommandError('--retain-months must be at least 1 and --months-ahead not negative.')
+
+        current = month_start(timezone.now())
+        cutoff = add_months(current, -retain)
+
+        if not is_partitioned():
+            deleted = delete_events_before(cutoff)
+            self.stdout.write(self.style.SUCCESS(
+                f'Table not partitioned: deleted {deleted} events before {cutoff:%Y-%m}'
+            ))
+            return
+
+        for offset in range(options['months_ahead'] + 1):
+            month = add_months(current, offset)
+            if create_partition(month):
+                self.stdout.write(f'Created {partition_name(month)}')
+
+        for name in drop_partitions_before(cutoff):
+            self.stdout.write(f'Dropped {name}')
+
+        self.stdout.write(self.style.SUCCESS(f'Auth event partitions kept from {cutoff:%Y-%m}'))
@@ -0,0 +1,72 @@
+"""
+Deliver queued transactional emails (EmailOutbox).
+
+Usage:
+    python manage.py process_email_outbox            # drain due rows and exit
+    python manage.py process_email_outbox --loop     # run as a worker
+
+Failed sends are retried with exponential backoff (--backoff-seconds,
+doubling per attempt, capped at one hour). After --max-attempts the row is
+moved to the DEAD state for inspection in the admin.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from authentication.outbox import process_batch
+
+
+class Command(BaseCommand):
+    help = 'Deliver pending transactional emails from the outbox.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=50,
+            help='Rows claimed per batch (default: 50)',
+        )
+        parser.add_argument(
+            '--max-attempts', type=int, default=8,
+            help='Attempts before a row is dead-lettered (default: 8)',
+        )
+        parser.add_argument(
+            '--backoff-seconds', type=int, default=30,
+            help='Delay before the first retry, doubled per attempt (default: 30)',
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling for new rows instead of exiting when drained',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=2.0,
+            help='Seconds to sleep when the outbox is empty in --loop mode (default: 2)',
+        )
+
+    def handle(self, *args, **options):
+        totals = {}
+        try:
+            while True:
+                counts = process_batch(
+                    batch_size=options['batch_size'],
+                    max_attempts=options['max_attempts'],
+                    backoff_seconds=options['backoff_seconds'],
+                )
+                processed = sum(counts.values())
+                for status, count in counts.items():
+                    totals[status] = totals.get(status, 0) + count
+
+                if processed:
+                    self.stdout.write(
+                        ', '.join(f'{status}: {count}' for status, count in counts.items() if count)
+                    )
+                    continue
+
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(
+            'Outbox processed: ' + ', '.join(f'{status}: {count}' for status, count in totals.items())
+        ))
@@ -0,0 +1,86 @@
+"""
+Middleware for Authentication
+
+This module contains middleware used by the authentication API.
+
+MinimumResponseTimeMiddleware:
+- Enforces the anti-enumeration minimum response time set by views
+  (see ``pad_response``) outside of the view itself.
+- Under ASGI the wait is an ``asyncio.sleep``, so a padded failure does
+  not hold a worker thread and one worker can serve hundreds of padded
+  responses at the same time.
+- Under WSGI it falls back to ``time.sleep`` (same behaviour as before).
+
+Related: BET-18 (Backend API Endpoints)
+"""
+
+import asyncio
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+# Attribute set on a response by ``pad_response`` (monotonic clock deadline)
+RESPONSE_DEADLINE_ATTR = 'min_response_deadline'
+
+
+def pad_response(response, start_time, minimum_seconds):
+    """
+    Mark a response so it is not sent before ``start_time + minimum_seconds``.
+
+    The actual wait is performed by MinimumResponseTimeMiddleware, which
+    awaits the deadline without blocking a worker when served over ASGI.
+
+    Args:
+        response: Response instance returned by the view
+        start_time (float): ``time.monotonic()`` value taken at request start
+        minimum_seconds (float): Minimum total response time
+
+    Returns:
+        Response: The same response instance
+    """
+    setattr(response, RESPONSE_DEADLINE_ATTR, start_time + minimum_seconds)
+    return response
+
+
+def _remaining_delay(response):
+    """Return the seconds left until the response deadline (0 if none)."""
+    deadline = getattr(response, RESPONSE_DEADLINE_ATTR, None)
+    if deadline is None:
+        return 0
+    return max(0.0, deadline - time.monotonic())
+
+
+class MinimumResponseTimeMiddleware:
+    """
+    Delay padded responses until their deadline.
+
+    Sync and async capable: Django picks the async path when the project is
+    served through ``config.asgi`` and the sync path under WSGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        response = self.get_response(request)
+        delay = _remaining_delay(response)
+        if delay > 0:
+            time.sleep(delay)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        delay = _remaining_delay(response)
+        if delay > 0:
+            # Awaitable timer: the event loop keeps serving other requests
+            await asyncio.sleep(delay)
+        return response
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:41
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count, F
+from django.db.models.functions import Lower, Trim
+
+
+def canonicalize_emails(apps, schema_editor):
+    """
+    Store every email in canonical form (stripped, lowercase).
+
+    Case variants of the same address are deduplicated first: the account
+    used most recently keeps the address, the others are deactivated and
+    renamed to ``local+duplicate-<id>@domain`` (rows are kept, so related
+    orders are not lost).
+    """
+    User = apps.get_model('authentication', 'User')
+    canonical = Lower(Trim('email'))
+
+    duplicates = (
+        User.objects.annotate(canonical=canonical)
+        .values('canonical')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+        .values_list('canonical', flat=True)
+    )
+
+    for email in list(duplicates):
+        users = list(
+            User.objects.annotate(canonical=canonical)
+            .filter(canonical=email)
+            .order_by(F('last_login').desc(nulls_last=True), 'date_joined')
+        )
+        local, _, domain = email.rpartition('@')
+        for user in users[1:]:
+            user.email = f'{local}+duplicate-{user.id.hex[:12]}@{domain}'
+            user.is_active = False
+            user.save(update_fields=['email', 'is_active'])
+
+    # Single set-based UPDATE for the remaining non-canonical rows
+    User.objects.exclude(email=canonical).update(email=canonical)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('authentication', '0002_authaccount_authsession_authuser_verificationtoken_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(canonicalize_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='user_email_lower_uniq'),
+        ),
+    ]
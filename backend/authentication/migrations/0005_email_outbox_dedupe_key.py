@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_email_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailoutbox',
+            name='dedupe_key',
+            field=models.CharField(blank=True, help_text='Coalesces pending emails of the same kind per user', max_length=64, null=True, unique=True, verbose_name='dedupe key'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0005_email_outbox_dedupe_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='last_seen_at',
+            field=models.DateTimeField(blank=True, help_text='Timestamp of the last authenticated API request', null=True, verbose_name='last seen at'),
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:40
+
+import django.utils.timezone
+from datetime import datetime, timezone as dt_timezone
+from django.db import migrations, models
+
+# Monthly partitions created up front (current month and the next ones);
+# maintain_auth_events keeps creating them ahead afterwards
+INITIAL_MONTHS = 3
+
+
+def _month(index):
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def create_auth_event_table(apps, schema_editor):
+    """
+    Postgres: auth_event partitioned by month on created_at, primary key
+    (id, created_at) as required for partitioning. Elsewhere: plain table.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        schema_editor.create_model(apps.get_model('authentication', 'AuthEvent'))
+        return
+
+    # bigserial rather than an identity column (not allowed on partitioned
+    # tables before Postgres 17)
+    schema_editor.execute(
+        'CREATE TABLE "auth_event" ('
+        '"id" bigserial NOT NULL, '
+        '"created_at" timestamp with time zone NOT NULL, '
+        '"event_type" varchar(32) NOT NULL, '
+        '"user_id" uuid NULL, '
+        '"email" varchar(254) NOT NULL, '
+        '"ip_address" inet NULL, '
+        '"user_agent" varchar(255) NOT NULL, '
+        'PRIMARY KEY ("id", "created_at")'
+        ') PARTITION BY RANGE ("created_at")'
+    )
+    schema_editor.execute(
+        'CREATE INDEX "auth_event_user_idx" ON "auth_event" ("user_id", "created_at")'
+    )
+    schema_editor.execute('CREATE TABLE "auth_event_default" PARTITION OF "auth_event" DEFAULT')
+
+    now = django.utils.timezone.now()
+    current = now.year * 12 + now.month - 1
+    for index in range(current, current + INITIAL_MONTHS):
+        start, end = _month(index), _month(index + 1)
+        schema_editor.execute(
+            f'CREATE TABLE "auth_event_y{start.year:04d}m{start.month:02d}" PARTITION OF "auth_event" '
+            'FOR VALUES FROM (%s) TO (%s)',
+            [start, end],
+        )
+
+
+def drop_auth_event_table(apps, schema_editor):
+    schema_editor.delete_model(apps.get_model('authentication', 'AuthEvent'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0006_user_last_seen_at'),
+    ]
+
+    operations = [
+        # The table is created by hand (partitioned on Postgres)
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='AuthEvent',
+                    fields=[
+                        ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                        ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='created at')),
+                        ('event_type', models.CharField(choices=[('login_succeeded', 'Login succeeded'), ('login_failed', 'Login failed'), ('registered', 'Registered'), ('password_changed', 'Password changed'), ('password_reset', 'Password reset'), ('email_verified', 'Email verified')], max_length=32, verbose_name='event type')),
+                        ('user_id', models.UUIDField(blank=True, null=True, verbose_name='user id')),
+                        ('email', models.CharField(blank=True, max_length=254, verbose_name='email')),
+                        ('ip_address', models.GenericIPAddressField(blank=True, null=True, verbose_name='IP address')),
+                        ('user_agent', models.CharField(blank=True, max_length=255, verbose_name='user agent')),
+                    ],
+                    options={
+                        'verbose_name': 'auth event',
+                        'verbose_name_plural': 'auth events',
+                        'db_table': 'auth_event',
+                        'ordering': ['-created_at'],
+                        'indexes': [models.Index(fields=['user_id', 'created_at'], name='auth_event_user_idx')],
+                    },
+                ),
+            ],
+        ),
+        # After the state operation, so the model is in ``apps``
+        migrations.RunPython(create_auth_event_table, drop_auth_event_table),
+    ]
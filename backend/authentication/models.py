@@ -15,19 +15,54 @@ Related: BET-17 (Database Models and Migrations)
 
 import uuid
 from django.contrib.auth.models import AbstractUser, BaseUserManager
-from django.db import models
+from django.db import connections, models, router
+from django.db.models.functions import Lower
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from datetime import timedelta
 import secrets
 
+from .hashing import get_hashing_service
+from .cleanup import prune_tokens
+
 
 class CustomUserManager(BaseUserManager):
     """
     Custom user manager that uses email as the unique identifier
     instead of username.
+
+    Emails are stored in canonical form (stripped, lowercase), so lookups
+    are plain equality on the unique index instead of ``email__iexact``.
     """
 
+    @classmethod
+    def normalize_email(cls, email):
+        """
+        Return the canonical form of an email address (stripped, lowercase).
+
+        Args:
+            email (str): Email address as entered by the user
+
+        Returns:
+            str: Canonical email address
+        """
+        return (email or '').strip().lower()
+
+    def get_by_email(self, email):
+        """
+        Get a user by email (case-insensitive, index-friendly).
+
+        Args:
+            email (str): Email address in any case
+
+        Returns:
+            User: Matching user
+
+        Raises:
+            User.DoesNotExist: If no user has this email
+        """
+        return self.get(email=self.normalize_email(email))
+
     def create_user(self, email, password=None, **extra_fields):
         """
         Create and save a regular user with the given email and password.
@@ -92,13 +127,15 @@ class User(AbstractUser):
         is_staff (BooleanField): Staff access to admin
         is_superuser (BooleanField): Full admin permissions
         date_joined (DateTimeField): Account creation timestamp
-        last_login (DateTimeField): Last login timestamp
+        last_login (DateTimeField): Last login timestamp (buffered)
+        last_seen_at (DateTimeField): Last authenticated API call (buffered)
 
     Security:
         - Passwords hashed with Argon2id (configured in settings.py)
         - Email used as USERNAME_FIELD (no username field)
         - UUID primary key prevents user enumeration
         - email field has db_index for fast lookups
+        - email stored lowercase, unique on lower(email)
 
     Related: BET-17 (Database Models)
     """
@@ -146,6 +183,15 @@ class User(AbstractUser):
         help_text=_('Timestamp when email was verified')
     )
 
+    # Last authenticated API call, written in batches by activity.py
+    # (as is last_login)
+    last_seen_at = models.DateTimeField(
+        _('last seen at'),
+        null=True,
+        blank=True,
+        help_text=_('Timestamp of the last authenticated API request')
+    )
+
     # User manager
     objects = CustomUserManager()
 
@@ -161,6 +207,10 @@ class User(AbstractUser):
             models.Index(fields=['email'], name='user_email_idx'),
             models.Index(fields=['is_active'], name='user_active_idx'),
         ]
+        constraints = [
+            # Guards against case variants written outside the manager
+            models.UniqueConstraint(Lower('email'), name='user_email_lower_uniq'),
+        ]
 
     def __str__(self):
         """String representation of the user."""
@@ -185,6 +235,74 @@ class User(AbstractUser):
         """
         return self.first_name if self.first_name else self.email
 
+    def set_password(self, raw_password):
+        """
+        Hash and set the password (Argon2id, computed in the hashing pool).
+
+        Args:
+            raw_password (str): Plain text password
+        """
+        self.password = get_hashing_service().make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        """
+        Check a password (verified in the hashing pool).
+
+        Outdated hashes are upgraded to the preferred hasher on success.
+
+        Args:
+            raw_password (str): Plain text password
+
+        Returns:
+            bool: True if the password is correct
+
+        Raises:
+            HashingServiceBusy: If the hashing pool is saturated (503)
+        """
+        def setter(raw_password):
+            self.set_password(raw_password)
+            # Password hash was upgraded, not changed by the user
+            self._password = None
+            self.save(update_fields=['password'])
+
+        return get_hashing_service().check_password(raw_password, self.password, setter)
+
+
+def consume_stored_token(model, token):
+    """
+    Mark a stored token as used in a single conditional statement.
+
+    ``UPDATE ... SET is_used = true WHERE token = %s AND is_used = false
+    AND expires_at > now RETURNING user_id``: of two concurrent requests
+    with the same token exactly one gets a row back.
+
+    Args:
+        model: PasswordResetToken or EmailVerificationToken
+        token (str): Token value
+
+    Returns:
+        UUID: Owner's user id, or None if the token is unknown, used or expired
+    """
+    connection = connections[router.db_for_write(model)]
+    table = connection.ops.quote_name(model._meta.db_table)
+    is_used, used_at, token_column, expires_at, user_id = (
+        connection.ops.quote_name(model._meta.get_field(name).column)
+        for name in ('is_used', 'used_at', 'token', 'expires_at', 'user')
+    )
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {table} SET {is_used} = %s, {used_at} = %s '
+            f'WHERE {token_column} = %s AND {is_used} = %s AND {expires_at} > %s '
+            f'RETURNING {user_id}',
+            [True, now, token, False, now],
+        )
+        row = cursor.fetchone()
+
+    return model._meta.get_field('user').target_field.to_python(row[0]) if row else None
+
 
 class PasswordResetToken(models.Model):
     """
@@ -193,6 +311,10 @@ class PasswordResetToken(models.Model):
     Stores secure tokens for password reset functionality.
     Tokens expire after a configurable time period (default: 1 hour).
 
+    Legacy: new reset tokens are stateless (authentication.tokens) and
+    never stored. Rows here are only read as a fallback for tokens issued
+    before the switch, until they expire.
+
     Fields:
         id (UUID): Primary key
         user (ForeignKey): Related user
@@ -326,21 +448,21 @@ class PasswordResetToken(models.Model):
         self.used_at = timezone.now()
         self.save(update_fields=['is_used', 'used_at'])
 
+    @classmethod
+    def consume(cls, token):
+        """Atomically use a valid token. Returns the user id or None."""
+        return consume_stored_token(cls, token)
+
     @classmethod
     def cleanup_expired_tokens(cls):
         """
         Delete all expired and used tokens.
-        Should be run periodically as a cleanup task.
+        Scheduled runs should use ``manage.py cleanup_auth_tokens``.
 
         Returns:
             int: Number of tokens deleted
         """
-        expired = cls.objects.filter(expires_at__lt=timezone.now())
-        used = cls.objects.filter(is_used=True)
-        count = expired.count() + used.count()
-        expired.delete()
-        used.delete()
-        return count
+        return prune_tokens(cls)
 
 
 class EmailVerificationToken(models.Model):
@@ -349,6 +471,9 @@ class EmailVerificationToken(models.Model):
 
     Stores secure tokens for email verification functionality.
     Tokens expire after a configurable time period (default: 24 hours).
+
+    Legacy: new verification tokens are stateless (authentication.tokens).
+    Rows here are only read as a fallback until they expire.
     """
 
     id = models.UUIDField(
@@ -429,6 +554,245 @@ class EmailVerificationToken(models.Model):
         self.used_at = timezone.now()
         self.save(update_fields=['is_used', 'used_at'])
 
+    @classmethod
+    def consume(cls, token):
+        """Atomically use a valid token. Returns the user id or None."""
+        return consume_stored_token(cls, token)
+
+    @classmethod
+    def cleanup_expired_tokens(cls):
+        """Delete all expired and used tokens (see cleanup_auth_tokens)."""
+        return prune_tokens(cls)
+
+
+class EmailOutbox(models.Model):
+    """
+    Transactional Email Outbox.
+
+    Auth flows write a row here in the same DB transaction as the token they
+    email, and return as soon as it commits. The ``process_email_outbox``
+    management command delivers pending rows in batches, retrying with
+    exponential backoff and moving rows that keep failing to DEAD.
+
+    Token emails (reset, verification) are coalesced: while one is pending
+    for a user, it holds a unique ``dedupe_key`` and further requests update
+    its payload (INSERT ... ON CONFLICT DO UPDATE) instead of queuing more.
+
+    Fields:
+        user (ForeignKey): Recipient
+        kind (CharField): Email type (selects the sender function)
+        payload (JSONField): Sender arguments (e.g. token)
+        status (CharField): PENDING, SENT or DEAD (dead letter)
+        attempts (PositiveSmallIntegerField): Delivery attempts so far
+        next_attempt_at (DateTimeField): When the row is due (backoff / lease)
+        last_error (TextField): Last delivery error
+        created_at (DateTimeField): When the email was queued
+        sent_at (DateTimeField): When the email was delivered
+        dedupe_key (CharField): "<kind>:<user id>" while pending, else NULL
+    """
+
+    class Kind(models.TextChoices):
+        PASSWORD_RESET = 'password_reset', _('Password reset')
+        EMAIL_VERIFICATION = 'email_verification', _('Email verification')
+        PASSWORD_CHANGED = 'password_changed', _('Password changed')
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        SENT = 'sent', _('Sent')
+        DEAD = 'dead', _('Dead')
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='email_outbox',
+        help_text=_('Recipient')
+    )
+
+    kind = models.CharField(
+        _('kind'),
+        max_length=32,
+        choices=Kind.choices
+    )
+
+    payload = models.JSONField(
+        _('payload'),
+        default=dict,
+        blank=True
+    )
+
+    status = models.CharField(
+        _('status'),
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING
+    )
+
+    attempts = models.PositiveSmallIntegerField(
+        _('attempts'),
+        default=0
+    )
+
+    next_attempt_at = models.DateTimeField(
+        _('next attempt at'),
+        default=timezone.now
+    )
+
+    last_error = models.TextField(
+        _('last error'),
+        blank=True
+    )
+
+    created_at = models.DateTimeField(
+        _('created at'),
+        auto_now_add=True
+    )
+
+    sent_at = models.DateTimeField(
+        _('sent at'),
+        null=True,
+        blank=True
+    )
+
+    dedupe_key = models.CharField(
+        _('dedupe key'),
+        max_length=64,
+        null=True,
+        blank=True,
+        unique=True,
+        help_text=_('Coalesces pending emails of the same kind per user')
+    )
+
+    # Kinds where only the latest pending email per user matters
+    COALESCED_KINDS = (Kind.PASSWORD_RESET, Kind.EMAIL_VERIFICATION)
+
+    class Meta:
+        verbose_name = _('email outbox entry')
+        verbose_name_plural = _('email outbox')
+        db_table = 'auth_email_outbox'
+        indexes = [
+            # Worker polling: due pending rows
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.get_kind_display()} for {self.user_id} ({self.status})"
+
+    @classmethod
+    def enqueue(cls, user, kind, **payload):
+        """
+        Queue an email for delivery.
+
+        Call inside the transaction that creates the data the email refers
+        to, so the email is sent if and only if that data is committed.
+
+        For COALESCED_KINDS this is an upsert on dedupe_key: if an email of
+        the same kind is still pending for the user, its payload is replaced
+        and no new row is added.
+
+        Args:
+            user (User): Recipient
+            kind (str): EmailOutbox.Kind value
+            **payload: JSON-serializable sender arguments
+
+        Returns:
+            EmailOutbox: Created (or coalesced) outbox row
+        """
+        if kind not in cls.COALESCED_KINDS:
+            return cls.objects.create(user=user, kind=kind, payload=payload)
+
+        entry = cls(user=user, kind=kind, payload=payload, dedupe_key=f'{kind}:{user.pk}')
+        cls.objects.bulk_create(
+            [entry],
+            update_conflicts=True,
+            unique_fields=['dedupe_key'],
+            update_fields=['payload'],
+        )
+        return entry
+
+
+class AuthEvent(models.Model):
+    """
+    Authentication Audit Log.
+
+    One row per login success or failure, registration, password change or
+    reset and email verification. Rows are queued in process and written
+    in batches by authentication.audit, so requests never wait for the
+    INSERT.
+
+    On Postgres the table is partitioned by month on ``created_at``
+    (auth_event_yYYYYmMM, plus a default partition). The
+    ``maintain_auth_events`` command creates upcoming partitions and drops
+    expired ones whole (see partitions.py). The database primary key is
+    (id, created_at); ``id`` alone is unique (one sequence).
+
+    Fields:
+        created_at (DateTimeField): When the event happened (partition key)
+        event_type (CharField): What happened
+        user_id (UUIDField): User, if known (no FK: events outlive users)
+        email (CharField): Email submitted or of the user (normalized)
+        ip_address (GenericIPAddressField): Client IP
+        user_agent (CharField): Client User-Agent (truncated)
+    """
+
+    class EventType(models.TextChoices):
+        LOGIN_SUCCEEDED = 'login_succeeded', _('Login succeeded')
+        LOGIN_FAILED = 'login_failed', _('Login failed')
+        REGISTERED = 'registered', _('Registered')
+        PASSWORD_CHANGED = 'password_changed', _('Password changed')
+        PASSWORD_RESET = 'password_reset', _('Password reset')
+        EMAIL_VERIFIED = 'email_verified', _('Email verified')
+
+    id = models.BigAutoField(primary_key=True)
+
+    created_at = models.DateTimeField(
+        _('created at'),
+        default=timezone.now
+    )
+
+    event_type = models.CharField(
+        _('event type'),
+        max_length=32,
+        choices=EventType.choices
+    )
+
+    user_id = models.UUIDField(
+        _('user id'),
+        null=True,
+        blank=True
+    )
+
+    email = models.CharField(
+        _('email'),
+        max_length=254,
+        blank=True
+    )
+
+    ip_address = models.GenericIPAddressField(
+        _('IP address'),
+        null=True,
+        blank=True
+    )
+
+    user_agent = models.CharField(
+        _('user agent'),
+        max_length=255,
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = _('auth event')
+        verbose_name_plural = _('auth events')
+        db_table = 'auth_event'
+        indexes = [
+            # A user's history, newest first
+            models.Index(fields=['user_id', 'created_at'], name='auth_event_user_idx'),
+        ]
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.get_event_type_display()} {self.email or self.user_id} at {self.created_at}"
+
 
 # ==============================================================================
 # OAuth Authentication Models (Read-Only)
@@ -0,0 +1,181 @@
+"""
+Email Outbox Delivery
+
+Delivers rows queued in EmailOutbox. Used by the ``process_email_outbox``
+management command.
+
+Delivery protocol:
+1. Claim a batch of due PENDING rows with SELECT ... FOR UPDATE SKIP LOCKED
+   and push their next_attempt_at forward by a lease, then commit. Several
+   workers can run side by side, and a crashed worker's rows become due
+   again once the lease expires.
+2. Send each email outside the transaction (no row locks held during HTTP).
+3. Mark the row SENT, or schedule a retry with exponential backoff, or move
+   it to DEAD after max_attempts. Either final state releases the row's
+   dedupe_key, so the next request for that email queues a new row. If a
+   request coalesced a newer payload into the row while it was being sent,
+   the row stays PENDING instead, so the newer payload goes out too. While
+   the provider circuit is open nothing is sent: the row is rescheduled for
+   when the breaker lets a trial through, without using up an attempt.
+
+Bursts (a user hammering "resend") are absorbed twice: ``claim_cooldown``
+drops requests for the same email within AUTH_EMAIL_COOLDOWN_SECONDS, and
+EmailOutbox.enqueue coalesces whatever gets through into one pending row.
+
+Related: BET-29 (Email Service)
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .email_transport import CircuitOpen
+from .email_service import (
+    send_email_verification,
+    send_password_changed_notification,
+    send_password_reset_email,
+)
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+# Seconds a claimed row stays invisible to other workers
+CLAIM_LEASE_SECONDS = 300
+
+# Maximum delay between retries
+MAX_BACKOFF_SECONDS = 3600
+
+
+def claim_cooldown(user, kind):
+    """
+    Rate limit an email per (user, kind).
+
+    Returns:
+        bool: True if the email may be queued now, False if one was queued
+        within the last AUTH_EMAIL_COOLDOWN_SECONDS
+    """
+    timeout = settings.AUTH_EMAIL_COOLDOWN_SECONDS
+    if timeout <= 0:
+        return True
+    return cache.add(f'auth:email_cooldown:{kind}:{user.pk}', 1, timeout=timeout)
+
+
+def _send(entry):
+    """Dispatch an outbox row to its sender. Returns True on success."""
+    user = entry.user
+    payload = entry.payload
+    # Captured from the request's Accept-Language when queued (older rows: default)
+    locale = payload.get('locale')
+
+    if entry.kind == EmailOutbox.Kind.PASSWORD_RESET:
+        return send_password_reset_email(user, payload['token'], retry_count=1, locale=locale)
+    if entry.kind == EmailOutbox.Kind.EMAIL_VERIFICATION:
+        return send_email_verification(user, payload['token'], retry_count=1, locale=locale)
+    if entry.kind == EmailOutbox.Kind.PASSWORD_CHANGED:
+        return send_password_changed_notification(user, locale=locale)
+
+    raise ValueError(f'Unknown email kind: {entry.kind}')
+
+
+def claim_batch(batch_size):
+    """
+    Claim up to ``batch_size`` due rows for this worker.
+
+    Returns:
+        list[EmailOutbox]: Claimed rows (with user loaded)
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        entries = list(
+            EmailOutbox.objects
+            .select_for_update(skip_locked=True, of=('self',))
+            .select_related('user')
+            .filter(status=EmailOutbox.Status.PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        if entries:
+            EmailOutbox.objects.filter(pk__in=[entry.pk for entry in entries]).update(
+                next_attempt_at=now + timedelta(seconds=CLAIM_LEASE_SECONDS)
+            )
+    return entries
+
+
+def backoff_delay(attempts, base_seconds):
+    """Exponential backoff: base, 2x base, 4x base, ... capped at one hour."""
+    return min(base_seconds * (2 ** (attempts - 1)), MAX_BACKOFF_SECONDS)
+
+
+def deliver(entry, max_attempts, backoff_seconds):
+    """
+    Send one claimed row and record the outcome.
+
+    Returns:
+        str: Resulting status
+    """
+    try:
+        sent = _send(entry)
+        error = '' if sent else 'Email provider rejected or failed the request'
+    except CircuitOpen as e:
+        # Not a delivery attempt: retry once the breaker allows a trial
+        entry.next_attempt_at = timezone.now() + timedelta(seconds=e.retry_after)
+        entry.last_error = str(e)
+        entry.save(update_fields=['next_attempt_at', 'last_error'])
+        return entry.status
+    except Exception as e:
+        logger.error('Outbox delivery raised', extra={'outbox_id': entry.pk}, exc_info=True)
+        sent, error = False, str(e)
+
+    now = timezone.now()
+    entry.attempts += 1
+
+    if not sent and entry.attempts < max_attempts:
+        entry.next_attempt_at = now + timedelta(seconds=backoff_delay(entry.attempts, backoff_seconds))
+        entry.last_error = error
+        # payload is not saved: a coalesced newer payload goes out on the retry
+        entry.save(update_fields=['attempts', 'next_attempt_at', 'last_error'])
+        return entry.status
+
+    status = EmailOutbox.Status.SENT if sent else EmailOutbox.Status.DEAD
+    # Final state, only if enqueue did not coalesce a newer payload into the
+    # row while it was being sent (releasing dedupe_key would drop it)
+    finished = EmailOutbox.objects.filter(pk=entry.pk, payload=entry.payload).update(
+        status=status,
+        attempts=entry.attempts,
+        sent_at=now if sent else None,
+        last_error=error,
+        dedupe_key=None,
+    )
+    if not finished:
+        # The newer payload is a new email: due now, with its own attempts
+        EmailOutbox.objects.filter(pk=entry.pk).update(attempts=0, next_attempt_at=now, last_error='')
+        logger.info('Outbox payload replaced during delivery, requeued', extra={'outbox_id': entry.pk})
+        return EmailOutbox.Status.PENDING
+
+    if status == EmailOutbox.Status.DEAD:
+        logger.error(
+            'Outbox email moved to dead letter',
+            extra={'outbox_id': entry.pk, 'kind': entry.kind, 'attempts': entry.attempts}
+        )
+    entry.status = status
+    entry.last_error = error
+    entry.dedupe_key = None
+    if sent:
+        entry.sent_at = now
+    return status
+
+
+def process_batch(batch_size=50, max_attempts=8, backoff_seconds=30):
+    """
+    Claim and deliver one batch.
+
+    Returns:
+        dict: Count of rows per resulting status
+    """
+    counts = {status: 0 for status in EmailOutbox.Status.values}
+    for entry in claim_batch(batch_size):
+        counts[deliver(entry, max_attempts, backoff_seconds)] += 1
+    return counts
@@ -0,0 +1,147 @@
+"""
+Monthly Partitions of the Auth Event Table
+
+On Postgres ``auth_event`` is ``PARTITION BY RANGE (created_at)`` with one
+partition per calendar month (UTC):
+
+    auth_event_y2026m10  FOR VALUES FROM ('2026-10-01') TO ('2026-11-01')
+
+and a default partition (auth_event_default) so an insert never fails
+when a month was not created in time. Expiring a month is a DETACH +
+DROP TABLE: O(1), no row-by-row DELETE, no table bloat or vacuum.
+
+On other databases (development) the table is a plain table and expiry
+falls back to a DELETE.
+
+Used by the ``maintain_auth_events`` management command and the migration
+that creates the table.
+
+Related: BET-17 (Database Models and Migrations)
+"""
+
+import re
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import connections, router, transaction
+
+from .models import AuthEvent
+
+PARENT = AuthEvent._meta.db_table
+DEFAULT_PARTITION = f'{PARENT}_default'
+_NAME_RE = re.compile(rf'^{PARENT}_y(\d{{4}})m(\d{{2}})$')
+
+
+def month_start(value):
+    """First instant (UTC) of the month containing ``value``."""
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(month, count):
+    """Month start ``count`` months after ``month`` (may be negative)."""
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(month):
+    return f'{PARENT}_y{month.year:04d}m{month.month:02d}'
+
+
+def _connection():
+    return connections[router.db_for_write(AuthEvent)]
+
+
+def is_partitioned(connection=None):
+    return (connection or _connection()).vendor == 'postgresql'
+
+
+def list_partitions(connection=None):
+    """
+    Monthly partitions attached to auth_event.
+
+    Returns:
+        list: (month start, partition name) sorted by month
+    """
+    connection = connection or _connection()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+            'WHERE i.inhparent = %s::regclass',
+            [PARENT],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        match = _NAME_RE.match(name)
+        if match:
+            month = datetime(int(match[1]), int(match[2]), 1, tzinfo=dt_timezone.utc)
+            partitions.append((month, name))
+    return sorted(partitions)
+
+
+def create_partition(month, connection=None):
+    """
+    Create the partition for ``month`` if it does not exist.
+
+    Rows that already landed in the default partition for that month are
+    moved into the new partition.
+
+    Returns:
+        bool: True if the partition was created
+    """
+    connection = connection or _connection()
+    if any(existing == month for existing, _ in list_partitions(connection)):
+        return False
+
+    qn = connection.ops.quote_name
+    name, parent, default = qn(partition_name(month)), qn(PARENT), qn(DEFAULT_PARTITION)
+    bounds = [month, add_months(month, 1)]
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT EXISTS (SELECT 1 FROM {default} WHERE created_at >= %s AND created_at < %s)',
+            bounds,
+        )
+        stray = cursor.fetchone()[0]
+        if stray:
+            cursor.execute(f'ALTER TABLE {parent} DETACH PARTITION {default}')
+        cursor.execute(
+            f'CREATE TABLE {name} PARTITION OF {parent} FOR VALUES FROM (%s) TO (%s)',
+            bounds,
+        )
+        if stray:
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM {default} WHERE created_at >= %s AND created_at < %s '
+                f'RETURNING *) INSERT INTO {parent} SELECT * FROM moved',
+                bounds,
+            )
+            cursor.execute(f'ALTER TABLE {parent} ATTACH PARTITION {default} DEFAULT')
+    return True
+
+
+def drop_partitions_before(cutoff, connection=None):
+    """
+    Drop monthly partitions that end on or before ``cutoff`` (a month start).
+
+    Returns:
+        list: Names of the dropped partitions
+    """
+    connection = connection or _connection()
+    qn = connection.ops.quote_name
+    dropped = []
+    for month, name in list_partitions(connection):
+        if add_months(month, 1) > cutoff:
+            break
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE {qn(PARENT)} DETACH PARTITION {qn(name)}')
+            cursor.execute(f'DROP TABLE {qn(name)}')
+        dropped.append(name)
+    return dropped
+
+
+def delete_events_before(cutoff, connection=None):
+    """Unpartitioned fallback: DELETE events older than ``cutoff``."""
+    connection = connection or _connection()
+    deleted, _ = AuthEvent.objects.using(connection.alias).filter(created_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,94 @@
+"""
+orjson Renderer and Parser for DRF
+
+Project-wide replacements for DRF's JSONRenderer / JSONParser (see
+REST_FRAMEWORK in settings.py). orjson serializes dict/list/str/int,
+UUID, datetime, date and time natively in C; the remaining types DRF
+responses may carry are converted by ``default``:
+
+- Decimal: string, like DRF's DecimalField (COERCE_DECIMAL_TO_STRING),
+  or float when that setting is off
+- Lazy translation strings: str
+- timedelta: seconds as a string (same as DRF's encoder)
+- Sets, generators and other iterables: list
+
+Output matches JSONRenderer's defaults: compact, UTF-8 (no ASCII
+escaping), UTC datetimes ending in ``Z``, U+2028/U+2029 escaped. Data
+orjson rejects (integers beyond 64 bits) falls back to JSONRenderer.
+
+Related: BET-18 (Backend API Endpoints)
+"""
+
+import datetime
+import decimal
+
+import orjson
+from django.utils.functional import Promise
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def default(obj):
+    """Convert the types orjson does not handle natively."""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj) if api_settings.COERCE_DECIMAL_TO_STRING else float(obj)
+    if isinstance(obj, Promise):
+        return str(obj)
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if hasattr(obj, '__iter__') and not isinstance(obj, (bytes, dict)):
+        return list(obj)
+    raise TypeError(f'Type is not JSON serializable: {type(obj).__name__}')
+
+
+def dumps(data, indent=False):
+    """Serialize ``data`` to JSON bytes like ORJSONRenderer."""
+    options = (OPTIONS | orjson.OPT_INDENT_2) if indent else OPTIONS
+    content = orjson.dumps(data, default=default, option=options)
+    # Line/paragraph separators are valid JSON but not valid JavaScript
+    if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+        content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return content
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer using orjson.
+
+    ``?format=json`` and the ``indent`` media type parameter work as with
+    JSONRenderer (any indent renders with 2 spaces).
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        try:
+            return dumps(data, indent=bool(indent))
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits: the stdlib encoder handles them
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class ORJSONParser(JSONParser):
+    """JSON parser using orjson."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+        try:
+            content = stream.read() if stream is not None else b''
+            if encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+                content = content.decode(encoding).encode('utf-8')
+            return orjson.loads(content)
+        except (orjson.JSONDecodeError, UnicodeError, LookupError) as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -0,0 +1,59 @@
+"""
+Token Revocation Store
+
+Server-side revocation for JWTs, keyed by the token ``jti`` claim.
+
+Each revoked token is a single cache key whose TTL is the token's remaining
+lifetime, so the store never grows beyond the tokens that could still be
+presented: no SQL table to scan or prune. Checking a token is one cache
+lookup (batched with the user version lookup in CachedJWTAuthentication).
+
+Used by:
+- views.logout (access token + refresh token)
+- RevocableTokenRefreshSerializer (rotated refresh tokens)
+
+Related: BET-18 (Backend API Endpoints)
+"""
+
+import time
+
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+
+REVOKED_KEY = 'auth:revoked-jti:{jti}'
+
+
+def revoked_key(jti):
+    """Return the cache key marking a token id as revoked."""
+    return REVOKED_KEY.format(jti=jti)
+
+
+def revoke_token(token):
+    """
+    Revoke a validated token until it expires.
+
+    Args:
+        token: simplejwt Token instance (AccessToken or RefreshToken)
+
+    Returns:
+        bool: True if the token was revoked by this call, False if it was
+        already revoked (atomic, used to make rotation single-use)
+    """
+    ttl = int(token['exp'] - time.time())
+    if ttl <= 0:
+        # Already expired: nothing to store
+        return True
+    return cache.add(revoked_key(token[api_settings.JTI_CLAIM]), 1, timeout=ttl + 1)
+
+
+def is_token_revoked(token):
+    """
+    Check whether a validated token has been revoked.
+
+    Args:
+        token: simplejwt Token instance
+
+    Returns:
+        bool: True if revoked
+    """
+    return cache.get(revoked_key(token[api_settings.JTI_CLAIM])) is not None
@@ -13,44 +13,88 @@ Security Features:
 Related: BET-18 (Backend API Endpoints)
 """
 
+import operator
+
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
-from .models import User, PasswordResetToken
+from .models import User
+from .revocation import is_token_revoked, revoke_token
+from .tokens import is_signed_token, password_reset_token
+
+
+class ReadOnlySerializer:
+    """
+    Lightweight read-only serializer for hot response paths.
+
+    A subclass lists ``fields``: attribute names, or ``(key, 'dotted.path')``
+    pairs. Representation is one ``attrgetter`` call per object, with no
+    field instances or validation machinery; values are returned as they
+    are (UUID, datetime, Decimal) and converted by the JSON renderer
+    (renderers.ORJSONRenderer).
+
+    Supports the read side of the DRF serializer API used by views:
+    ``Serializer(instance).data`` and ``Serializer(queryset, many=True).data``.
+    """
+
+    fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        pairs = [field if isinstance(field, tuple) else (field, field) for field in cls.fields]
+        cls._keys = tuple(key for key, _ in pairs)
+        getter = operator.attrgetter(*(path for _, path in pairs))
+        cls._getter = staticmethod(getter if len(pairs) > 1 else lambda obj: (getter(obj),))
+
+    def __init__(self, instance=None, many=False, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.context = kwargs.get('context', {})
+
+    def to_representation(self, instance):
+        return dict(zip(self._keys, self._getter(instance)))
+
+    @property
+    def data(self):
+        if self.many:
+            keys, getter = self._keys, self._getter
+            return [dict(zip(keys, getter(obj))) for obj in self.instance]
+        return self.to_representation(self.instance)
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(ReadOnlySerializer):
     """
     Serializer for User model.
 
-    Used for user profile display (excluding sensitive data).
+    Used for user profile display (excluding sensitive data). Read-only
+    fast path: login, register and profile return it on every call.
     """
 
-    class Meta:
-        model = User
-        fields = [
-            'id',
-            'email',
-            'first_name',
-            'last_name',
-            'is_active',
-            'email_verified',
-            'date_joined',
-        ]
-        read_only_fields = [
-            'id',
-            'email',
-            'is_active',
-            'email_verified',
-            'date_joined',
-        ]
+    fields = (
+        'id',
+        'email',
+        'first_name',
+        'last_name',
+        'is_active',
+        'email_verified',
+        'date_joined',
+    )
+
+
+DUPLICATE_EMAIL_MESSAGE = 'A user with this email already exists.'
 
 
 class RegisterSerializer(serializers.ModelSerializer):
     """
     Serializer for user registration.
 
-    Validates email uniqueness, password strength, and creates new users.
+    Validates password strength and creates new users. Email uniqueness is
+    enforced by the database constraint: the register view maps the
+    IntegrityError from the insert to DUPLICATE_EMAIL_MESSAGE (no
+    check-then-insert race, one statement less).
 
     Security:
     - Password write-only (never returned in response)
@@ -83,7 +127,8 @@ class RegisterSerializer(serializers.ModelSerializer):
             'last_name',
         ]
         extra_kwargs = {
-            'email': {'required': True},
+            # No UniqueValidator: the insert is the uniqueness check
+            'email': {'required': True, 'validators': []},
             'first_name': {'required': False},
             'last_name': {'required': False},
         }
@@ -92,17 +137,9 @@ class RegisterSerializer(serializers.ModelSerializer):
         """
         Normalize and validate email.
 
-        Security: Case-insensitive email comparison
+        Security: Case-insensitive email comparison (canonical form)
         """
-        value = value.lower().strip()
-
-        # Check if email already exists
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError(
-                "A user with this email already exists."
-            )
-
-        return value
+        return User.objects.normalize_email(value)
 
     def validate_password(self, value):
         """
@@ -113,6 +150,7 @@ class RegisterSerializer(serializers.ModelSerializer):
         - MinimumLengthValidator (8 characters)
         - CommonPasswordValidator
         - NumericPasswordValidator
+        - BreachedPasswordValidator (offline breached-password index)
         """
         try:
             validate_password(value)
@@ -180,8 +218,7 @@ class LoginSerializer(serializers.Serializer):
         Note: Actual authentication is done in the view to use timing-safe comparison.
         This just validates that fields are present and formatted correctly.
         """
-        email = attrs.get('email', '').lower().strip()
-        attrs['email'] = email
+        attrs['email'] = User.objects.normalize_email(attrs.get('email', ''))
 
         return attrs
 
@@ -205,7 +242,7 @@ class ForgotPasswordSerializer(serializers.Serializer):
         Note: We don't validate if email exists here (anti-enumeration).
         The view will handle this silently.
         """
-        return value.lower().strip()
+        return User.objects.normalize_email(value)
 
 
 class ResetPasswordSerializer(serializers.Serializer):
@@ -250,22 +287,17 @@ class ResetPasswordSerializer(serializers.Serializer):
                 'password_confirm': 'Passwords do not match.'
             })
 
-        # Validate token exists and is valid
+        # Validate signed tokens here; legacy stored tokens are validated
+        # and consumed in one statement by the view (PasswordResetToken.consume)
         token = attrs['token']
-        try:
-            reset_token = PasswordResetToken.objects.get(token=token)
-
-            if not reset_token.is_valid():
+        attrs['user'] = None
+        if is_signed_token(token):
+            attrs['user'] = password_reset_token.check_token(token)
+            if attrs['user'] is None:
                 raise serializers.ValidationError({
                     'token': 'Token is invalid or has expired.'
                 })
 
-            attrs['reset_token'] = reset_token
-        except PasswordResetToken.DoesNotExist:
-            raise serializers.ValidationError({
-                'token': 'Token is invalid or has expired.'
-            })
-
         # Remove password_confirm from attrs
         attrs.pop('password_confirm')
 
@@ -321,3 +353,31 @@ class ChangePasswordSerializer(serializers.Serializer):
         attrs.pop('new_password_confirm')
 
         return attrs
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Serializer for refreshing tokens with server-side revocation.
+
+    Used by TokenRefreshView (SIMPLE_JWT['TOKEN_REFRESH_SERIALIZER']).
+
+    Security:
+    - Revoked refresh tokens (logout) are rejected
+    - With ROTATE_REFRESH_TOKENS, the presented refresh token is revoked
+      atomically, so each refresh token can be rotated only once
+    """
+
+    def validate(self, attrs):
+        """
+        Reject revoked refresh tokens and revoke rotated ones.
+        """
+        refresh = self.token_class(attrs['refresh'])
+
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            # Atomic claim: a concurrent refresh with the same token loses
+            if not revoke_token(refresh):
+                raise TokenError('Token is blacklisted')
+        elif is_token_revoked(refresh):
+            raise TokenError('Token is blacklisted')
+
+        return super().validate(attrs)
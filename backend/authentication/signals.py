@@ -0,0 +1,18 @@
+"""
+Signal handlers for Authentication models.
+
+Related: BET-18 (Backend API Endpoints)
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import User
+from .user_cache import invalidate_user
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Drop cached copies of the user whenever User.save / delete runs."""
+    invalidate_user(instance.pk)
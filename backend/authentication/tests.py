@@ -10,16 +10,56 @@ Tests cover:
 Related: BET-30 (Testing y Validación de Seguridad)
 """
 
-from django.test import TestCase, TransactionTestCase
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, RequestFactory
+from django.http import HttpResponse
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.translation import gettext_lazy
 from rest_framework.test import APITestCase, APIClient
-from rest_framework import status
+from rest_framework import serializers, status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.tokens import RefreshToken
 from datetime import timedelta
+from decimal import Decimal
+import asyncio
+import hashlib
+import threading
 import time
 
-from .models import PasswordResetToken
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from . import activity, audit
+from .breached_passwords import BreachedHashIndex, BreachedPasswordValidator, get_index, write_index
+from .email_service import send_password_reset_email
+from .renderers import ORJSONParser, ORJSONRenderer
+from .serializers import UserSerializer
+from .email_templates import get_template, locale_from_request, minify_html, render_email, resolve_locale
+from .email_transport import CircuitBreaker, CircuitOpen, EmailTransportError, ResendTransport
+from .hashers import load_argon2_parameters
+from .hashing import HashingServiceBusy, PasswordHashingService
+from .middleware import MinimumResponseTimeMiddleware, pad_response
+from .models import AuthEvent, EmailOutbox, EmailVerificationToken, PasswordResetToken
+from .outbox import backoff_delay, claim_batch, deliver, process_batch
+from .partitions import add_months, month_start, partition_name
+from .tokens import (
+    EmailVerificationTokenGenerator, _int_to_base36, email_verification_token, password_reset_token,
+)
 
 User = get_user_model()
 
@@ -60,7 +100,45 @@ class UserModelTestCase(TestCase):
             password='TestPass123'
         )
 
-        # normalize_email only lowercases the domain, not the local part
+        # Emails are stored in canonical form (whole address lowercase)
+        self.assertEqual(user.email, 'test@example.com')
+
+    def test_email_canonical_lookup(self):
+        """Test emails are stored lowercase and found regardless of case"""
+        user = User.objects.create_user(
+            email=' Mixed.Case@Example.COM ',
+            password='TestPass123'
+        )
+
+        self.assertEqual(user.email, 'mixed.case@example.com')
+        self.assertEqual(User.objects.get_by_email('MIXED.case@example.com'), user)
+        self.assertEqual(
+            authenticate(email='Mixed.Case@EXAMPLE.com', password='TestPass123'),
+            user
+        )
+
+    def test_case_variant_rejected_by_database(self):
+        """Test the lower(email) unique index rejects case variants"""
+        from django.db import IntegrityError, transaction
+
+        User.objects.create_user(email='test@example.com', password='TestPass123')
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            # Bypass the manager normalization
+            User(email='Test@Example.com').save()
+
+    def test_migration_backfills_canonical_email(self):
+        """Test the data migration rewrites non-canonical emails"""
+        import importlib
+        from django.apps import apps
+
+        migration = importlib.import_module('authentication.migrations.0003_canonical_email')
+        user = User.objects.create_user(email='test@example.com', password='TestPass123')
+        User.objects.filter(pk=user.pk).update(email='Test@Example.com')
+
+        migration.canonicalize_emails(apps, None)
+
+        user.refresh_from_db()
         self.assertEqual(user.email, 'test@example.com')
 
     def test_password_hashing_argon2(self):
@@ -121,11 +199,319 @@ class PasswordResetTokenModelTestCase(TestCase):
         self.assertFalse(token.is_valid())
 
 
+class TokenCleanupTestCase(TestCase):
+    """Test batched token cleanup (cleanup_auth_tokens)"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='test@example.com', password='TestPass123')
+
+    def make_tokens(self, model, expired, used, valid):
+        for _ in range(expired):
+            token = model.create_token(self.user)
+            token.expires_at = timezone.now() - timedelta(minutes=1)
+            token.save(update_fields=['expires_at'])
+        for _ in range(used):
+            model.create_token(self.user).mark_as_used()
+        return [model.create_token(self.user) for _ in range(valid)]
+
+    def test_command_prunes_both_tables_in_batches(self):
+        valid_reset = self.make_tokens(PasswordResetToken, expired=5, used=2, valid=2)
+        valid_verify = self.make_tokens(EmailVerificationToken, expired=3, used=0, valid=1)
+        out = io.StringIO()
+
+        call_command('cleanup_auth_tokens', batch_size=2, sleep=0, stdout=out)
+
+        self.assertEqual(
+            set(PasswordResetToken.objects.values_list('pk', flat=True)), {t.pk for t in valid_reset}
+        )
+        self.assertEqual(
+            set(EmailVerificationToken.objects.values_list('pk', flat=True)), {t.pk for t in valid_verify}
+        )
+        # 7 reset tokens in batches of 2
+        self.assertIn('auth_password_reset_token: deleted 1 (total 7)', out.getvalue())
+        self.assertIn('Deleted 10 tokens', out.getvalue())
+
+    def test_command_skips_when_locked(self):
+        self.make_tokens(PasswordResetToken, expired=1, used=0, valid=0)
+        cache.add('auth:cleanup_auth_tokens:lock', 1)
+        out = io.StringIO()
+
+        call_command('cleanup_auth_tokens', stdout=out)
+
+        self.assertIn('skipping', out.getvalue())
+        self.assertEqual(PasswordResetToken.objects.count(), 1)
+
+    def test_model_cleanup_delegates(self):
+        self.make_tokens(PasswordResetToken, expired=2, used=1, valid=1)
+        self.assertEqual(PasswordResetToken.cleanup_expired_tokens(), 3)
+        self.assertEqual(PasswordResetToken.objects.count(), 1)
+
+
+class PasswordHashingServiceTestCase(APITestCase):
+    """Test process-pool password hashing"""
+
+    def setUp(self):
+        cache.clear()  # Reset rate limit counters between tests
+        self.service = PasswordHashingService(max_workers=2, max_pending=2, timeout=10)
+        self.addCleanup(self.service.shutdown)
+
+    def test_hash_and_verify_in_pool(self):
+        """Test hashes made in the pool verify correctly"""
+        encoded = self.service.make_password('TestPass123')
+
+        self.assertTrue(encoded.startswith('argon2'))
+        self.assertTrue(self.service.check_password('TestPass123', encoded))
+        self.assertFalse(self.service.check_password('WrongPass', encoded))
+
+    def test_saturated_pool_fails_fast(self):
+        """Test requests beyond the queue-depth limit are rejected immediately"""
+        self.service._slots.acquire()
+        self.service._slots.acquire()
+
+        start = time.time()
+        with self.assertRaises(HashingServiceBusy):
+            self.service.make_password('TestPass123')
+
+        self.assertLess(time.time() - start, 0.1)
+
+    def test_timed_out_hash_holds_its_slot_until_done(self):
+        """Test a hash that outlives the timeout still counts against the limit"""
+        service = PasswordHashingService(max_workers=1, max_pending=1, timeout=0.05)
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        pool = mock.Mock(wraps=executor)
+        service._get_executor = lambda: pool
+        finish = threading.Event()
+        self.addCleanup(finish.set)
+
+        with self.assertRaises(HashingServiceBusy):
+            service._run(finish.wait)
+        # Still running in the pool: the next request is rejected, not queued
+        with self.assertRaises(HashingServiceBusy):
+            service._run(lambda: 'hash')
+        self.assertEqual(pool.submit.call_count, 1)
+
+        finish.set()
+        executor.submit(lambda: None).result()  # Runs once the slow task is done
+        self.assertEqual(service._run(lambda: 'hash'), 'hash')
+
+    def test_login_returns_503_when_saturated(self):
+        """Test saturated hashing returns 503 instead of queueing"""
+        User.objects.create_user(email='test@example.com', password='TestPass123')
+        busy_service = PasswordHashingService(max_workers=1, max_pending=0, timeout=10)
+
+        with mock.patch('authentication.models.get_hashing_service', return_value=busy_service):
+            response = self.client.post(reverse('authentication:login'), {
+                'email': 'test@example.com',
+                'password': 'TestPass123'
+            }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+class Argon2CalibrationTestCase(TestCase):
+    """Test calibrated Argon2 parameters and rehash-on-login"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', password='TestPass123')
+        # Hash inline so the calibrated parameters of this process are used
+        patcher = mock.patch(
+            'authentication.models.get_hashing_service',
+            return_value=PasswordHashingService(max_workers=0, max_pending=1, timeout=10),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(load_argon2_parameters.cache_clear)
+
+        fd, self.params_file = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        self.addCleanup(os.remove, self.params_file)
+
+    def test_calibrate_command_writes_parameters(self):
+        """Test the calibration command writes a hasher config"""
+        call_command(
+            'calibrate_argon2', target_ms=50, max_memory=19456, parallelism=[1],
+            samples=1, output=self.params_file, stdout=io.StringIO(),
+        )
+
+        with open(self.params_file) as f:
+            params = json.load(f)
+
+        self.assertEqual(params['memory_cost'], 19456)
+        self.assertEqual(params['parallelism'], 1)
+        self.assertGreaterEqual(params['time_cost'], 1)
+
+    def test_legacy_pbkdf2_hash_upgraded_on_login(self):
+        """Test legacy PBKDF2 hashes are upgraded to Argon2id on login"""
+        self.user.password = make_password('TestPass123', hasher='pbkdf2_sha256')
+        self.user.save()
+
+        self.assertIsNotNone(authenticate(email='test@example.com', password='TestPass123'))
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('argon2'))
+
+    def test_old_parameters_upgraded_on_login(self):
+        """Test hashes made with old parameters are rehashed with calibrated ones"""
+        with open(self.params_file, 'w') as f:
+            json.dump({'time_cost': 1, 'memory_cost': 19456, 'parallelism': 1}, f)
+
+        with override_settings(ARGON2_PARAMETERS_FILE=self.params_file):
+            self.assertIsNotNone(authenticate(email='test@example.com', password='TestPass123'))
+
+        self.user.refresh_from_db()
+        self.assertIn('m=19456,t=1,p=1', self.user.password)
+
+
+class BreachedPasswordTestCase(APITestCase):
+    """Test the memory-mapped breached-password index and validator"""
+
+    BREACHED = ['Tr0ub4dor&3x', 'CorrectHorse99!', 'Summer2024!!']
+
+    def setUp(self):
+        cache.clear()  # Reset rate limit counters between tests
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.addCleanup(get_index.cache_clear)
+        self.index_file = os.path.join(self.tempdir.name, 'breached.bin')
+
+        corpus = os.path.join(self.tempdir.name, 'corpus.txt')
+        with open(corpus, 'w') as f:
+            for password in self.BREACHED:
+                f.write(f'{hashlib.sha1(password.encode()).hexdigest().upper()}:42\n')
+            f.write('not-a-hash\n')
+        call_command(
+            'build_breached_password_index', corpus, output=self.index_file, run_size=2,
+            stdout=io.StringIO(), stderr=io.StringIO(),
+        )
+
+    def test_index_sorted_and_searchable(self):
+        """Test the built index holds every corpus hash, sorted and unique"""
+        index = BreachedHashIndex(self.index_file)
+        self.addCleanup(index.close)
+        self.assertEqual(len(index), 3)
+
+        for password in self.BREACHED:
+            self.assertIn(hashlib.sha1(password.encode()).digest(), index)
+        self.assertNotIn(hashlib.sha1(b'Unbreached-Pass-781').digest(), index)
+
+        with open(self.index_file, 'rb') as f:
+            f.seek(24)
+            records = [f.read(8) for _ in range(3)]
+        self.assertEqual(records, sorted(set(records)))
+
+    def test_duplicates_across_runs_removed(self):
+        """Test hashes repeated across sort runs are written once"""
+        digest = hashlib.sha1(b'Repeated-Pass-1').hexdigest()
+        count, skipped = write_index([digest, 'zz', digest, digest], self.index_file, run_size=1)
+        self.assertEqual((count, skipped), (1, 1))
+
+    def test_validator_rejects_breached_password(self):
+        """Test registration rejects a password from the index"""
+        with override_settings(BREACHED_PASSWORDS_FILE=self.index_file):
+            response = self.client.post(reverse('authentication:register'), {
+                'email': 'new@example.com',
+                'password': 'CorrectHorse99!',
+                'password_confirm': 'CorrectHorse99!',
+            })
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('password', response.data)
+        self.assertFalse(User.objects.filter(email='new@example.com').exists())
+
+    def test_missing_index_disables_check(self):
+        """Test a missing index file does not block passwords"""
+        validator = BreachedPasswordValidator(os.path.join(self.tempdir.name, 'missing.bin'))
+        validator.validate('CorrectHorse99!')
+
+    def test_invalid_file_rejected(self):
+        """Test a file without the index header is not used"""
+        bogus = os.path.join(self.tempdir.name, 'bogus.bin')
+        with open(bogus, 'wb') as f:
+            f.write(b'0' * 64)
+        with self.assertRaises(ValueError):
+            BreachedHashIndex(bogus)
+
+
+class UserImportTestCase(TestCase):
+    """Test the bulk user import command"""
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        User.objects.create_user(email='existing@example.com', password='TestPass123')
+
+    def write(self, name, content):
+        path = os.path.join(self.tempdir.name, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def import_users(self, path, **options):
+        out, err = io.StringIO(), io.StringIO()
+        call_command('import_users', path, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_csv_import_with_legacy_hashes(self):
+        """Test raw passwords are hashed and legacy hashes kept verbatim"""
+        pbkdf2 = make_password('LegacyPass1', hasher='pbkdf2_sha256')
+        path = self.write('users.csv', (
+            'email,password,password_hash,first_name,email_verified\n'
+            'Ana@Example.com,TestPass123,,Ana,true\n'
+            f'legacy@example.com,,{pbkdf2},Leo,\n'
+            'nopass@example.com,,,,\n'
+            'not-an-email,TestPass123,,,\n'
+            'EXISTING@example.com,TestPass123,,,\n'
+            'ana@example.com,TestPass123,,,\n'
+        ))
+
+        out, err = self.import_users(path, workers=0, batch_size=2)
+
+        self.assertIn('Imported 3 users', out)
+        self.assertIn('1 already existed, 2 invalid', out)
+        self.assertIn('line 5', err)
+
+        ana = User.objects.get(email='ana@example.com')
+        self.assertTrue(ana.password.startswith('argon2'))
+        self.assertTrue(ana.email_verified)
+        self.assertEqual(User.objects.get(email='legacy@example.com').password, pbkdf2)
+        self.assertFalse(User.objects.get(email='nopass@example.com').has_usable_password())
+
+        # Legacy hash verifies and is upgraded on first login
+        self.assertIsNotNone(authenticate(email='legacy@example.com', password='LegacyPass1'))
+        self.assertTrue(User.objects.get(email='legacy@example.com').password.startswith('argon2'))
+
+    def test_jsonl_import_in_process_pool(self):
+        """Test JSONL rows are hashed in worker processes, bare bcrypt accepted"""
+        bare_bcrypt = make_password('BcryptPass1', hasher='bcrypt').split('$', 1)[1]
+        rows = [{'email': f'user{i}@example.com', 'password': f'TestPass{i}!'} for i in range(4)]
+        rows.append({'email': 'bcrypt@example.com', 'password_hash': bare_bcrypt})
+        path = self.write('users.jsonl', '\n'.join(json.dumps(row) for row in rows) + '\nnot json\n')
+
+        out, err = self.import_users(path, workers=2, batch_size=3)
+
+        self.assertIn('Imported 5 users', out)
+        self.assertIn('1 invalid', out)
+        self.assertTrue(User.objects.get(email='user3@example.com').check_password('TestPass3!'))
+        self.assertTrue(User.objects.get(email='bcrypt@example.com').check_password('BcryptPass1'))
+
+    def test_unknown_hash_algorithm_rejected(self):
+        """Test hashes for algorithms not in PASSWORD_HASHERS are skipped"""
+        path = self.write('users.jsonl', json.dumps({'email': 'x@example.com', 'password_hash': 'md5$x$y'}))
+
+        out, err = self.import_users(path, workers=0)
+
+        self.assertIn('Imported 0 users', out)
+        self.assertIn('unknown or disabled algorithm', err)
+
+
 class RegistrationAPITestCase(APITestCase):
     """Test user registration endpoint"""
 
     def setUp(self):
         self.client = APIClient()
+        cache.clear()  # Reset rate limit counters between tests
         self.url = reverse('authentication:register')
 
     def test_register_success(self):
@@ -167,6 +553,37 @@ class RegistrationAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('email', response.data)
 
+    def test_register_duplicate_email_rolls_back(self):
+        """Duplicate (any case) is caught by the constraint, nothing is queued"""
+        User.objects.create_user(email='existing@example.com', password='TestPass123')
+        data = {
+            'email': 'Existing@Example.com',
+            'password': 'NewPass123!',
+            'password_confirm': 'NewPass123!'
+        }
+
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['email'], ['A user with this email already exists.'])
+        self.assertEqual(User.objects.count(), 1)
+        self.assertFalse(EmailOutbox.objects.exists())
+
+    def test_register_writes_without_reads(self):
+        """User and verification email are inserted with no existence check"""
+        data = {
+            'email': 'newuser@example.com',
+            'password': 'SecurePass123!',
+            'password_confirm': 'SecurePass123!'
+        }
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        statements = [q['sql'].split()[0].upper() for q in queries.captured_queries]
+        self.assertEqual([s for s in statements if s in ('SELECT', 'INSERT')], ['INSERT', 'INSERT'])
+
     def test_register_password_mismatch(self):
         """Test registration with mismatched passwords fails"""
         data = {
@@ -198,6 +615,7 @@ class LoginAPITestCase(APITestCase):
 
     def setUp(self):
         self.client = APIClient()
+        cache.clear()  # Reset rate limit counters between tests
         self.url = reverse('authentication:login')
         self.user = User.objects.create_user(
             email='test@example.com',
@@ -269,11 +687,130 @@ class LoginAPITestCase(APITestCase):
         self.assertLess(abs(time1 - time2), 0.1)
 
 
+@override_settings(AUTH_RATE_LIMITS={
+    'login_ip': (10, 300),
+    'login_email': (3, 300),
+    'register_ip': (3, 3600),
+    'forgot_password_ip': (10, 3600),
+    'forgot_password_email': (2, 3600),
+})
+class RateLimitTestCase(APITestCase):
+    """Test sliding-window rate limiting on auth endpoints"""
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        self.login_url = reverse('authentication:login')
+        self.forgot_url = reverse('authentication:forgot_password')
+
+    def test_login_limited_per_email(self):
+        """Test login attempts are limited per normalized email"""
+        for email in ['victim@example.com', 'VICTIM@example.com', ' victim@example.com']:
+            response = self.client.post(self.login_url, {
+                'email': email,
+                'password': 'WrongPass'
+            }, format='json')
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Over the limit: rejected before any database query or password hash
+        with self.assertNumQueries(0):
+            response = self.client.post(self.login_url, {
+                'email': 'Victim@Example.com',
+                'password': 'WrongPass'
+            }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+        # Other accounts are not affected
+        response = self.client.post(self.login_url, {
+            'email': 'other@example.com',
+            'password': 'WrongPass'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_forgot_password_limited(self):
+        """Test forgot-password requests are limited per email"""
+        for _ in range(2):
+            response = self.client.post(self.forgot_url, {'email': 'test@example.com'}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(self.forgot_url, {'email': 'test@example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_forwarded_for_does_not_bypass_ip_limit(self):
+        """Test rotating X-Forwarded-For does not reset the per-IP limit"""
+        register_url = reverse('authentication:register')
+        codes = [
+            self.client.post(register_url, {}, format='json', HTTP_X_FORWARDED_FOR=f'198.51.100.{i}').status_code
+            for i in range(4)
+        ]
+        self.assertEqual(codes, [400, 400, 400, 429])
+
+    @override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1})
+    def test_forwarded_for_uses_trusted_proxy_hop(self):
+        """Test behind one proxy only the address it appended is used"""
+        register_url = reverse('authentication:register')
+        codes = [
+            self.client.post(
+                register_url, {}, format='json', HTTP_X_FORWARDED_FOR=f'198.51.100.{i}, 203.0.113.7',
+            ).status_code
+            for i in range(4)
+        ]
+        self.assertEqual(codes, [400, 400, 400, 429])
+
+        # Another client behind the same proxy has its own counter
+        response = self.client.post(register_url, {}, format='json', HTTP_X_FORWARDED_FOR='203.0.113.8')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_previous_window_weighted(self):
+        """Test the previous window counts towards the sliding estimate"""
+        from .throttling import SlidingWindowThrottle
+
+        # Limit 5: 8 requests last window, 1 this window, 75% overlap -> estimate 7.
+        # The estimate drops below 5 once the overlap is under 50%: 25s from now.
+        self.assertEqual(SlidingWindowThrottle._compute_wait(5, 100, 1, 8, 0.25), 25)
+
+
+class MinimumResponseTimeMiddlewareTestCase(SimpleTestCase):
+    """Test non-blocking anti-enumeration padding"""
+
+    def setUp(self):
+        self.request = RequestFactory().post('/api/auth/login/')
+
+    def test_unpadded_response_not_delayed(self):
+        """Test responses without a deadline are returned immediately"""
+        middleware = MinimumResponseTimeMiddleware(lambda request: HttpResponse())
+
+        start = time.monotonic()
+        middleware(self.request)
+
+        self.assertLess(time.monotonic() - start, 0.1)
+
+    async def test_async_padding_is_concurrent(self):
+        """Test padded responses wait concurrently under ASGI"""
+        async def failed_login(request):
+            return pad_response(HttpResponse(status=401), time.monotonic(), 0.5)
+
+        middleware = MinimumResponseTimeMiddleware(failed_login)
+
+        start = time.monotonic()
+        responses = await asyncio.gather(*(middleware(self.request) for _ in range(50)))
+        duration = time.monotonic() - start
+
+        # Every response keeps the 500ms minimum...
+        self.assertGreaterEqual(duration, 0.5)
+        self.assertTrue(all(response.status_code == 401 for response in responses))
+        # ...but 50 padded failures do not take 50 x 500ms
+        self.assertLess(duration, 1.5)
+
+
 class PasswordResetAPITestCase(TransactionTestCase):
     """Test password reset endpoints"""
 
     def setUp(self):
         self.client = APIClient()
+        cache.clear()  # Reset rate limit counters between tests
         self.forgot_url = reverse('authentication:forgot_password')
         self.reset_url = reverse('authentication:reset_password')
         self.user = User.objects.create_user(
@@ -290,9 +827,10 @@ class PasswordResetAPITestCase(TransactionTestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('message', response.data)
 
-        # Verify token was created
-        token = PasswordResetToken.objects.filter(user=self.user, is_used=False).first()
-        self.assertIsNotNone(token)
+        # Verify a stateless token was queued (no token row)
+        self.assertFalse(PasswordResetToken.objects.exists())
+        entry = EmailOutbox.objects.get(user=self.user, kind=EmailOutbox.Kind.PASSWORD_RESET)
+        self.assertEqual(password_reset_token.check_token(entry.payload['token']), self.user)
 
     def test_forgot_password_nonexistent_user(self):
         """Test password reset for non-existent user returns same message (anti-enumeration)"""
@@ -376,11 +914,117 @@ class PasswordResetAPITestCase(TransactionTestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
 
+class SignedTokenTestCase(APITestCase):
+    """Test stateless signed reset / verification tokens"""
+
+    def setUp(self):
+        cache.clear()  # Reset rate limit counters between tests
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='OldPass123'
+        )
+
+    def test_issue_and_check_without_writes(self):
+        with self.assertNumQueries(0):
+            token = password_reset_token.make_token(self.user)
+        # Validation only reads the user
+        with self.assertNumQueries(1):
+            self.assertEqual(password_reset_token.check_token(token), self.user)
+
+    def test_reset_token_single_use(self):
+        token = password_reset_token.make_token(self.user)
+        data = {'token': token, 'password': 'NewPass123!', 'password_confirm': 'NewPass123!'}
+
+        response = self.client.post(reverse('authentication:reset_password'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('NewPass123!'))
+
+        # The new password hash invalidates the token
+        data['password'] = data['password_confirm'] = 'OtherPass456!'
+        response = self.client.post(reverse('authentication:reset_password'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_expired_token_rejected(self):
+        generator = EmailVerificationTokenGenerator(clock=lambda: time.time() - 25 * 3600)
+        token = generator.make_token(self.user)
+
+        self.assertIsNone(email_verification_token.check_token(token))
+
+    def test_tampered_and_cross_purpose_tokens_rejected(self):
+        token = password_reset_token.make_token(self.user)
+        uid, expires, signature = token.split('.')
+        later = _int_to_base36(int(expires, 36) + 3600)
+
+        self.assertIsNone(password_reset_token.check_token(f'{uid}.{later}.{signature}'))
+        self.assertIsNone(password_reset_token.check_token(f'{uid}.{expires}.{signature[:-2]}AA'))
+        self.assertIsNone(password_reset_token.check_token('not.a.token'))
+        self.assertIsNone(email_verification_token.check_token(token))
+
+    def test_verify_email_with_signed_token(self):
+        token = email_verification_token.make_token(self.user)
+        url = reverse('authentication:verify_email')
+
+        response = self.client.post(url, {'token': token}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.email_verified)
+
+        response = self.client.post(url, {'token': token}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_stored_token_consumed_once(self):
+        legacy = PasswordResetToken.create_token(self.user)
+
+        self.assertEqual(PasswordResetToken.consume(legacy.token), self.user.pk)
+        self.assertIsNone(PasswordResetToken.consume(legacy.token))
+        self.assertIsNone(PasswordResetToken.consume('unknown'))
+        legacy.refresh_from_db()
+        self.assertTrue(legacy.is_used)
+        self.assertIsNotNone(legacy.used_at)
+
+    def test_expired_stored_token_not_consumed(self):
+        legacy = EmailVerificationToken.create_token(self.user)
+        EmailVerificationToken.objects.filter(pk=legacy.pk).update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        self.assertIsNone(EmailVerificationToken.consume(legacy.token))
+
+    def test_concurrent_reset_with_same_token(self):
+        """A request that validated the token but lost the race is rejected"""
+        token = password_reset_token.make_token(self.user)
+        data = {'token': token, 'password': 'NewPass123!', 'password_confirm': 'NewPass123!'}
+        url = reverse('authentication:reset_password')
+
+        # Both requests pass validation before either writes
+        stale = password_reset_token.check_token(token)
+        with mock.patch('authentication.serializers.password_reset_token.check_token', return_value=stale):
+            first = self.client.post(url, data, format='json')
+            second = self.client.post(url, dict(data, password='OtherPass456!', password_confirm='OtherPass456!'),
+                                      format='json')
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.status_code, status.HTTP_400_BAD_REQUEST)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('NewPass123!'))
+
+    def test_legacy_verification_token_still_accepted(self):
+        legacy = EmailVerificationToken.create_token(self.user)
+
+        response = self.client.post(reverse('authentication:verify_email'), {'token': legacy.token}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        legacy.refresh_from_db()
+        self.assertTrue(legacy.is_used)
+
+
 class SecurityTestCase(APITestCase):
     """Security-specific tests"""
 
     def setUp(self):
         self.client = APIClient()
+        cache.clear()  # Reset rate limit counters between tests
         self.user = User.objects.create_user(
             email='test@example.com',
             password='TestPass123'
@@ -436,11 +1080,654 @@ class SecurityTestCase(APITestCase):
         self.assertTrue(all(c in url_safe_chars for c in token1.token))
 
 
+class CachedUserLoaderTestCase(APITestCase):
+    """Test JWT-authenticated requests load the user from cache"""
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()  # Cached users and their version stamps
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='TestPass123',
+            first_name='Test'
+        )
+        tokens = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens.access_token}')
+        self.profile_url = reverse('authentication:profile')
+
+    def test_profile_served_without_query_when_cached(self):
+        """Test the user row is only fetched once"""
+        with self.assertNumQueries(1):
+            self.client.get(self.profile_url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.profile_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['first_name'], 'Test')
+
+    def test_cache_invalidated_on_save(self):
+        """Test User.save invalidates the cached user"""
+        self.client.get(self.profile_url)
+
+        self.user.first_name = 'Changed'
+        self.user.save()
+
+        response = self.client.get(self.profile_url)
+        self.assertEqual(response.data['first_name'], 'Changed')
+
+    def test_inactive_user_rejected(self):
+        """Test deactivated users are rejected once the cache is invalidated"""
+        self.client.get(self.profile_url)
+
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ActivityBufferTestCase(APITestCase):
+    """Test last_login / last_seen_at are buffered and flushed in batches"""
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()  # Login rate limit counters and cached users
+        activity._buffer.drain()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='TestPass123'
+        )
+
+    def test_login_does_not_write_user_row(self):
+        """Test login records last_login without an UPDATE per request"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('authentication:login'), {
+                'email': 'test@example.com',
+                'password': 'TestPass123'
+            })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([q for q in queries.captured_queries if q['sql'].startswith('UPDATE')])
+        self.user.refresh_from_db()
+        self.assertIsNone(self.user.last_login)
+
+        self.assertEqual(activity.flush(), 1)
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_login)
+
+    def test_authenticated_request_records_last_seen(self):
+        """Test JWT-authenticated requests set last_seen_at on flush"""
+        tokens = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens.access_token}')
+        for _ in range(3):
+            self.client.get(reverse('authentication:profile'))
+
+        self.assertEqual(len(activity._buffer), 1)
+        activity.flush()
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_seen_at)
+        self.assertEqual(len(activity._buffer), 0)
+
+    def test_flush_never_moves_timestamps_back(self):
+        """Test an older buffered value does not overwrite a newer one"""
+        newer = timezone.now()
+        User.objects.filter(pk=self.user.pk).update(last_login=newer)
+
+        activity.record_login(self.user.pk, newer - timedelta(minutes=5))
+        activity.record_seen(self.user.pk, newer)
+        activity.flush()
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.last_login, newer)
+        self.assertEqual(self.user.last_seen_at, newer)
+
+    def test_failed_flush_keeps_rows(self):
+        """Test rows are put back when the flush fails"""
+        activity.record_login(self.user.pk)
+
+        with mock.patch.object(activity, 'write_activity', side_effect=RuntimeError('db down')):
+            with self.assertRaises(RuntimeError):
+                activity.flush()
+
+        self.assertEqual(activity.flush(), 1)
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_login)
+
+    @override_settings(AUTH_ACTIVITY_BUFFER_SIZE=2)
+    def test_full_buffer_flushes_without_flusher(self):
+        """Test reaching the buffer size writes the pending rows"""
+        other = User.objects.create_user(email='other@example.com', password='TestPass123')
+
+        activity.record_seen(self.user.pk)
+        self.assertEqual(len(activity._buffer), 1)
+        activity.record_seen(other.pk)
+
+        self.assertEqual(len(activity._buffer), 0)
+        self.assertEqual(User.objects.filter(last_seen_at__isnull=False).count(), 2)
+
+
+class AuthEventAuditTestCase(APITestCase):
+    """Test the batched authentication audit log"""
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()  # Login rate limit counters and cached users
+        audit._queue.drain()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='TestPass123'
+        )
+        self.login_url = reverse('authentication:login')
+
+    def test_login_events_queued_not_inserted(self):
+        """Test login success and failure are queued, not inserted per request"""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.login_url, {'email': 'test@example.com', 'password': 'TestPass123'},
+                             HTTP_USER_AGENT='TestAgent/1.0')
+            self.client.post(self.login_url, {'email': 'Nobody@Example.com', 'password': 'WrongPass123'})
+
+        self.assertFalse([q for q in queries.captured_queries if 'auth_event' in q['sql']])
+        self.assertEqual(AuthEvent.objects.count(), 0)
+
+        self.assertEqual(audit.flush(), 2)
+        succeeded = AuthEvent.objects.get(event_type=AuthEvent.EventType.LOGIN_SUCCEEDED)
+        self.assertEqual(succeeded.user_id, self.user.pk)
+        self.assertEqual(succeeded.ip_address, '127.0.0.1')
+        self.assertEqual(succeeded.user_agent, 'TestAgent/1.0')
+        failed = AuthEvent.objects.get(event_type=AuthEvent.EventType.LOGIN_FAILED)
+        self.assertIsNone(failed.user_id)
+        self.assertEqual(failed.email, 'nobody@example.com')
+
+    def test_password_change_recorded(self):
+        """Test change_password records an event for the user"""
+        tokens = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens.access_token}')
+        response = self.client.post(reverse('authentication:change_password'), {
+            'old_password': 'TestPass123',
+            'new_password': 'NewSecurePass456!',
+            'new_password_confirm': 'NewSecurePass456!',
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        audit.flush()
+        self.assertTrue(AuthEvent.objects.filter(
+            event_type=AuthEvent.EventType.PASSWORD_CHANGED, user_id=self.user.pk
+        ).exists())
+
+    @override_settings(AUTH_AUDIT_BATCH_SIZE=3)
+    def test_full_batch_written_with_one_insert(self):
+        """Test a full batch is bulk inserted without a background flusher"""
+        request = RequestFactory().get('/')
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(3):
+                audit.record_event(AuthEvent.EventType.LOGIN_FAILED, request, email='x@example.com')
+
+        inserts = [q for q in queries.captured_queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(AuthEvent.objects.count(), 3)
+        self.assertEqual(len(audit._queue), 0)
+
+    @override_settings(AUTH_AUDIT_QUEUE_SIZE=2)
+    def test_failed_flush_requeues_within_bound(self):
+        """Test events are kept after a failed flush, oldest dropped when full"""
+        request = RequestFactory().get('/')
+        for email in ('a@example.com', 'b@example.com'):
+            audit.record_event(AuthEvent.EventType.LOGIN_FAILED, request, email=email)
+
+        with mock.patch.object(AuthEvent.objects, 'bulk_create', side_effect=RuntimeError('db down')):
+            with self.assertRaises(RuntimeError):
+                audit.flush()
+
+        audit.record_event(AuthEvent.EventType.LOGIN_FAILED, request, email='c@example.com')
+        audit.flush()
+        self.assertEqual(
+            sorted(AuthEvent.objects.values_list('email', flat=True)), ['b@example.com', 'c@example.com']
+        )
+
+    def test_maintain_command_expires_old_events(self):
+        """Test maintain_auth_events removes events older than the retention"""
+        now = timezone.now()
+        AuthEvent.objects.bulk_create([
+            AuthEvent(event_type=AuthEvent.EventType.LOGIN_FAILED, created_at=now - timedelta(days=120)),
+            AuthEvent(event_type=AuthEvent.EventType.LOGIN_FAILED, created_at=now),
+        ])
+
+        call_command('maintain_auth_events', retain_months=2, stdout=io.StringIO())
+        self.assertEqual(list(AuthEvent.objects.values_list('created_at', flat=True)), [now])
+
+    def test_partition_months(self):
+        """Test monthly partition bounds and names"""
+        month = month_start(timezone.now().replace(year=2026, month=12, day=15))
+        self.assertEqual((month.year, month.month, month.day), (2026, 12, 1))
+        self.assertEqual(add_months(month, 1).year, 2027)
+        self.assertEqual(add_months(month, -12).month, 12)
+        self.assertEqual(partition_name(add_months(month, 1)), 'auth_event_y2027m01')
+
+
+class ORJSONRenderingTestCase(APITestCase):
+    """Test the orjson renderer/parser and the read-only user serializer"""
+
+    def test_output_matches_drf_json_renderer(self):
+        """Test UserSerializer + ORJSONRenderer render like ModelSerializer + JSONRenderer"""
+        class ModelUserSerializer(serializers.ModelSerializer):
+            class Meta:
+                model = User
+                fields = list(UserSerializer.fields)
+
+        user = User.objects.create_user(email='test@example.com', password='TestPass123', first_name='Zoë')
+        expected = JSONRenderer().render(ModelUserSerializer(user).data)
+        rendered = ORJSONRenderer().render(UserSerializer(user).data)
+
+        self.assertEqual(json.loads(rendered), json.loads(expected))
+        self.assertEqual(
+            json.loads(ORJSONRenderer().render(UserSerializer([user, user], many=True).data)),
+            [json.loads(expected)] * 2,
+        )
+
+    def test_renders_types_like_drf(self):
+        """Test Decimal, lazy strings, timedelta, line separators and big integers"""
+        rendered = ORJSONRenderer().render({
+            'amount': Decimal('10.50'),
+            'label': gettext_lazy('Invalid credentials'),
+            'ttl': timedelta(minutes=1),
+            'text': 'a\u2028b',
+            1: {'x'},
+        })
+        self.assertEqual(
+            rendered,
+            b'{"amount":"10.50","label":"Invalid credentials","ttl":"60.0","text":"a\\u2028b","1":["x"]}',
+        )
+        self.assertEqual(ORJSONRenderer().render({'big': 2 ** 70}), b'{"big":1180591620717411303424}')
+
+    def test_parser_rejects_invalid_json(self):
+        """Test the parser returns parsed data and raises ParseError on bad input"""
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(b'{"email": "a@b.co"}')), {'email': 'a@b.co'})
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"email": '))
+
+    def test_api_responses_rendered_with_orjson(self):
+        """Test login returns the user as JSON with string id and UTC timestamp"""
+        cache.clear()
+        user = User.objects.create_user(email='test@example.com', password='TestPass123')
+        response = self.client.post(reverse('authentication:login'), {
+            'email': 'test@example.com',
+            'password': 'TestPass123'
+        }, format='json')
+
+        body = response.json()
+        self.assertEqual(body['user']['id'], str(user.pk))
+        self.assertTrue(body['user']['date_joined'].endswith('Z'))
+
+
+class TokenRevocationTestCase(APITestCase):
+    """Test server-side logout and refresh token rotation"""
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()  # Revoked token ids and cached users
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='TestPass123'
+        )
+        self.refresh = RefreshToken.for_user(self.user)
+        self.access = str(self.refresh.access_token)
+        self.refresh_url = reverse('authentication:token_refresh')
+
+    def test_logout_revokes_access_and_refresh_tokens(self):
+        """Test logged-out tokens are rejected"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+
+        response = self.client.post(reverse('authentication:logout'), {
+            'refresh': str(self.refresh)
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(reverse('authentication:profile'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.credentials()
+        response = self.client.post(self.refresh_url, {'refresh': str(self.refresh)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_rotated_refresh_token_single_use(self):
+        """Test a rotated refresh token cannot be used again"""
+        response = self.client.post(self.refresh_url, {'refresh': str(self.refresh)}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data)
+        self.assertIn('refresh', response.data)
+
+        response = self.client.post(self.refresh_url, {'refresh': str(self.refresh)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocation_entry_expires_with_token(self):
+        """Test revocation entries live only as long as the token"""
+        from .revocation import revoke_token, revoked_key
+
+        access = self.refresh.access_token
+        with mock.patch('authentication.revocation.cache') as mock_cache:
+            revoke_token(access)
+
+        key, value = mock_cache.add.call_args[0]
+        timeout = mock_cache.add.call_args[1]['timeout']
+        self.assertEqual(key, revoked_key(access['jti']))
+        self.assertLessEqual(timeout, 15 * 60 + 1)
+
+
+class EmailOutboxTestCase(APITestCase):
+    """Test queued email delivery (process_email_outbox)"""
+
+    def setUp(self):
+        cache.clear()  # Email cooldowns and rate limit counters
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='TestPass123'
+        )
+
+    def test_register_queues_verification_email(self):
+        """Registration responds without calling the email provider"""
+        with mock.patch('authentication.outbox.send_email_verification') as send:
+            response = self.client.post(reverse('authentication:register'), {
+                'email': 'new@example.com',
+                'password': 'NewPass123',
+                'password_confirm': 'NewPass123',
+            }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        send.assert_not_called()
+        entry = EmailOutbox.objects.get(user__email='new@example.com')
+        self.assertEqual(entry.kind, EmailOutbox.Kind.EMAIL_VERIFICATION)
+        self.assertEqual(entry.status, EmailOutbox.Status.PENDING)
+
+    def test_process_marks_sent(self):
+        EmailOutbox.enqueue(self.user, EmailOutbox.Kind.PASSWORD_RESET, token='abc', locale='en')
+
+        with mock.patch('authentication.outbox.send_password_reset_email', return_value=True) as send:
+            counts = process_batch()
+
+        send.assert_called_once_with(self.user, 'abc', retry_count=1, locale='en')
+        self.assertEqual(counts[EmailOutbox.Status.SENT], 1)
+        entry = EmailOutbox.objects.get()
+        self.assertEqual(entry.status, EmailOutbox.Status.SENT)
+        self.assertIsNotNone(entry.sent_at)
+
+        # Sent rows are not claimed again
+        self.assertEqual(sum(process_batch().values()), 0)
+
+    def test_failure_backs_off_then_dead_letters(self):
+        EmailOutbox.enqueue(self.user, EmailOutbox.Kind.PASSWORD_CHANGED)
+
+        with mock.patch('authentication.outbox.send_password_changed_notification', return_value=False):
+            process_batch(max_attempts=2, backoff_seconds=30)
+            entry = EmailOutbox.objects.get()
+            self.assertEqual(entry.status, EmailOutbox.Status.PENDING)
+            self.assertEqual(entry.attempts, 1)
+            self.assertGreater(entry.next_attempt_at, timezone.now() + timedelta(seconds=20))
+
+            # Not due yet
+            self.assertEqual(sum(process_batch(max_attempts=2).values()), 0)
+
+            EmailOutbox.objects.update(next_attempt_at=timezone.now())
+            process_batch(max_attempts=2)
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, EmailOutbox.Status.DEAD)
+        self.assertEqual(entry.attempts, 2)
+        self.assertTrue(entry.last_error)
+
+    def test_open_circuit_reschedules_without_using_attempts(self):
+        EmailOutbox.enqueue(self.user, EmailOutbox.Kind.PASSWORD_CHANGED)
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=120)
+        breaker.record_failure()
+        transport = mock.Mock()
+        transport.send.side_effect = lambda params: breaker.before_request()
+
+        with mock.patch('authentication.email_service.get_transport', return_value=transport):
+            for _ in range(10):
+                EmailOutbox.objects.update(next_attempt_at=timezone.now())
+                counts = process_batch(max_attempts=2)
+                self.assertEqual(counts[EmailOutbox.Status.PENDING], 1)
+
+        entry = EmailOutbox.objects.get()
+        self.assertEqual(entry.status, EmailOutbox.Status.PENDING)
+        self.assertEqual(entry.attempts, 0)
+        self.assertGreater(entry.next_attempt_at, timezone.now() + timedelta(seconds=100))
+        self.assertIn('circuit is open', entry.last_error)
+
+    def test_payload_coalesced_during_delivery_is_sent(self):
+        EmailOutbox.enqueue(self.user, EmailOutbox.Kind.PASSWORD_RESET, token='old')
+        [entry] = claim_batch(10)
+        # A new request arrives while the worker is sending the claimed row
+        EmailOutbox.enqueue(self.user, EmailOutbox.Kind.PASSWORD_RESET, token='new', locale='en')
+
+        with mock.patch('authentication.outbox.send_password_reset_email', return_value=True) as send:
+            self.assertEqual(deliver(entry, max_attempts=8, backoff_seconds=30), EmailOutbox.Status.PENDING)
+            send.assert_called_once_with(self.user, 'old', retry_count=1, locale=None)
+
+            row = EmailOutbox.objects.get()
+            self.assertEqual(row.payload, {'token': 'new', 'locale': 'en'})
+            self.assertEqual(row.dedupe_key, f'{EmailOutbox.Kind.PASSWORD_RESET}:{self.user.pk}')
+            self.assertEqual(row.attempts, 0)
+
+            self.assertEqual(process_batch()[EmailOutbox.Status.SENT], 1)
+            send.assert_called_with(self.user, 'new', retry_count=1, locale='en')
+
+        row = EmailOutbox.objects.get()
+        self.assertEqual(row.status, EmailOutbox.Status.SENT)
+        self.assertIsNone(row.dedupe_key)
+
+    def test_pending_token_emails_are_coalesced(self):
+        for token in ('first', 'second', 'third'):
+            EmailOutbox.enqueue(self.user, EmailOutbox.Kind.PASSWORD_RESET, token=token)
+
+        entry = EmailOutbox.objects.get()
+        self.assertEqual(entry.payload, {'token': 'third'})
+
+        # Once sent, the key is released and a new email can be queued
+        with mock.patch('authentication.outbox.send_password_reset_email', return_value=True):
+            process_batch()
+        EmailOutbox.enqueue(self.user, EmailOutbox.Kind.PASSWORD_RESET, token='fourth')
+        self.assertEqual(EmailOutbox.objects.count(), 2)
+        self.assertIsNone(EmailOutbox.objects.get(status=EmailOutbox.Status.SENT).dedupe_key)
+
+    def test_resend_burst_queues_one_email(self):
+        self.client.force_authenticate(self.user)
+        url = reverse('authentication:resend_verification')
+
+        for _ in range(5):
+            response = self.client.post(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(EmailOutbox.objects.filter(kind=EmailOutbox.Kind.EMAIL_VERIFICATION).count(), 1)
+
+    def test_locale_captured_from_accept_language(self):
+        url = reverse('authentication:forgot_password')
+        self.client.post(url, {'email': 'test@example.com'}, format='json', HTTP_ACCEPT_LANGUAGE='fr-FR, en-US;q=0.8, es;q=0.5')
+
+        entry = EmailOutbox.objects.get(kind=EmailOutbox.Kind.PASSWORD_RESET)
+        self.assertEqual(entry.payload['locale'], 'en')
+
+        with mock.patch('authentication.email_service.get_transport') as get_transport:
+            process_batch()
+        params = get_transport.return_value.send.call_args.args[0]
+        self.assertEqual(params['subject'], render_email('password_reset', 'en', user_name='x', action_url='x', expiry_hours=1)[0])
+
+    def test_forgot_password_burst_coalesced_without_cooldown(self):
+        url = reverse('authentication:forgot_password')
+        with self.settings(AUTH_EMAIL_COOLDOWN_SECONDS=0):
+            for _ in range(3):
+                self.client.post(url, {'email': 'test@example.com'}, format='json')
+
+        entry = EmailOutbox.objects.get(kind=EmailOutbox.Kind.PASSWORD_RESET)
+        self.assertEqual(password_reset_token.check_token(entry.payload['token']), self.user)
+
+    def test_tokens_reused_within_cooldown(self):
+        def token_at(timestamp):
+            return EmailVerificationTokenGenerator(clock=lambda: timestamp).make_token(self.user)
+
+        # Expiry rounded up to the 60s cooldown
+        self.assertEqual(token_at(1_000_000_001), token_at(1_000_000_019))
+        self.assertNotEqual(token_at(1_000_000_019), token_at(1_000_000_021))
+
+    def test_backoff_delay(self):
+        self.assertEqual(backoff_delay(1, 30), 30)
+        self.assertEqual(backoff_delay(3, 30), 120)
+        self.assertEqual(backoff_delay(20, 30), 3600)
+
+
+class EmailTemplateTestCase(SimpleTestCase):
+    """Test precompiled email templates"""
+
+    def test_render_escapes_values(self):
+        subject, html_content = render_email(
+            'password_reset', 'es',
+            user_name='<script>x</script>',
+            action_url='https://example.com/reset?token=a&b=1',
+            expiry_hours=1,
+        )
+
+        self.assertEqual(subject, 'Restablecer Contraseña - Betancourt Audio')
+        self.assertIn('&lt;script&gt;', html_content)
+        self.assertNotIn('<script>', html_content)
+        self.assertIn('href="https://example.com/reset?token=a&amp;b=1"', html_content)
+        self.assertIn('lang="es"', html_content)
+
+    def test_locale_resolution(self):
+        self.assertEqual(resolve_locale('en-US'), 'en')
+        self.assertEqual(resolve_locale('es_MX'), 'es')
+        with self.settings(EMAIL_DEFAULT_LOCALE='es'):
+            self.assertEqual(resolve_locale('fr'), 'es')
+            self.assertEqual(resolve_locale(None), 'es')
+
+        subject, html_content = render_email('password_changed', 'en', user_name='Ana')
+        self.assertEqual(subject, 'Your Password Was Changed - Betancourt Audio')
+        self.assertIn('All rights reserved', html_content)
+
+    def test_locale_from_accept_language(self):
+        factory = RequestFactory()
+
+        def locale_for(header):
+            return locale_from_request(factory.get('/', HTTP_ACCEPT_LANGUAGE=header))
+
+        self.assertEqual(locale_for('en-US,en;q=0.9'), 'en')
+        self.assertEqual(locale_for('fr;q=0.9, es-MX;q=0.7, en;q=0.8'), 'en')
+        self.assertEqual(locale_for('de, es-CO;q=0.4'), 'es')
+        with self.settings(EMAIL_DEFAULT_LOCALE='es'):
+            self.assertEqual(locale_for('fr, en;q=0'), 'es')
+            self.assertEqual(locale_for('en;q=abc'), 'es')
+            self.assertEqual(locale_for(''), 'es')
+
+    def test_compiled_once_and_minified(self):
+        get_template.cache_clear()
+        for name in ('password_reset', 'email_verification'):
+            for _ in range(3):
+                render_email(name, 'es', user_name='Ana', action_url='u', expiry_hours=1)
+
+        self.assertEqual(get_template.cache_info().misses, 2)
+        _, html_content = render_email('password_changed', 'es', user_name='Ana')
+        self.assertNotIn('\n', html_content)
+        self.assertNotIn('<!--', html_content)
+        self.assertNotIn('$', html_content)
+
+    def test_minify_html(self):
+        self.assertEqual(minify_html('<p>\n  <!-- note -->\n  Hi  $name\n</p>\n'), '<p> Hi $name </p>')
+
+    def test_missing_value_raises(self):
+        with self.assertRaises(KeyError):
+            render_email('password_reset', 'es', user_name='Ana')
+
+
+class EmailTransportTestCase(SimpleTestCase):
+    """Test the pooled Resend transport and its circuit breaker"""
+
+    def setUp(self):
+        self.now = 0.0
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=lambda: self.now)
+        self.transport = ResendTransport('http://stub', 'key', 1, 1, 2, self.breaker)
+
+    def respond(self, status_code, body=None):
+        response = mock.Mock(status_code=status_code, text='')
+        response.json.return_value = body or {}
+        return mock.patch.object(self.transport.session, 'post', return_value=response)
+
+    def test_send_reuses_session(self):
+        with self.respond(200, {'id': 'abc'}) as post:
+            self.assertEqual(self.transport.send({'to': ['a@example.com']}), {'id': 'abc'})
+            self.transport.send({'to': ['b@example.com']})
+
+        self.assertEqual(post.call_count, 2)
+        self.assertEqual(post.call_args[0][0], 'http://stub/emails')
+        self.assertEqual(post.call_args[1]['timeout'], (1, 1))
+        self.assertEqual(self.transport.session.headers['Authorization'], 'Bearer key')
+
+    def test_circuit_opens_after_threshold(self):
+        with self.respond(503) as post:
+            for _ in range(3):
+                with self.assertRaises(EmailTransportError):
+                    self.transport.send({})
+            self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+            # Fails fast without touching the network
+            with self.assertRaises(CircuitOpen):
+                self.transport.send({})
+            self.assertEqual(post.call_count, 3)
+
+    def test_half_open_trial_closes_circuit(self):
+        with self.respond(503):
+            for _ in range(3):
+                with self.assertRaises(EmailTransportError):
+                    self.transport.send({})
+
+        self.now = 31
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        with self.respond(200):
+            self.transport.send({})
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_failed_trial_reopens_circuit(self):
+        with self.respond(503):
+            for _ in range(3):
+                with self.assertRaises(EmailTransportError):
+                    self.transport.send({})
+            self.now = 31
+            with self.assertRaises(EmailTransportError):
+                self.transport.send({})
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    def test_client_errors_do_not_trip_breaker(self):
+        with self.respond(422):
+            for _ in range(5):
+                with self.assertRaises(EmailTransportError):
+                    self.transport.send({})
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_email_service_stops_retrying_when_open(self):
+        transport = mock.Mock()
+        transport.send.side_effect = CircuitOpen('open')
+        user = mock.Mock(email='test@example.com', first_name='', id=1)
+
+        with mock.patch('authentication.email_service.get_transport', return_value=transport):
+            with self.assertRaises(CircuitOpen):
+                send_password_reset_email(user, 'token', retry_count=3)
+        self.assertEqual(transport.send.call_count, 1)
+
+    def test_open_circuit_reports_time_until_trial(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.now += 10
+        with self.assertRaises(CircuitOpen) as raised:
+            self.breaker.before_request()
+        self.assertEqual(raised.exception.retry_after, 20)
+
+
 class PerformanceTestCase(APITestCase):
     """Performance testing"""
 
     def setUp(self):
         self.client = APIClient()
+        cache.clear()  # Reset rate limit counters between tests
         self.user = User.objects.create_user(
             email='test@example.com',
             password='TestPass123'
@@ -0,0 +1,139 @@
+"""
+Rate Limiting for Authentication Endpoints
+
+This module contains DRF throttle classes for the public authentication
+endpoints (register, login, forgot-password).
+
+Algorithm (sliding window counter):
+- Two fixed-window counters per key (current and previous window)
+- The previous window is weighted by how much of it still overlaps the
+  sliding window: estimate = previous * (1 - elapsed) + current
+- O(1) per request: one cache get_many + one incr, no timestamp lists
+
+Throttles run in DRF's initial() step, before the view body, so rejected
+requests never reach the database, the password hasher or the email API.
+
+Limits are configured per scope in settings.AUTH_RATE_LIMITS as
+(limit, window_seconds). The Django cache must be shared between workers
+(Redis in production, see CACHES in settings.py).
+
+Related: BET-18 (Backend API Endpoints)
+"""
+
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+CACHE_KEY_PREFIX = 'auth:ratelimit'
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Base sliding-window throttle.
+
+    Subclasses set ``scope`` (key in AUTH_RATE_LIMITS) and implement
+    ``get_ident_key`` (return None to skip throttling the request).
+    """
+
+    scope = None
+
+    def __init__(self):
+        self._wait = None
+
+    def get_ident_key(self, request):
+        raise NotImplementedError('.get_ident_key() must be overridden')
+
+    def allow_request(self, request, view):
+        limit, window = settings.AUTH_RATE_LIMITS[self.scope]
+        ident = self.get_ident_key(request)
+        if ident is None:
+            return True
+
+        now = time.time()
+        current_window, offset = divmod(now, window)
+        current_window = int(current_window)
+        elapsed = offset / window
+
+        base_key = f'{CACHE_KEY_PREFIX}:{self.scope}:{ident}'
+        current_key = f'{base_key}:{current_window}'
+        previous_key = f'{base_key}:{current_window - 1}'
+
+        counts = cache.get_many([current_key, previous_key])
+        current = counts.get(current_key, 0)
+        previous = counts.get(previous_key, 0)
+
+        if previous * (1 - elapsed) + current >= limit:
+            self._wait = self._compute_wait(limit, window, current, previous, elapsed)
+            return False
+
+        # Counters live for two windows (current + sliding overlap)
+        if not cache.add(current_key, 1, timeout=window * 2):
+            try:
+                cache.incr(current_key)
+            except ValueError:
+                # Key expired between add() and incr()
+                cache.set(current_key, 1, timeout=window * 2)
+
+        return True
+
+    @staticmethod
+    def _compute_wait(limit, window, current, previous, elapsed):
+        """Seconds until the sliding estimate drops below the limit."""
+        if current >= limit or not previous:
+            # Only the next window resets the current counter
+            return math.ceil((1 - elapsed) * window)
+
+        # previous * (1 - t) + current < limit  =>  t > 1 - (limit - current) / previous
+        threshold = 1 - (limit - current) / previous
+        return max(1, math.ceil((threshold - elapsed) * window))
+
+    def wait(self):
+        return self._wait
+
+
+class IPRateThrottle(SlidingWindowThrottle):
+    """
+    Throttle by client IP address.
+
+    DRF's get_ident: REMOTE_ADDR, or with REST_FRAMEWORK NUM_PROXIES set,
+    the address the outermost trusted proxy appended to X-Forwarded-For.
+    Other X-Forwarded-For entries are client-supplied and never used.
+    """
+
+    def get_ident_key(self, request):
+        return self.get_ident(request)
+
+
+class EmailRateThrottle(SlidingWindowThrottle):
+    """Throttle by normalized email address from the request body."""
+
+    def get_ident_key(self, request):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        # Hashed: bounded key length and no raw addresses in the cache
+        return hashlib.sha256(email.strip().lower().encode()).hexdigest()
+
+
+class LoginIPThrottle(IPRateThrottle):
+    scope = 'login_ip'
+
+
+class LoginEmailThrottle(EmailRateThrottle):
+    scope = 'login_email'
+
+
+class RegisterIPThrottle(IPRateThrottle):
+    scope = 'register_ip'
+
+
+class ForgotPasswordIPThrottle(IPRateThrottle):
+    scope = 'forgot_password_ip'
+
+
+class ForgotPasswordEmailThrottle(EmailRateThrottle):
+    scope = 'forgot_password_email'
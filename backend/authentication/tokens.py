@@ -0,0 +1,165 @@
+"""
+Stateless Signed Tokens for Email Verification and Password Reset
+
+Tokens are HMAC-signed and carry everything needed to validate them, so
+issuing and checking a token needs no database writes (and no token rows).
+
+Format: ``<user id>.<expiry>.<signature>``
+- user id: UUID bytes, base64url
+- expiry: Unix timestamp, base36
+- signature: HMAC-SHA256 (salted_hmac with SECRET_KEY and a per-purpose
+  salt) over user id, expiry and a fingerprint of the user's state
+
+The fingerprint makes tokens single-use without storing them:
+- password reset: password hash + email. Setting a new password changes
+  the hash (new salt), which invalidates every reset token issued before.
+- email verification: email + verification state. Verifying the email (or
+  changing it) invalidates the token.
+
+Expiry is rounded up to AUTH_EMAIL_COOLDOWN_SECONDS, so repeated requests
+within that window get the same token: one active token per user and
+purpose per window, still without storing anything.
+
+The per-purpose salt keeps a token for one purpose from being accepted for
+the other. Legacy random tokens stored in PasswordResetToken /
+EmailVerificationToken are still accepted by the views as a fallback until
+they expire.
+
+Related: BET-29 (Email Service - Password Reset)
+"""
+
+import base64
+import binascii
+import time
+import uuid
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from .models import User
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(value):
+    return base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+
+
+def _int_to_base36(value):
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    encoded = ''
+    while True:
+        value, remainder = divmod(value, 36)
+        encoded = digits[remainder] + encoded
+        if not value:
+            return encoded
+
+
+def is_signed_token(token):
+    """True if ``token`` has the signed format (legacy tokens have no dots)."""
+    return isinstance(token, str) and token.count('.') == 2
+
+
+class SignedTokenGenerator:
+    """
+    Base generator for stateless single-use tokens.
+
+    Subclasses set ``purpose`` and ``expiry_setting`` and implement
+    ``fingerprint(user)``.
+    """
+
+    purpose = None
+    expiry_setting = None
+
+    def __init__(self, clock=time.time):
+        self._clock = clock
+
+    @property
+    def key_salt(self):
+        return f'authentication.tokens.{self.purpose}'
+
+    @property
+    def lifetime_seconds(self):
+        return getattr(settings, self.expiry_setting) * 3600
+
+    def fingerprint(self, user):
+        raise NotImplementedError('.fingerprint() must be overridden')
+
+    def _signature(self, user, uid, expires):
+        value = f'{uid}.{expires}.{self.fingerprint(user)}'
+        return _b64encode(salted_hmac(self.key_salt, value, algorithm='sha256').digest())
+
+    def make_token(self, user):
+        """
+        Create a token for ``user``. No database access.
+
+        Returns:
+            str: Signed token
+        """
+        uid = _b64encode(user.pk.bytes)
+        expires_at = int(self._clock()) + self.lifetime_seconds
+        granularity = settings.AUTH_EMAIL_COOLDOWN_SECONDS
+        if granularity > 0:
+            expires_at += -expires_at % granularity
+        expires = _int_to_base36(expires_at)
+        return f'{uid}.{expires}.{self._signature(user, uid, expires)}'
+
+    def check_token(self, token):
+        """
+        Validate a token. Reads the user, never writes.
+
+        Returns:
+            User: Token owner, or None if the token is malformed, expired,
+            forged or already used (fingerprint changed)
+        """
+        if not is_signed_token(token):
+            return None
+
+        uid, expires, signature = token.split('.')
+        try:
+            user_id = uuid.UUID(bytes=_b64decode(uid))
+            expires_at = int(expires, 36)
+        except (ValueError, binascii.Error):
+            return None
+
+        if expires_at < self._clock():
+            return None
+
+        user = User.objects.filter(pk=user_id, is_active=True).first()
+        if user is None:
+            return None
+
+        if not constant_time_compare(signature, self._signature(user, uid, expires)):
+            return None
+
+        return user
+
+    def expires_at(self, token):
+        """Expiry timestamp of a signed token (for display/logging)."""
+        return int(token.split('.')[1], 36)
+
+
+class PasswordResetTokenGenerator(SignedTokenGenerator):
+    """Reset tokens: invalidated by any password (or email) change."""
+
+    purpose = 'password_reset'
+    expiry_setting = 'PASSWORD_RESET_TOKEN_EXPIRY_HOURS'
+
+    def fingerprint(self, user):
+        return f'{user.password}.{user.email}'
+
+
+class EmailVerificationTokenGenerator(SignedTokenGenerator):
+    """Verification tokens: invalidated once the email is verified or changed."""
+
+    purpose = 'email_verification'
+    expiry_setting = 'EMAIL_VERIFICATION_TOKEN_EXPIRY_HOURS'
+
+    def fingerprint(self, user):
+        return f'{user.email}.{int(user.email_verified)}'
+
+
+password_reset_token = PasswordResetTokenGenerator()
+email_verification_token = EmailVerificationTokenGenerator()
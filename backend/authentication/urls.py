@@ -6,7 +6,8 @@ This module defines URL patterns for authentication endpoints.
 Endpoints:
 - POST /api/auth/register/ - Register new user
 - POST /api/auth/login/ - Login with email/password
-- POST /api/auth/logout/ - Logout (client-side token deletion)
+- POST /api/auth/logout/ - Logout (revokes access + refresh tokens)
+- POST /api/auth/token/refresh/ - Refresh access token (rotates refresh token)
 - POST /api/auth/forgot-password/ - Request password reset
 - POST /api/auth/reset-password/ - Reset password with token
 - POST /api/auth/change-password/ - Change password (authenticated)
@@ -16,6 +17,7 @@ Related: BET-18 (Backend API Endpoints)
 """
 
 from django.urls import path
+from rest_framework_simplejwt.views import TokenRefreshView
 from . import views
 
 app_name = 'authentication'
@@ -25,6 +27,7 @@ urlpatterns = [
     path('register/', views.register, name='register'),
     path('login/', views.login, name='login'),
     path('logout/', views.logout, name='logout'),
+    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
 
     # Email Verification
     path('verify-email/', views.verify_email, name='verify_email'),
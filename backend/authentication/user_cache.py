@@ -0,0 +1,114 @@
+"""
+Cached User Loader
+
+This module serves ``User`` instances for JWT-authenticated requests from
+a two-level cache instead of querying Postgres on every request.
+
+Levels:
+- Per-process LRU (AUTH_USER_CACHE_LOCAL_SIZE entries)
+- Shared Django cache (AUTH_USER_CACHE_TIMEOUT seconds)
+
+Both levels are keyed by user id and a version stamp. The version stamp
+lives in the shared cache and is replaced whenever the user changes
+(post_save / post_delete, see signals.py), so every worker stops serving
+the old entry on its next request. Code that writes users with
+``QuerySet.update()`` must call ``invalidate_user`` itself.
+
+Related: BET-18 (Backend API Endpoints)
+"""
+
+import copy
+import threading
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = 'auth:user-version:{user_id}'
+ENTRY_KEY = 'auth:user:{user_id}:{version}'
+
+_local = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def _local_get(key):
+    with _local_lock:
+        user = _local.get(key)
+        if user is not None:
+            _local.move_to_end(key)
+        return user
+
+
+def _local_set(key, user):
+    with _local_lock:
+        _local[key] = user
+        _local.move_to_end(key)
+        while len(_local) > settings.AUTH_USER_CACHE_LOCAL_SIZE:
+            _local.popitem(last=False)
+
+
+def version_key(user_id):
+    """Return the shared cache key holding a user's version stamp."""
+    return VERSION_KEY.format(user_id=user_id)
+
+
+def _get_version(user_id):
+    """Return the current version stamp for a user, creating one if missing."""
+    key = version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_user(user_id, version=None):
+    """
+    Return the user with the given id, or None if it does not exist.
+
+    Args:
+        user_id: User primary key (UUID or str)
+        version (str): Version stamp if already fetched by the caller
+
+    Returns:
+        User: A private copy of the cached instance (safe to modify)
+    """
+    user_id = str(user_id)
+    if version is None:
+        version = _get_version(user_id)
+    key = ENTRY_KEY.format(user_id=user_id, version=version)
+
+    user = _local_get(key)
+    if user is None:
+        user = cache.get(key)
+        if user is None:
+            User = get_user_model()
+            try:
+                user = User.objects.get(pk=user_id)
+            except (User.DoesNotExist, ValueError):
+                return None
+            cache.set(key, user, timeout=settings.AUTH_USER_CACHE_TIMEOUT)
+        _local_set(key, user)
+
+    # Views modify request.user (e.g. set_password): never hand out the cached instance
+    return copy.copy(user)
+
+
+def invalidate_user(user_id):
+    """
+    Invalidate cached copies of a user in every worker.
+
+    The version is replaced immediately and again after the surrounding
+    transaction commits, so a concurrent reader cannot cache pre-commit data
+    under the new version.
+    """
+    key = version_key(user_id)
+
+    def bump():
+        cache.set(key, uuid.uuid4().hex, timeout=None)
+
+    bump()
+    transaction.on_commit(bump)
@@ -0,0 +1,295 @@
+"""
+Bulk User Import
+
+Streams users from a CSV or JSONL file into the User table, for migrating
+accounts from other platforms. Used by the ``import_users`` command.
+
+- Rows are read lazily and processed in chunks of ``batch_size``
+- Raw passwords are hashed with the preferred hasher (Argon2id) in a
+  process pool using every core; the next chunk hashes while the current
+  one is inserted
+- Pre-hashed passwords (Django format such as ``pbkdf2_sha256$...`` or
+  ``bcrypt_sha256$...``, or bare ``$2b$`` bcrypt) are stored verbatim and
+  upgraded to Argon2id on the user's first login
+- Each chunk is one ``bulk_create`` in its own transaction. Emails that
+  already exist are skipped, so an interrupted import can be re-run
+
+Columns / keys: email (required), password or password_hash, first_name,
+last_name, is_active, email_verified, date_joined.
+
+Related: BET-17 (Database Models and Migrations)
+"""
+
+import csv
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timezone as dt_timezone
+
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .hashing import _init_worker
+from .models import User
+
+TRUE_VALUES = {'1', 'true', 't', 'yes', 'y'}
+BARE_BCRYPT_PREFIXES = ('$2a$', '$2b$', '$2y$')
+
+
+class ImportRowError(ValueError):
+    """A row that cannot be imported (reported and skipped)."""
+
+
+@dataclass
+class ImportStats:
+    """Counters reported by ``import_users``."""
+
+    read: int = 0
+    imported: int = 0
+    existing: int = 0
+    invalid: int = 0
+    failed: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self):
+        return self.imported / self.elapsed if self.elapsed else 0.0
+
+
+def read_rows(stream, fmt):
+    """
+    Yield (line number, dict) from a CSV (with header) or JSONL stream.
+
+    A JSONL line that is not a JSON object is yielded as an
+    ImportRowError, so it is reported with its line number and skipped.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        if not isinstance(row, dict):
+            yield number, ImportRowError('not a JSON object')
+            continue
+        yield number, row
+
+
+def _text(row, key):
+    value = row.get(key)
+    return '' if value is None else str(value).strip()
+
+
+def _flag(row, key, default):
+    value = row.get(key)
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def legacy_hash(value):
+    """
+    Return a pre-hashed password in Django's format, or raise.
+
+    Bare bcrypt hashes ($2a$/$2b$/$2y$) are prefixed with ``bcrypt$``.
+    Only algorithms in PASSWORD_HASHERS are accepted, so every imported
+    hash can be verified (and upgraded) at login.
+    """
+    if value.startswith(BARE_BCRYPT_PREFIXES):
+        value = f'bcrypt${value}'
+    try:
+        identify_hasher(value)
+    except ValueError as e:
+        raise ImportRowError('password_hash uses an unknown or disabled algorithm') from e
+    return value
+
+
+def build_user(row):
+    """
+    Turn an input row into an unsaved User.
+
+    Returns:
+        tuple: (User, raw password or None). The user's password is
+        already set when the row carries a hash or no password.
+
+    Raises:
+        ImportRowError: Missing/invalid email, password or date
+    """
+    if isinstance(row, ImportRowError):
+        raise row
+
+    email = User.objects.normalize_email(_text(row, 'email'))
+    try:
+        validate_email(email)
+    except ValidationError as e:
+        raise ImportRowError(f'invalid email {email!r}') from e
+
+    user = User(
+        email=email,
+        first_name=_text(row, 'first_name')[:150],
+        last_name=_text(row, 'last_name')[:150],
+        is_active=_flag(row, 'is_active', True),
+        email_verified=_flag(row, 'email_verified', False),
+    )
+    if user.email_verified:
+        user.email_verified_at = timezone.now()
+
+    joined = _text(row, 'date_joined')
+    if joined:
+        parsed = parse_datetime(joined)
+        if parsed is None:
+            raise ImportRowError(f'invalid date_joined {joined!r}')
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed, dt_timezone.utc)
+        user.date_joined = parsed
+
+    password = row.get('password') or None
+    password_hash = _text(row, 'password_hash')
+    if password_hash:
+        user.password = legacy_hash(password_hash)
+        return user, None
+    if password is None:
+        user.password = make_password(None)  # Unusable, set through password reset
+        return user, None
+    return user, str(password)
+
+
+def _hash_many(passwords):
+    return [make_password(password) for password in passwords]
+
+
+class UserImporter:
+    """
+    Chunked, pipelined importer.
+
+    Args:
+        workers (int): Hashing processes (0 hashes inline)
+        batch_size (int): Users per chunk (one bulk_create)
+        report (callable): Called as report(stats) after each chunk
+        error (callable): Called as error(line number, message) per bad row
+    """
+
+    def __init__(self, workers, batch_size, report=None, error=None):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.report = report or (lambda stats: None)
+        self.error = error or (lambda number, message: None)
+        self.stats = ImportStats()
+        self._executor = None
+
+    def run(self, rows):
+        """
+        Import ``rows`` (as yielded by read_rows).
+
+        Returns:
+            ImportStats
+        """
+        if self.workers:
+            # forkserver like the request-path hashing pool (hashing.py)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('forkserver'),
+                initializer=_init_worker,
+            )
+        try:
+            pending = None
+            seen = set()
+            for chunk in self._chunks(rows):
+                prepared = self._prepare(chunk, seen)
+                # Insert the previous chunk while this one hashes
+                if pending is not None:
+                    self._insert(*pending)
+                pending = prepared
+            if pending is not None:
+                self._insert(*pending)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+        return self.stats
+
+    def _chunks(self, rows):
+        chunk = []
+        for number, row in rows:
+            chunk.append((number, row))
+            if len(chunk) >= self.batch_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _prepare(self, chunk, seen):
+        users, passwords = [], []
+        for number, row in chunk:
+            self.stats.read += 1
+            try:
+                user, password = build_user(row)
+            except ImportRowError as e:
+                self.stats.invalid += 1
+                self.error(number, str(e))
+                continue
+            if user.email in seen:
+                self.stats.invalid += 1
+                self.error(number, f'duplicate email {user.email!r} in input')
+                continue
+            seen.add(user.email)
+            users.append(user)
+            passwords.append(password)
+
+        raw = [index for index, password in enumerate(passwords) if password is not None]
+        hashes = self._submit([passwords[index] for index in raw])
+        return users, raw, hashes
+
+    def _submit(self, passwords):
+        """Start hashing; returns a callable yielding the hashes in order."""
+        if not passwords:
+            return list
+        if self._executor is None:
+            return lambda: _hash_many(passwords)
+
+        # A few slices per worker keeps every core busy to the end
+        size = max(1, -(-len(passwords) // (self.workers * 4)))
+        futures = [
+            self._executor.submit(_hash_many, passwords[start:start + size])
+            for start in range(0, len(passwords), size)
+        ]
+        return lambda: [encoded for future in futures for encoded in future.result()]
+
+    def _insert(self, users, raw, hashes):
+        for index, encoded in zip(raw, hashes()):
+            users[index].password = encoded
+
+        existing = set(
+            User.objects.filter(email__in=[user.email for user in users]).values_list('email', flat=True)
+        )
+        new_users = [user for user in users if user.email not in existing]
+        self.stats.existing += len(users) - len(new_users)
+
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(new_users, batch_size=self.batch_size)
+        except IntegrityError as e:
+            # Registered concurrently: the chunk is rolled back, re-run to retry
+            self.stats.failed += len(new_users)
+            self.error(None, f'chunk of {len(new_users)} users not imported: {e}')
+        else:
+            self.stats.imported += len(new_users)
+        self.report(self.stats)
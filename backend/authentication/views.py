@@ -14,18 +14,23 @@ Related: BET-18 (Backend API Endpoints)
 """
 
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from django.conf import settings
-from decouple import config
 import time
 
-from .models import User, PasswordResetToken, EmailVerificationToken
+from .activity import record_login
+from .audit import record_event
+from .hashing import get_hashing_service
+from .models import AuthEvent, User, EmailVerificationToken, EmailOutbox, PasswordResetToken
 from .serializers import (
+    DUPLICATE_EMAIL_MESSAGE,
     RegisterSerializer,
     LoginSerializer,
     UserSerializer,
@@ -33,7 +38,22 @@ from .serializers import (
     ResetPasswordSerializer,
     ChangePasswordSerializer,
 )
-from .email_service import send_password_reset_email, send_password_changed_notification, send_email_verification
+from .email_templates import locale_from_request
+from .middleware import pad_response
+from .outbox import claim_cooldown
+from .revocation import revoke_token
+from .user_cache import invalidate_user
+from .tokens import email_verification_token, is_signed_token, password_reset_token
+from .throttling import (
+    LoginIPThrottle,
+    LoginEmailThrottle,
+    RegisterIPThrottle,
+    ForgotPasswordIPThrottle,
+    ForgotPasswordEmailThrottle,
+)
+
+# Minimum response time for failed logins (anti-enumeration)
+LOGIN_MIN_RESPONSE_SECONDS = 0.5
 
 
 def get_tokens_for_user(user):
@@ -60,6 +80,7 @@ def get_tokens_for_user(user):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([RegisterIPThrottle])
 def register(request):
     """
     Register a new user.
@@ -101,31 +122,42 @@ def register(request):
     - Password hashed with Argon2id
     - Email normalized to lowercase
     - Automatic login after registration (JWT tokens returned)
-    - Rate limited (configured in settings)
+    - Rate limited per IP (AUTH_RATE_LIMITS, 429 with Retry-After)
     """
     serializer = RegisterSerializer(data=request.data)
 
     if serializer.is_valid():
-        # Create user (password automatically hashed)
-        user = serializer.save()
+        # Insert the user and its verification email in one transaction.
+        # The unique email constraint is the duplicate check. (The password
+        # is hashed before the first statement, so no transaction is open
+        # while Argon2 runs.)
+        try:
+            with transaction.atomic():
+                user = serializer.save()
+                verification_token = email_verification_token.make_token(user)
+                EmailOutbox.enqueue(
+                    user, EmailOutbox.Kind.EMAIL_VERIFICATION,
+                    token=verification_token, locale=locale_from_request(request),
+                )
+        except IntegrityError:
+            return Response({
+                'email': [DUPLICATE_EMAIL_MESSAGE]
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        record_event(AuthEvent.EventType.REGISTERED, request, user=user)
 
         # Generate JWT tokens
         tokens = get_tokens_for_user(user)
 
-        # Send email verification
-        verification_token = EmailVerificationToken.create_token(user)
-        email_sent = send_email_verification(user, verification_token.token)
-
         # Log verification email status (for development)
         if settings.DEBUG:
             print(f"\n{'='*60}")
             print(f"EMAIL VERIFICATION TOKEN (DEV ONLY)")
             print(f"{'='*60}")
             print(f"Email: {user.email}")
-            print(f"Token: {verification_token.token}")
-            print(f"Verify URL: {settings.FRONTEND_URL}/verify-email?token={verification_token.token}")
-            print(f"Expires: {verification_token.expires_at}")
-            print(f"Email Sent: {'✓' if email_sent else '✗'}")
+            print(f"Token: {verification_token}")
+            print(f"Verify URL: {settings.FRONTEND_URL}/verify-email?token={verification_token}")
+            print(f"Email Queued: ✓")
             print(f"{'='*60}\n")
 
         # Return user data + tokens
@@ -140,6 +172,7 @@ def register(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([LoginIPThrottle, LoginEmailThrottle])
 def login(request):
     """
     Login with email and password.
@@ -175,22 +208,23 @@ def login(request):
     Security:
     - Timing-safe password comparison (Django authenticate)
     - Generic error message (anti-enumeration)
-    - Rate limited
+    - Rate limited per IP and per email (AUTH_RATE_LIMITS)
     - Constant time response (anti-enumeration)
+
+    Note:
+    - The minimum response time is enforced by MinimumResponseTimeMiddleware.
+      Served through config.asgi the wait is non-blocking, so padded failures
+      do not hold a worker.
     """
-    start_time = time.time()
+    start_time = time.monotonic()
 
     serializer = LoginSerializer(data=request.data)
 
     if not serializer.is_valid():
-        # Constant time delay for anti-enumeration
-        elapsed = time.time() - start_time
-        if elapsed < 0.5:  # Minimum 500ms response time
-            time.sleep(0.5 - elapsed)
-
-        return Response({
+        # Constant time delay for anti-enumeration (minimum 500ms response time)
+        return pad_response(Response({
             'detail': 'Invalid credentials'
-        }, status=status.HTTP_401_UNAUTHORIZED)
+        }, status=status.HTTP_401_UNAUTHORIZED), start_time, LOGIN_MIN_RESPONSE_SECONDS)
 
     email = serializer.validated_data['email']
     password = serializer.validated_data['password']
@@ -200,24 +234,23 @@ def login(request):
 
     if user is None:
         # User doesn't exist or password incorrect
+        record_event(AuthEvent.EventType.LOGIN_FAILED, request, email=email)
         # Constant time delay for anti-enumeration
-        elapsed = time.time() - start_time
-        if elapsed < 0.5:
-            time.sleep(0.5 - elapsed)
-
-        return Response({
+        return pad_response(Response({
             'detail': 'Invalid credentials'
-        }, status=status.HTTP_401_UNAUTHORIZED)
+        }, status=status.HTTP_401_UNAUTHORIZED), start_time, LOGIN_MIN_RESPONSE_SECONDS)
 
     # Check if user is active
     if not user.is_active:
+        record_event(AuthEvent.EventType.LOGIN_FAILED, request, user=user)
         return Response({
             'detail': 'Account is disabled'
         }, status=status.HTTP_401_UNAUTHORIZED)
 
-    # Update last login
+    # Update last login (buffered, written in batches by activity.py)
     user.last_login = timezone.now()
-    user.save(update_fields=['last_login'])
+    record_login(user.pk, user.last_login)
+    record_event(AuthEvent.EventType.LOGIN_SUCCEEDED, request, user=user)
 
     # Generate JWT tokens
     tokens = get_tokens_for_user(user)
@@ -231,6 +264,7 @@ def login(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([ForgotPasswordIPThrottle, ForgotPasswordEmailThrottle])
 def forgot_password(request):
     """
     Request password reset token.
@@ -251,11 +285,15 @@ def forgot_password(request):
     - Anti-enumeration: Always returns success (doesn't reveal if email exists)
     - Tokens expire in 1 hour (configurable)
     - Cryptographically secure tokens (256-bit)
-    - Rate limited (prevents spam)
+    - Rate limited per IP and per email (prevents spam)
 
     Note:
-    - Email sending is handled asynchronously (future: Celery)
-    - For now, token is created but email not sent (BET-21)
+    - The reset token is stateless (authentication.tokens): no row is
+      written for it, and it stops working once the password changes
+    - The email is queued in EmailOutbox and delivered by the
+      process_email_outbox worker; at most one per
+      AUTH_EMAIL_COOLDOWN_SECONDS, and a pending one is updated instead
+      of queuing another
     """
     serializer = ForgotPasswordSerializer(data=request.data)
 
@@ -266,25 +304,28 @@ def forgot_password(request):
 
     # Check if user exists (silently, for security)
     try:
-        user = User.objects.get(email=email)
-
-        # Create password reset token
-        expiry_hours = config('PASSWORD_RESET_TOKEN_EXPIRY_HOURS', default=1, cast=int)
-        reset_token = PasswordResetToken.create_token(user, expiry_hours=expiry_hours)
-
-        # Send password reset email
-        email_sent = send_password_reset_email(user, reset_token.token)
+        user = User.objects.get_by_email(email)
+
+        # Stateless reset token (no row), queued for delivery. Repeated
+        # requests within the cooldown are dropped; the rest coalesce
+        # into the pending email
+        if claim_cooldown(user, EmailOutbox.Kind.PASSWORD_RESET):
+            reset_token = password_reset_token.make_token(user)
+            EmailOutbox.enqueue(
+                user, EmailOutbox.Kind.PASSWORD_RESET, token=reset_token, locale=locale_from_request(request),
+            )
+        else:
+            reset_token = None
 
         # For development: Log token to console (in addition to email)
-        if settings.DEBUG:
+        if settings.DEBUG and reset_token:
             print(f"\n{'='*60}")
             print(f"PASSWORD RESET TOKEN (DEV ONLY)")
             print(f"{'='*60}")
             print(f"Email: {user.email}")
-            print(f"Token: {reset_token.token}")
-            print(f"Reset URL: {settings.FRONTEND_URL}/reset-password?token={reset_token.token}")
-            print(f"Expires: {reset_token.expires_at}")
-            print(f"Email Sent: {'✓' if email_sent else '✗'}")
+            print(f"Token: {reset_token}")
+            print(f"Reset URL: {settings.FRONTEND_URL}/reset-password?token={reset_token}")
+            print(f"Email Queued: ✓")
             print(f"{'='*60}\n")
 
     except User.DoesNotExist:
@@ -324,9 +365,12 @@ def reset_password(request):
         }
 
     Security:
-    - Token validation (expiration + usage)
+    - Token validation (signature + expiration + usage)
     - Password strength validation
-    - Token marked as used (one-time use)
+    - One-time use, race-free: the password is replaced with a conditional
+      UPDATE (signed tokens: only if the hash is still the one the token
+      was issued for; legacy tokens: only if the token row could be
+      consumed), so of two concurrent requests only one succeeds
     - Generic error messages
     """
     serializer = ResetPasswordSerializer(data=request.data)
@@ -335,18 +379,32 @@ def reset_password(request):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     # Get validated data
-    reset_token = serializer.validated_data['reset_token']
+    user = serializer.validated_data['user']
     new_password = serializer.validated_data['password']
 
-    # Get user
-    user = reset_token.user
-
-    # Set new password (automatically hashed with Argon2id)
-    user.set_password(new_password)
-    user.save()
+    # Hash first (Argon2id): no locks are held while hashing
+    encoded = get_hashing_service().make_password(new_password)
+
+    with transaction.atomic():
+        if user is not None:
+            # Signed token: the fingerprint (password hash + email) must be unchanged
+            updated = User.objects.filter(
+                pk=user.pk, password=user.password, email=user.email
+            ).update(password=encoded)
+            user_id = user.pk if updated else None
+        else:
+            # Legacy stored token: UPDATE ... RETURNING user_id
+            user_id = PasswordResetToken.consume(serializer.validated_data['token'])
+            if user_id is not None:
+                User.objects.filter(pk=user_id).update(password=encoded)
+
+    if user_id is None:
+        return Response({
+            'token': ['Token is invalid or has expired.']
+        }, status=status.HTTP_400_BAD_REQUEST)
 
-    # Mark token as used
-    reset_token.mark_as_used()
+    invalidate_user(user_id)
+    record_event(AuthEvent.EventType.PASSWORD_RESET, request, user_id=user_id)
 
     return Response({
         'message': 'Password reset successful'
@@ -400,12 +458,12 @@ def change_password(request):
             'old_password': ['Incorrect password.']
         }, status=status.HTTP_400_BAD_REQUEST)
 
-    # Set new password
+    # Set new password and queue the notification email (security feature)
     user.set_password(new_password)
-    user.save()
-
-    # Send notification email (security feature)
-    send_password_changed_notification(user)
+    with transaction.atomic():
+        user.save()
+        EmailOutbox.enqueue(user, EmailOutbox.Kind.PASSWORD_CHANGED, locale=locale_from_request(request))
+    record_event(AuthEvent.EventType.PASSWORD_CHANGED, request, user=user)
 
     return Response({
         'message': 'Password changed successfully'
@@ -444,22 +502,36 @@ def profile(request):
 @permission_classes([IsAuthenticated])
 def logout(request):
     """
-    Logout (token blacklist - future implementation).
+    Logout (server-side token revocation).
 
     POST /api/auth/logout/
     Authorization: Bearer <access_token>
 
+    Request Body (optional):
+        {
+            "refresh": "..."
+        }
+
     Response (200 OK):
         {
             "message": "Logout successful"
         }
 
-    Note:
-    - JWT tokens are stateless, so logout is client-side (delete tokens)
-    - Future: Implement token blacklist for server-side logout
+    Security:
+    - The access token used for this request is revoked until it expires
+    - The refresh token, if provided, is revoked as well
+    - Revocation is stored by jti in the shared cache (TTL = token lifetime)
     """
-    # TODO: Implement token blacklist (djangorestframework-simplejwt supports this)
-    # For now, logout is handled client-side by deleting tokens
+    # Revoke the access token that authenticated this request
+    revoke_token(request.auth)
+
+    refresh = request.data.get('refresh')
+    if refresh:
+        try:
+            revoke_token(RefreshToken(refresh))
+        except TokenError:
+            # Invalid or expired refresh tokens are already unusable
+            pass
 
     return Response({
         'message': 'Logout successful'
@@ -496,26 +568,30 @@ def verify_email(request):
             'detail': 'Token is required.'
         }, status=status.HTTP_400_BAD_REQUEST)
 
-    try:
-        verification_token = EmailVerificationToken.objects.get(token=token)
-    except EmailVerificationToken.DoesNotExist:
+    # Consume the token and mark the email as verified with conditional
+    # UPDATEs: concurrent requests with the same token cannot both succeed
+    now = timezone.now()
+    user_id = None
+    if is_signed_token(token):
+        user = email_verification_token.check_token(token)
+        if user is not None and User.objects.filter(
+            pk=user.pk, email=user.email, email_verified=False
+        ).update(email_verified=True, email_verified_at=now):
+            user_id = user.pk
+    else:
+        # Legacy stored token (issued before stateless tokens)
+        with transaction.atomic():
+            user_id = EmailVerificationToken.consume(token)
+            if user_id is not None:
+                User.objects.filter(pk=user_id).update(email_verified=True, email_verified_at=now)
+
+    if user_id is None:
         return Response({
             'detail': 'Token is invalid or has expired.'
         }, status=status.HTTP_400_BAD_REQUEST)
 
-    if not verification_token.is_valid():
-        return Response({
-            'detail': 'Token is invalid or has expired.'
-        }, status=status.HTTP_400_BAD_REQUEST)
-
-    # Mark email as verified
-    user = verification_token.user
-    user.email_verified = True
-    user.email_verified_at = timezone.now()
-    user.save(update_fields=['email_verified', 'email_verified_at'])
-
-    # Mark token as used
-    verification_token.mark_as_used()
+    invalidate_user(user_id)
+    record_event(AuthEvent.EventType.EMAIL_VERIFIED, request, user_id=user_id)
 
     return Response({
         'message': 'Email verified successfully'
@@ -536,6 +612,11 @@ def resend_verification_email(request):
             "message": "Verification email sent successfully"
         }
 
+    Note:
+    - The email is queued in EmailOutbox and delivered by process_email_outbox
+    - At most one email per AUTH_EMAIL_COOLDOWN_SECONDS; a pending one is
+      updated instead of queuing another
+
     Response (400 Bad Request):
         {
             "detail": "Email is already verified."
@@ -548,20 +629,27 @@ def resend_verification_email(request):
             'detail': 'Email is already verified.'
         }, status=status.HTTP_400_BAD_REQUEST)
 
-    # Create new verification token
-    verification_token = EmailVerificationToken.create_token(user)
+    # Within the cooldown the previous email stands (same token)
+    if not claim_cooldown(user, EmailOutbox.Kind.EMAIL_VERIFICATION):
+        return Response({
+            'message': 'Verification email sent successfully'
+        }, status=status.HTTP_200_OK)
 
-    # Send verification email
-    email_sent = send_email_verification(user, verification_token.token)
+    # Create new (stateless) verification token and queue the email
+    verification_token = email_verification_token.make_token(user)
+    EmailOutbox.enqueue(
+        user, EmailOutbox.Kind.EMAIL_VERIFICATION,
+        token=verification_token, locale=locale_from_request(request),
+    )
 
     if settings.DEBUG:
         print(f"\n{'='*60}")
         print(f"EMAIL VERIFICATION TOKEN (RESEND)")
         print(f"{'='*60}")
         print(f"Email: {user.email}")
-        print(f"Token: {verification_token.token}")
-        print(f"Verify URL: {settings.FRONTEND_URL}/verify-email?token={verification_token.token}")
-        print(f"Email Sent: {'✓' if email_sent else '✗'}")
+        print(f"Token: {verification_token}")
+        print(f"Verify URL: {settings.FRONTEND_URL}/verify-email?token={verification_token}")
+        print(f"Email Queued: ✓")
         print(f"{'='*60}\n")
 
     return Response({
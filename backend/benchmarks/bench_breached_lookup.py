@@ -0,0 +1,59 @@
+"""
+Benchmark: breached-password index build and lookup latency.
+
+Builds an index of --hashes random SHA-1 prefixes in a temporary
+directory, then times membership lookups (hits and misses) against the
+memory-mapped file.
+
+Usage:
+    python benchmarks/bench_breached_lookup.py --hashes 2000000 --lookups 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django
+
+django.setup()
+
+from authentication.breached_passwords import BreachedHashIndex, write_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--hashes', type=int, default=2_000_000)
+    parser.add_argument('--lookups', type=int, default=100_000)
+    parser.add_argument('--width', type=int, default=8)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    digests = [rng.randbytes(20) for _ in range(args.hashes)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'breached.bin')
+        start = time.perf_counter()
+        count, _ = write_index((d.hex() for d in digests), path, width=args.width, run_size=1_000_000)
+        build = time.perf_counter() - start
+
+        index = BreachedHashIndex(path)
+        hits = [rng.choice(digests) for _ in range(args.lookups)]
+        misses = [rng.randbytes(20) for _ in range(args.lookups)]
+        for name, probes in (('hit', hits), ('miss', misses)):
+            start = time.perf_counter()
+            found = sum(probe in index for probe in probes)
+            elapsed = time.perf_counter() - start
+            print(f'{name:<5}{args.lookups:>9} lookups  {elapsed / args.lookups * 1e6:7.2f} us/lookup  found={found}')
+        index.close()
+
+        size = os.path.getsize(path)
+        print(f'index {count} hashes, {size / 1e6:.1f} MB, built in {build:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
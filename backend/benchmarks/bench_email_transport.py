@@ -0,0 +1,105 @@
+"""
+Benchmark: email delivery throughput against the local Resend stub.
+
+- "per-request" opens a new connection for every email (what the resend
+  SDK did: a module-level requests.post per send)
+- "pooled" uses ResendTransport's keep-alive session
+
+The stub speaks plain HTTP, so the gap shown here is TCP setup only; with
+TLS to the real API each new connection also pays the handshake.
+
+The last line shows the circuit breaker: with the stub answering 503,
+sends after the threshold fail without touching the network.
+
+Usage:
+    python benchmarks/bench_email_transport.py --emails 500 --threads 4
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django
+
+django.setup()
+
+import requests
+
+from authentication.email_transport import CircuitBreaker, EmailTransportError, ResendTransport
+from benchmarks.email_stub_server import start_stub_server
+
+PARAMS = {
+    'from': 'Betancourt Audio <noreply@betancourtaudio.com>',
+    'to': ['bench@example.com'],
+    'subject': 'Benchmark',
+    'html': '<p>' + 'x' * 2000 + '</p>',
+}
+
+
+def per_request_sender(url):
+    def send():
+        response = requests.post(
+            f'{url}/emails', json=PARAMS, timeout=10,
+            headers={'Authorization': 'Bearer test', 'Connection': 'close'},
+        )
+        response.raise_for_status()
+    return send
+
+
+def pooled_sender(url, pool_size):
+    transport = ResendTransport(url, 'test', 3.05, 10, pool_size, CircuitBreaker(5, 30))
+    return lambda: transport.send(PARAMS)
+
+
+def run(send, emails, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for future in [pool.submit(send) for _ in range(emails)]:
+            future.result()
+    return time.perf_counter() - start
+
+
+def bench_breaker(attempts):
+    server = start_stub_server(status=503)
+    transport = ResendTransport(server.url, 'test', 3.05, 10, 1, CircuitBreaker(5, 30))
+    start = time.perf_counter()
+    for _ in range(attempts):
+        try:
+            transport.send(PARAMS)
+        except EmailTransportError:
+            pass
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    return elapsed, server.requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--emails', type=int, default=500)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--latency-ms', type=float, default=0,
+                        help='Simulated provider latency per request')
+    args = parser.parse_args()
+
+    print(f"{'mode':<14}{'emails':>8}{'conns':>8}{'elapsed (s)':>14}{'emails/s':>10}")
+    for name, make_sender in (
+        ('per-request', per_request_sender),
+        ('pooled', lambda url: pooled_sender(url, args.threads)),
+    ):
+        server = start_stub_server(latency_ms=args.latency_ms)
+        elapsed = run(make_sender(server.url), args.emails, args.threads)
+        server.shutdown()
+        print(f'{name:<14}{args.emails:>8}{len(server.connections):>8}'
+              f'{elapsed:>14.2f}{args.emails / elapsed:>10.0f}')
+
+    elapsed, sent = bench_breaker(args.emails)
+    print(f'\nProvider down (503): {args.emails} sends in {elapsed:.3f}s, '
+          f'{sent} reached the network before the circuit opened')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: last_login writes, per login vs write-behind buffer.
+
+- "save": ``user.save(update_fields=['last_login'])`` on every login
+- "buffered": authentication.activity.record_login per login, then one
+  flush (UPDATE ... FROM (VALUES ...) on Postgres)
+
+Logins are spread over --users accounts, so hot users log in repeatedly.
+Runs against a throwaway test database (created and dropped by the
+script); --latency-ms adds a simulated network round trip per statement.
+
+Usage:
+    python benchmarks/bench_last_login.py --logins 5000 --users 200 --latency-ms 0.5
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django
+
+django.setup()
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings, setup_test_environment
+from django.utils import timezone
+
+from authentication import activity
+from authentication.models import User
+
+
+def login_save(user):
+    user.last_login = timezone.now()
+    user.save(update_fields=['last_login'])
+
+
+def login_buffered(user):
+    activity.record_login(user.pk)
+
+
+def run(login, users, logins, latency):
+    def delay(execute, sql, params, many, context):
+        time.sleep(latency)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(delay), CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        for i in range(logins):
+            login(users[i % len(users)])
+        activity.flush()
+        elapsed = time.perf_counter() - start
+    return elapsed, len(queries.captured_queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--logins', type=int, default=5000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=0.5,
+                        help='Simulated round trip per SQL statement')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        with override_settings(AUTH_ACTIVITY_BUFFER_SIZE=args.logins + 1):
+            users = User.objects.bulk_create(
+                User(email=f'bench{i}@example.com', password='!') for i in range(args.users)
+            )
+            print(f"{'flow':<10}{'logins':>8}{'stmts':>8}{'ms total':>10}")
+            for name, login in (('save', login_save), ('buffered', login_buffered)):
+                elapsed, statements = run(login, users, args.logins, args.latency_ms / 1000)
+                print(f'{name:<10}{args.logins:>8}{statements:>8}{elapsed * 1000:>10.1f}')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark: failed-login throughput of a single worker on the real
+``/api/auth/login/`` endpoint, before and after serving the project over
+ASGI.
+
+- "wsgi" (before): ``gunicorn config.wsgi`` with one sync worker. Each
+  padded failure holds the worker for the full 500ms (``time.sleep``), so
+  concurrent clients queue behind each other.
+- "asgi" (after): ``gunicorn config.asgi`` with one uvicorn worker, as in
+  the Dockerfile. MinimumResponseTimeMiddleware awaits the padding, so
+  failures from concurrent clients wait at the same time.
+
+Both servers are started by the script (one worker each) against the
+configured database, which must be migrated. Login rate limits are raised
+for the servers so every request reaches the view. Each client posts over
+its own keep-alive connection:
+
+- "unknown" (default): a well-formed login for an unknown email, so the
+  full failure path runs (user lookup, dummy password hash, audit event)
+- "invalid": a malformed body rejected by the serializer, which isolates
+  the cost of the padding itself
+
+On hosts with few cores the dummy Argon2 hash, not the padding, bounds
+"unknown" throughput; compare with "invalid" to tell them apart.
+
+Usage:
+    python benchmarks/bench_login_padding.py --clients 50 --requests 200
+    python benchmarks/bench_login_padding.py --payload invalid
+"""
+import argparse
+import http.client
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAYLOADS = {
+    'unknown': {'email': 'nobody@example.com', 'password': 'WrongPass123!'},
+    'invalid': {'email': 'not-an-email'},
+}
+SERVERS = {
+    'wsgi': ['config.wsgi:application', '--worker-class', 'sync'],
+    'asgi': ['config.asgi:application', '--worker-class', 'uvicorn_worker.UvicornWorker'],
+}
+
+
+def start_server(mode, port, log):
+    env = dict(
+        os.environ,
+        DEBUG=os.environ.get('DEBUG', 'True'),  # no HTTPS redirect on the local port
+        MAX_LOGIN_ATTEMPTS_PER_IP='1000000',
+        MAX_LOGIN_ATTEMPTS='1000000',
+    )
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', *SERVERS[mode], '--bind', f'127.0.0.1:{port}',
+         '--workers', '1', '--log-level', 'warning'],
+        cwd=BACKEND_DIR, env=env, stdout=log, stderr=log,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'{mode} server exited with status {process.returncode}, see {log.name}')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f'{mode} server did not start on port {port}, see {log.name}')
+
+
+def stop_server(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def run_clients(port, clients, requests, payload):
+    body = json.dumps(PAYLOADS[payload])
+    headers = {'Content-Type': 'application/json'}
+    per_client = [requests // clients + (i < requests % clients) for i in range(clients)]
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+
+    def client(count):
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=120)
+        for _ in range(count):
+            start = time.perf_counter()
+            connection.request('POST', '/api/auth/login/', body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                statuses[response.status] = statuses.get(response.status, 0) + 1
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(count,)) for count in per_client if count]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, latencies, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--clients', type=int, default=50, help='Concurrent clients')
+    parser.add_argument('--requests', type=int, default=200, help='Total requests per server')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--modes', default='wsgi,asgi')
+    parser.add_argument('--payload', choices=sorted(PAYLOADS), default='unknown')
+    args = parser.parse_args()
+
+    print(f"{'server':<8}{'clients':>9}{'requests':>10}{'elapsed (s)':>13}{'req/s':>9}"
+          f"{'p50 (ms)':>10}{'p95 (ms)':>10}  statuses")
+    for mode in args.modes.split(','):
+        log = tempfile.NamedTemporaryFile(prefix=f'bench_login_{mode}_', suffix='.log', delete=False)
+        process = start_server(mode, args.port, log)
+        try:
+            run_clients(args.port, 1, 1, args.payload)  # warm-up: imports, first DB connection
+            elapsed, latencies, statuses = run_clients(args.port, args.clients, args.requests, args.payload)
+        finally:
+            stop_server(process)
+            log.close()
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(f'{mode:<8}{args.clients:>9}{args.requests:>10}{elapsed:>13.2f}'
+              f'{args.requests / elapsed:>9.1f}{statistics.median(latencies) * 1000:>10.0f}'
+              f'{p95 * 1000:>10.0f}  {statuses}')
+
+
+if __name__ == '__main__':
+    main()
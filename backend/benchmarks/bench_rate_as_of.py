@@ -0,0 +1,130 @@
+"""
+Benchmark: exchange rate in force at each order's created_at.
+
+- "per-row": one ``effective_date <= created_at`` query per order (timed
+  on --sample orders and extrapolated)
+- "annotate": payments.rate_history.annotate_rate_as_of, one query for
+  all orders (correlated subquery over the (pair, -effective_date) index)
+- "bisect": payments.rate_history.RateHistory, rates loaded once and
+  resolved in memory (reported as rate load + bisect, order fetch apart)
+
+Orders are spread over --days, with one USD/COP rate per day. Runs
+against a throwaway test database (created and dropped by the script).
+
+Usage:
+    python benchmarks/bench_rate_as_of.py --orders 1000000 --days 730
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django
+
+django.setup()
+
+from django.db import connection
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+
+from authentication.models import User
+from payments.models import Currency, ExchangeRate, Order, PaymentGateway, Service
+from payments.rate_history import RateHistory, annotate_rate_as_of
+
+
+def create_data(orders, days, batch_size=10000):
+    end = timezone.now()
+    start = end - timedelta(days=days)
+    ExchangeRate.objects.bulk_create(
+        ExchangeRate(rate=Decimal('4000') + random.randint(-3000, 3000) / Decimal('10'),
+                     effective_date=start + timedelta(days=day))
+        for day in range(days)
+    )
+
+    user = User.objects.create(email='bench@example.com', password='!')
+    service = Service.objects.create(name='Bench', description='Bench', base_price_usd=Decimal('10.00'))
+    span = int((end - start).total_seconds())
+
+    # created_at is auto_now_add: turned off so the orders get past dates
+    created_at = Order._meta.get_field('created_at')
+    created_at.auto_now_add = False
+    try:
+        for offset in range(0, orders, batch_size):
+            count = min(batch_size, orders - offset)
+            Order.objects.bulk_create(
+                Order(
+                    order_number=f'BENCH-{offset + i:09d}', user=user, service=service,
+                    currency=Currency.COP, payment_gateway=PaymentGateway.BOLD,
+                    subtotal=Decimal('1.00'), total=Decimal('1.00'),
+                    customer_email=user.email, customer_name='Bench',
+                    created_at=start + timedelta(seconds=random.randrange(span)),
+                )
+                for i in range(count)
+            )
+    finally:
+        created_at.auto_now_add = True
+
+
+def per_row(sample):
+    start = time.perf_counter()
+    for created in Order.objects.values_list('created_at', flat=True)[:sample]:
+        ExchangeRate.objects.filter(
+            from_currency=Currency.USD, to_currency=Currency.COP, effective_date__lte=created,
+        ).order_by('-effective_date').values_list('rate', flat=True).first()
+    return time.perf_counter() - start
+
+
+def annotated():
+    start = time.perf_counter()
+    rates = list(annotate_rate_as_of(Order.objects.order_by('pk')).values_list('rate_as_of', flat=True))
+    return time.perf_counter() - start, rates
+
+
+def bisected():
+    start = time.perf_counter()
+    moments = list(Order.objects.order_by('pk').values_list('created_at', flat=True))
+    fetched = time.perf_counter()
+    history = RateHistory.load()
+    rates = history.as_of_many(moments)
+    return fetched - start, time.perf_counter() - fetched, rates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--orders', type=int, default=1_000_000)
+    parser.add_argument('--days', type=int, default=730)
+    parser.add_argument('--sample', type=int, default=2000,
+                        help='Orders timed for the per-row variant')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        start = time.perf_counter()
+        create_data(args.orders, args.days)
+        print(f'{args.orders} orders, {args.days} rates created in {time.perf_counter() - start:.1f}s')
+
+        sample = min(args.sample, args.orders)
+        elapsed = per_row(sample)
+        print(f"{'variant':<10}{'queries':>10}{'s total':>10}")
+        print(f"{'per-row':<10}{args.orders + 1:>10}{elapsed * args.orders / sample:>10.2f}  (extrapolated)")
+
+        elapsed, annotated_rates = annotated()
+        print(f"{'annotate':<10}{1:>10}{elapsed:>10.2f}")
+
+        fetch, resolve, bisected_rates = bisected()
+        print(f"{'bisect':<10}{2:>10}{resolve:>10.2f}  (+{fetch:.2f}s fetching created_at)")
+
+        assert bisected_rates == annotated_rates, 'annotate and bisect disagree'
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: registration write path, before and after relying on the
+unique constraint.
+
+- "before": UniqueValidator SELECT + explicit exists() SELECT, then the
+  user INSERT and the outbox INSERT as separate autocommit statements
+- "after": RegisterSerializer + one atomic block (user INSERT + outbox
+  INSERT), duplicates surface as IntegrityError
+
+Runs against a throwaway test database (created and dropped by the
+script). Password hashing is switched to MD5 so only database work is
+measured; --latency-ms adds a simulated network round trip per statement.
+
+Usage:
+    python benchmarks/bench_registration.py --users 500 --latency-ms 0.5
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django
+
+django.setup()
+
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings, setup_test_environment
+
+from authentication.models import EmailOutbox, User
+from authentication.serializers import RegisterSerializer
+from authentication.tokens import email_verification_token
+
+
+def register_before(data):
+    email = User.objects.normalize_email(data['email'])
+    User.objects.filter(email=data['email']).exists()  # DRF UniqueValidator
+    if User.objects.filter(email=email).exists():  # validate_email
+        return None
+    user = User.objects.create_user(email=email, password=data['password'])
+    EmailOutbox.enqueue(user, EmailOutbox.Kind.EMAIL_VERIFICATION, token=email_verification_token.make_token(user))
+    return user
+
+
+def register_after(data):
+    serializer = RegisterSerializer(data=data)
+    serializer.is_valid(raise_exception=True)
+    try:
+        with transaction.atomic():
+            user = serializer.save()
+            EmailOutbox.enqueue(
+                user, EmailOutbox.Kind.EMAIL_VERIFICATION, token=email_verification_token.make_token(user)
+            )
+    except IntegrityError:
+        return None
+    return user
+
+
+def run(register, prefix, users, latency):
+    def delay(execute, sql, params, many, context):
+        time.sleep(latency)
+        return execute(sql, params, many, context)
+
+    payloads = [
+        {'email': f'{prefix}{i}@example.com', 'password': 'BenchPass123!', 'password_confirm': 'BenchPass123!'}
+        for i in range(users)
+    ]
+    with connection.execute_wrapper(delay), CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        for data in payloads:
+            register(data)
+        elapsed = time.perf_counter() - start
+    return elapsed, len(queries.captured_queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--latency-ms', type=float, default=0.5,
+                        help='Simulated round trip per SQL statement')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        with override_settings(
+            PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+            PASSWORD_HASHING_WORKERS=0,
+        ):
+            print(f"{'flow':<8}{'users':>7}{'stmts/user':>12}{'ms/user':>10}")
+            for name, register in (('before', register_before), ('after', register_after)):
+                elapsed, statements = run(register, name, args.users, args.latency_ms / 1000)
+                print(f'{name:<8}{args.users:>7}{statements / args.users:>12.1f}'
+                      f'{elapsed / args.users * 1000:>10.2f}')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
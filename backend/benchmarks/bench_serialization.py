@@ -0,0 +1,80 @@
+"""
+Benchmark: user serialization + JSON rendering, DRF default vs fast path.
+
+- "drf": ModelSerializer (the previous UserSerializer) + JSONRenderer
+- "fast": ReadOnlySerializer-based UserSerializer + ORJSONRenderer
+
+Measures a single-object response (login/profile) and a list response
+(future listings) on unsaved User instances, so no database is involved.
+
+Usage:
+    python benchmarks/bench_serialization.py --iterations 20000 --list-size 100
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django
+
+django.setup()
+
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from authentication.models import User
+from authentication.renderers import ORJSONRenderer
+from authentication.serializers import UserSerializer
+
+
+class ModelUserSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = list(UserSerializer.fields)
+
+
+def make_users(count):
+    return [
+        User(id=uuid.uuid4(), email=f'user{i}@example.com', first_name='Ana', last_name='Gómez',
+             is_active=True, email_verified=bool(i % 2), date_joined=timezone.now())
+        for i in range(count)
+    ]
+
+
+def timed(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=20000)
+    parser.add_argument('--list-size', type=int, default=100)
+    args = parser.parse_args()
+
+    user, users = make_users(1)[0], make_users(args.list_size)
+    drf, fast = JSONRenderer(), ORJSONRenderer()
+    list_iterations = max(1, args.iterations // args.list_size)
+
+    cases = [
+        ('single', 'drf', lambda: drf.render({'user': ModelUserSerializer(user).data}), args.iterations),
+        ('single', 'fast', lambda: fast.render({'user': UserSerializer(user).data}), args.iterations),
+        (f'list[{args.list_size}]', 'drf',
+         lambda: drf.render(ModelUserSerializer(users, many=True).data), list_iterations),
+        (f'list[{args.list_size}]', 'fast',
+         lambda: fast.render(UserSerializer(users, many=True).data), list_iterations),
+    ]
+    print(f"{'payload':<12}{'path':<6}{'us/response':>13}")
+    for payload, path, func, iterations in cases:
+        print(f'{payload:<12}{path:<6}{timed(func, iterations):>13.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Local stand-in for the Resend API.
+
+Accepts POST /emails with HTTP/1.1 keep-alive and answers like Resend
+({"id": "..."}), optionally after a delay or with an error status. Point
+RESEND_API_URL at it to exercise email delivery offline.
+
+Usage:
+    python benchmarks/email_stub_server.py --port 8025 --latency-ms 20
+    RESEND_API_URL=http://127.0.0.1:8025 python manage.py process_email_outbox
+"""
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    disable_nagle_algorithm = True  # headers and body are separate writes
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.connections.add(self.client_address)
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        if self.path.rstrip('/') != '/emails':
+            status, payload = 404, {'message': 'Not found'}
+        elif server.status >= 400:
+            status, payload = server.status, {'message': 'Stub failure'}
+        else:
+            json.loads(body or b'{}')
+            status, payload = 200, {'id': str(uuid.uuid4())}
+
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(port=0, latency_ms=0, status=200):
+    """
+    Start the stub in a daemon thread.
+
+    Returns:
+        ThreadingHTTPServer: Server (``.url``, ``.requests``, ``.connections``);
+        call ``shutdown()`` to stop it
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+    server.daemon_threads = True
+    server.latency = latency_ms / 1000
+    server.status = status
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.connections = set()
+    server.url = f'http://127.0.0.1:{server.server_address[1]}'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--port', type=int, default=8025)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--status', type=int, default=200,
+                        help='HTTP status returned for /emails (e.g. 503 to trip the breaker)')
+    args = parser.parse_args()
+
+    server = start_stub_server(args.port, args.latency_ms, args.status)
+    print(f'Resend stub listening on {server.url}')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
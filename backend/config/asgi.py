@@ -3,6 +3,15 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+This is the recommended entry point in production. Served over ASGI, the
+anti-enumeration padding on failed logins (MinimumResponseTimeMiddleware)
+is an awaitable timer instead of ``time.sleep``, so a single worker can hold
+hundreds of padded responses without blocking:
+
+    gunicorn config.asgi:application -k uvicorn_worker.UvicornWorker
+
+This is the Dockerfile's default command.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -14,3 +23,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_asgi_application()
+
+# Background flush of buffered timestamps and audit events (authentication.background)
+from authentication.background import start_flushers  # noqa: E402
+
+start_flushers()
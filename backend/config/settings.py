@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+from decimal import Decimal
 from decouple import config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -58,6 +59,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Enforces anti-enumeration response padding (non-blocking under ASGI)
+    'authentication.middleware.MinimumResponseTimeMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -78,6 +81,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
 
 # Database
@@ -95,6 +99,26 @@ DATABASES = {
 }
 
 
+# Cache
+# Shared between workers (rate limiting, token revocation, cached lookups).
+# Redis in production; per-process memory cache when REDIS_URL is not set.
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
 # Custom User Model
 # https://docs.djangoproject.com/en/5.2/topics/auth/customizing/#substituting-a-custom-user-model
 AUTH_USER_MODEL = 'authentication.User'
@@ -125,16 +149,38 @@ AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
     },
+    {
+        'NAME': 'authentication.breached_passwords.BreachedPasswordValidator',
+    },
 ]
 
+# Breached-password index (python manage.py build_breached_password_index)
+# Missing file: the breached-password check is skipped
+BREACHED_PASSWORDS_FILE = config('BREACHED_PASSWORDS_FILE', default=str(BASE_DIR / 'breached_passwords.bin'))
+
 # Password Hashing - Using Argon2id (OWASP recommended)
+# The Argon2id parameters are calibrated per host: python manage.py calibrate_argon2
+# Legacy PBKDF2/bcrypt hashes are upgraded to Argon2id on the next login.
 PASSWORD_HASHERS = [
-    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'authentication.hashers.CalibratedArgon2PasswordHasher',
     'django.contrib.auth.hashers.PBKDF2PasswordHasher',
     'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
     'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    # Bare bcrypt hashes imported from other platforms (import_users)
+    'django.contrib.auth.hashers.BCryptPasswordHasher',
 ]
 
+# Calibrated Argon2id parameters (written by calibrate_argon2, Django defaults if missing)
+ARGON2_PARAMETERS_FILE = config('ARGON2_PARAMETERS_FILE', default=str(BASE_DIR / 'argon2_parameters.json'))
+
+# Password hashing pool (authentication.hashing)
+# Argon2id runs in a bounded process pool instead of the request thread.
+# Requests beyond MAX_PENDING in-flight hashes fail fast with 503.
+# WORKERS=0 hashes inline (useful for scripts and debugging).
+PASSWORD_HASHING_WORKERS = config('PASSWORD_HASHING_WORKERS', default=os.cpu_count() or 1, cast=int)
+PASSWORD_HASHING_MAX_PENDING = config('PASSWORD_HASHING_MAX_PENDING', default=PASSWORD_HASHING_WORKERS * 4, cast=int)
+PASSWORD_HASHING_TIMEOUT_SECONDS = config('PASSWORD_HASHING_TIMEOUT_SECONDS', default=10, cast=float)
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -173,11 +219,26 @@ CORS_ALLOW_CREDENTIALS = True
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # simplejwt JWTAuthentication with a cached user loader
+        'authentication.jwt_auth.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # Reverse proxies in front of the app. Client IPs (rate limits, audit
+    # log) are read from X-Forwarded-For only this many hops from the right;
+    # 0 uses REMOTE_ADDR, so a client-supplied header cannot change its IP
+    'NUM_PROXIES': config('NUM_PROXIES', default=0, cast=int),
+    # orjson instead of the stdlib json module (authentication.renderers)
+    'DEFAULT_RENDERER_CLASSES': (
+        'authentication.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'authentication.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 # Simple JWT Configuration
@@ -186,8 +247,11 @@ from datetime import timedelta
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=config('JWT_ACCESS_TOKEN_LIFETIME_MINUTES', default=15, cast=int)),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=config('JWT_REFRESH_TOKEN_LIFETIME_DAYS', default=7, cast=int)),
-    'ROTATE_REFRESH_TOKENS': False,
-    'BLACKLIST_AFTER_ROTATION': True,
+    # Rotated refresh tokens are revoked in the cache-backed store
+    # (authentication.revocation); the blacklist app is not used.
+    'ROTATE_REFRESH_TOKENS': config('JWT_ROTATE_REFRESH_TOKENS', default=True, cast=bool),
+    'BLACKLIST_AFTER_ROTATION': False,
+    'TOKEN_REFRESH_SERIALIZER': 'authentication.serializers.RevocableTokenRefreshSerializer',
     'UPDATE_LAST_LOGIN': False,
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': config('JWT_SECRET_KEY', default=SECRET_KEY),
@@ -197,6 +261,56 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
 
+# Cached user loader for JWT-authenticated requests (authentication.user_cache)
+AUTH_USER_CACHE_TIMEOUT = config('AUTH_USER_CACHE_TIMEOUT', default=300, cast=int)  # seconds, shared cache
+AUTH_USER_CACHE_LOCAL_SIZE = config('AUTH_USER_CACHE_LOCAL_SIZE', default=1024, cast=int)  # per-process entries
+
+# Write-behind buffer for last_login / last_seen_at (authentication.activity)
+# A killed worker loses at most the last flush interval of timestamps; 0
+# disables buffering (written by each request)
+AUTH_ACTIVITY_FLUSH_SECONDS = config('AUTH_ACTIVITY_FLUSH_SECONDS', default=5, cast=float)
+AUTH_ACTIVITY_BUFFER_SIZE = config('AUTH_ACTIVITY_BUFFER_SIZE', default=10000, cast=int)  # users, flushes early when reached
+
+# Authentication audit log (authentication.audit, AuthEvent)
+# Events are queued in process and bulk inserted; same loss window as above
+AUTH_AUDIT_FLUSH_SECONDS = config('AUTH_AUDIT_FLUSH_SECONDS', default=2, cast=float)
+AUTH_AUDIT_BATCH_SIZE = config('AUTH_AUDIT_BATCH_SIZE', default=500, cast=int)
+AUTH_AUDIT_QUEUE_SIZE = config('AUTH_AUDIT_QUEUE_SIZE', default=50000, cast=int)  # oldest dropped beyond this
+AUTH_AUDIT_RETENTION_MONTHS = config('AUTH_AUDIT_RETENTION_MONTHS', default=12, cast=int)  # monthly partitions kept
+
+# Exchange rates (payments.rates)
+# Latest rate per currency pair, cached per process and in the shared cache
+EXCHANGE_RATE_CACHE_TIMEOUT = config('EXCHANGE_RATE_CACHE_TIMEOUT', default=3600, cast=int)  # seconds, shared cache
+EXCHANGE_RATE_LOCK_WAIT_SECONDS = config('EXCHANGE_RATE_LOCK_WAIT_SECONDS', default=2, cast=float)  # wait for another worker's load
+# A rate older than this is stale: 'serve' uses it anyway (logged),
+# 'fallback' uses EXCHANGE_RATE_FALLBACKS, 'error' refuses the conversion
+EXCHANGE_RATE_MAX_AGE_HOURS = config('EXCHANGE_RATE_MAX_AGE_HOURS', default=72, cast=float)
+EXCHANGE_RATE_STALE_POLICY = config('EXCHANGE_RATE_STALE_POLICY', default='serve')
+# Cross rates (payments.rate_matrix) are triangulated through this currency first
+EXCHANGE_RATE_PIVOT = config('EXCHANGE_RATE_PIVOT', default='USD')
+# Rates used when a pair has no usable rate, e.g. "USD:COP=4000.00,USD:EUR=0.92";
+# pairs without one raise ExchangeRateUnavailable
+EXCHANGE_RATE_FALLBACKS = {
+    pair.strip(): Decimal(rate)
+    for pair, rate in (
+        item.split('=', 1) for item in config('EXCHANGE_RATE_FALLBACKS', default='USD:COP=4000.00').split(',') if item.strip()
+    )
+}
+
+# Rate feed (payments.providers, payments.rate_sync; sync_exchange_rates command)
+# Empty provider: rates are only entered by hand
+EXCHANGE_RATE_PROVIDER = config('EXCHANGE_RATE_PROVIDER', default='')  # e.g. payments.providers.OpenExchangeRatesProvider
+EXCHANGE_RATE_PAIRS = config('EXCHANGE_RATE_PAIRS', default='USD:COP').split(',')
+# A latest rate older than this triggers a background sync (stale-while-revalidate)
+EXCHANGE_RATE_REFRESH_SECONDS = config('EXCHANGE_RATE_REFRESH_SECONDS', default=3600, cast=int)  # 0 disables
+EXCHANGE_RATE_PROVIDER_CONNECT_TIMEOUT = config('EXCHANGE_RATE_PROVIDER_CONNECT_TIMEOUT', default=3.05, cast=float)  # seconds
+EXCHANGE_RATE_PROVIDER_READ_TIMEOUT = config('EXCHANGE_RATE_PROVIDER_READ_TIMEOUT', default=10, cast=float)  # seconds
+OPENEXCHANGERATES_APP_ID = config('OPENEXCHANGERATES_APP_ID', default='')
+OPENEXCHANGERATES_API_URL = config('OPENEXCHANGERATES_API_URL', default='https://openexchangerates.org/api')
+
+# Service catalog API (payments.catalog), invalidated on Service / ExchangeRate changes
+SERVICE_CATALOG_CACHE_TIMEOUT = config('SERVICE_CATALOG_CACHE_TIMEOUT', default=3600, cast=int)  # seconds, shared cache
+
 # Email Configuration
 # Development: Console backend (prints emails to console)
 # Production: SMTP backend (sends real emails)
@@ -211,11 +325,53 @@ EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@betancourtaudio.com')
 SERVER_EMAIL = DEFAULT_FROM_EMAIL
 
+# Resend API (authentication.email_transport)
+RESEND_API_KEY = config('RESEND_API_KEY', default='')
+RESEND_API_URL = config('RESEND_API_URL', default='https://api.resend.com')
+EMAIL_TRANSPORT_CONNECT_TIMEOUT = config('EMAIL_TRANSPORT_CONNECT_TIMEOUT', default=3.05, cast=float)  # seconds
+EMAIL_TRANSPORT_READ_TIMEOUT = config('EMAIL_TRANSPORT_READ_TIMEOUT', default=10, cast=float)  # seconds
+EMAIL_TRANSPORT_POOL_SIZE = config('EMAIL_TRANSPORT_POOL_SIZE', default=10, cast=int)  # keep-alive connections
+# Circuit breaker: open after N consecutive failures, probe again after M seconds
+EMAIL_CIRCUIT_FAILURE_THRESHOLD = config('EMAIL_CIRCUIT_FAILURE_THRESHOLD', default=5, cast=int)
+EMAIL_CIRCUIT_RESET_SECONDS = config('EMAIL_CIRCUIT_RESET_SECONDS', default=30, cast=float)
+
+# Transactional email language (authentication.email_templates: es, en)
+EMAIL_DEFAULT_LOCALE = config('EMAIL_DEFAULT_LOCALE', default='es')
+
 # Frontend URLs (for email links)
 FRONTEND_URL = config('FRONTEND_URL', default='http://localhost:3000')
 
-# Password Reset Configuration
+# Signed token lifetimes (authentication.tokens)
 PASSWORD_RESET_TOKEN_EXPIRY_HOURS = config('PASSWORD_RESET_TOKEN_EXPIRY_HOURS', default=1, cast=int)
+EMAIL_VERIFICATION_TOKEN_EXPIRY_HOURS = config('EMAIL_VERIFICATION_TOKEN_EXPIRY_HOURS', default=24, cast=int)
+# Reset / verification emails: at most one per user and kind in this window
+# (authentication.outbox.claim_cooldown); tokens issued within it are identical
+AUTH_EMAIL_COOLDOWN_SECONDS = config('AUTH_EMAIL_COOLDOWN_SECONDS', default=60, cast=int)
+
+# Rate Limiting (authentication.throttling)
+# Sliding window per scope: (max requests, window in seconds)
+AUTH_RATE_LIMITS = {
+    'login_ip': (
+        config('MAX_LOGIN_ATTEMPTS_PER_IP', default=20, cast=int),
+        config('LOGIN_RATE_WINDOW_MINUTES', default=5, cast=int) * 60,
+    ),
+    'login_email': (
+        config('MAX_LOGIN_ATTEMPTS', default=5, cast=int),
+        config('LOGIN_RATE_WINDOW_MINUTES', default=5, cast=int) * 60,
+    ),
+    'register_ip': (
+        config('MAX_REGISTRATION_ATTEMPTS', default=3, cast=int),
+        config('REGISTRATION_RATE_WINDOW_HOURS', default=1, cast=int) * 3600,
+    ),
+    'forgot_password_ip': (
+        config('MAX_RESET_ATTEMPTS_PER_IP', default=10, cast=int),
+        config('RESET_RATE_WINDOW_HOURS', default=1, cast=int) * 3600,
+    ),
+    'forgot_password_email': (
+        config('MAX_RESET_ATTEMPTS', default=3, cast=int),
+        config('RESET_RATE_WINDOW_HOURS', default=1, cast=int) * 3600,
+    ),
+}
 
 # Production Security Settings
 # These settings are automatically enabled when DEBUG=False
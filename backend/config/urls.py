@@ -22,4 +22,7 @@ urlpatterns = [
 
     # Authentication API (Email/Password + OAuth Read-Only Access)
     path('api/auth/', include('authentication.urls')),
+
+    # Payments API (service catalog)
+    path('api/', include('payments.urls')),
 ]
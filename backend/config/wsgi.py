@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Background flush of buffered timestamps and audit events (authentication.background)
+from authentication.background import start_flushers  # noqa: E402
+
+start_flushers()
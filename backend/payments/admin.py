@@ -96,8 +96,10 @@ class OrderAdmin(admin.ModelAdmin):
         """Display formatted total with currency"""
         if obj.currency == 'USD':
             return f"${obj.total}"
-        else:
+        elif obj.currency == 'COP':
             return f"${obj.total:,.0f} COP"
+        else:
+            return f"{obj.total:,.2f} {obj.currency}"
     display_total.short_description = 'Total'
 
     def status_badge(self, obj):
@@ -200,8 +202,10 @@ class TransactionAdmin(admin.ModelAdmin):
         """Display formatted amount with currency"""
         if obj.currency == 'USD':
             return f"${obj.amount}"
-        else:
+        elif obj.currency == 'COP':
             return f"${obj.amount:,.0f} COP"
+        else:
+            return f"{obj.amount:,.2f} {obj.currency}"
     display_amount.short_description = 'Monto'
 
     def status_badge(self, obj):
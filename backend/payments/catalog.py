@@ -0,0 +1,139 @@
+"""
+Catálogo de Servicios Cacheado
+
+``GET /api/services/`` sirve los servicios activos con precio, IVA y total
+en USD y COP ya calculados. El JSON completo se serializa una sola vez
+(orjson) y se cachea junto con su ETag fuerte (SHA-256 del cuerpo).
+
+Niveles:
+- Copia por proceso (la versión vigente)
+- Cache compartida de Django (SERVICE_CATALOG_CACHE_TIMEOUT segundos)
+
+La clave combina dos sellos de versión: el del catálogo, que cambia al
+guardar o borrar un Service (signals.py), y el de la matriz de tasas, que
+cambia con cualquier ExchangeRate (rates.invalidate_rate). Cada entrada
+guarda además el vencimiento de la matriz con la que se construyó
+(RateMatrix.expires_at): cuando una tasa supera
+EXCHANGE_RATE_MAX_AGE_HOURS sin cambios, el catálogo se reconstruye igual
+que la matriz del checkout. El ETag depende solo del cuerpo: si los
+precios no cambian, sigue respondiendo 304.
+Con la cache caliente una petición no consulta la base de datos: solo lee
+los sellos (un ``get_many``) y, si el cliente envía el ETag vigente,
+responde 304.
+Código que modifique servicios con ``QuerySet.update()`` debe llamar
+``invalidate_catalog``.
+"""
+
+import hashlib
+import logging
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from authentication.renderers import dumps
+
+from .models import Currency, Service
+from .rate_matrix import get_matrix
+from .rates import MATRIX_VERSION_KEY, ExchangeRateUnavailable
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'payments:catalog-version'
+ENTRY_KEY = 'payments:catalog:{version}:{rates_version}'
+CATALOG_CURRENCIES = (Currency.USD, Currency.COP)
+
+_local = None  # (clave, (etag, cuerpo, vencimiento))
+_build_lock = threading.Lock()
+
+
+def _versions():
+    versions = cache.get_many([VERSION_KEY, MATRIX_VERSION_KEY])
+    for key in (VERSION_KEY, MATRIX_VERSION_KEY):
+        if key not in versions:
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            versions[key] = cache.get(key)
+    return versions[VERSION_KEY], versions[MATRIX_VERSION_KEY]
+
+
+def _prices(service):
+    prices = {}
+    for currency in CATALOG_CURRENCIES:
+        try:
+            price, tax, total = service.get_price_breakdown(currency)
+        except ExchangeRateUnavailable as e:
+            logger.warning('Service %s has no %s price: %s', service.pk, currency, e)
+            prices[currency] = None
+            continue
+        prices[currency] = {'price': price, 'tax': tax, 'total': total}
+    return prices
+
+
+def build_catalog():
+    """
+    Serializa el catálogo de servicios activos.
+
+    Returns:
+        tuple: (etag, cuerpo JSON en bytes)
+    """
+    services = [
+        {
+            'id': service.pk,
+            'name': service.name,
+            'description': service.description,
+            'iva_percentage': service.iva_percentage,
+            'prices': _prices(service),
+        }
+        for service in Service.objects.filter(is_active=True)
+    ]
+    body = dumps(services)
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"', body
+
+
+def _is_fresh(entry):
+    expires_at = entry[2]
+    return expires_at is None or timezone.now() < expires_at
+
+
+def get_catalog():
+    """
+    Catálogo actual desde cache (construido si falta o si venció una tasa).
+
+    Returns:
+        tuple: (etag, cuerpo JSON en bytes)
+    """
+    global _local
+    version, rates_version = _versions()
+    key = ENTRY_KEY.format(version=version, rates_version=rates_version)
+
+    local = _local
+    if local is not None and local[0] == key and _is_fresh(local[1]):
+        return local[1][:2]
+
+    entry = cache.get(key)
+    if entry is None or not _is_fresh(entry):
+        with _build_lock:
+            # Otro hilo pudo construirlo mientras esperábamos
+            entry = cache.get(key)
+            if entry is None or not _is_fresh(entry):
+                expires_at = get_matrix().expires_at
+                entry = (*build_catalog(), expires_at)
+                cache.set(key, entry, timeout=settings.SERVICE_CATALOG_CACHE_TIMEOUT)
+    _local = (key, entry)
+    return entry[:2]
+
+
+def invalidate_catalog():
+    """
+    Invalida el catálogo cacheado en todos los workers.
+
+    Igual que rates.invalidate_rate: ahora y al confirmar la transacción.
+    """
+    def bump():
+        cache.set(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+    bump()
+    transaction.on_commit(bump)
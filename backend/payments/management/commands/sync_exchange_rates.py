@@ -0,0 +1,79 @@
+"""
+Sync exchange rates from the configured provider (EXCHANGE_RATE_PROVIDER).
+
+Usage:
+    python manage.py sync_exchange_rates                      # latest rates, then exit
+    python manage.py sync_exchange_rates --loop --interval 900
+    python manage.py sync_exchange_rates --backfill-from 2025-01-01 --backfill-to 2025-12-31
+
+Pairs default to EXCHANGE_RATE_PAIRS. Rates already stored for the same
+pair and effective date are skipped, so runs can be repeated safely. A
+backfill fetches one rate per day and inserts them in one bulk_create.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from payments.providers import RateProviderError, get_provider, parse_pair
+from payments.rate_sync import backfill, configured_pairs, sync_latest
+
+
+class Command(BaseCommand):
+    help = 'Fetch exchange rates from the rate provider and store the new ones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pairs', default=None,
+            help='Comma-separated pairs such as USD:COP,USD:EUR (default: EXCHANGE_RATE_PAIRS)',
+        )
+        parser.add_argument('--backfill-from', default=None, help='First day to backfill (YYYY-MM-DD)')
+        parser.add_argument('--backfill-to', default=None, help='Last day to backfill (default: today)')
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep syncing every --interval seconds instead of exiting',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=900,
+            help='Seconds between syncs in --loop mode (default: 900)',
+        )
+
+    def handle(self, *args, **options):
+        provider = get_provider()
+        if provider is None:
+            raise CommandError('EXCHANGE_RATE_PROVIDER is not configured.')
+        try:
+            pairs = [parse_pair(pair) for pair in options['pairs'].split(',')] if options['pairs'] else configured_pairs()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['backfill_from']:
+            start = parse_date(options['backfill_from'])
+            end = parse_date(options['backfill_to']) if options['backfill_to'] else timezone.now().date()
+            if start is None or end is None or start > end:
+                raise CommandError('Invalid backfill range.')
+            try:
+                inserted = backfill(start, end, provider=provider, pairs=pairs)
+            except RateProviderError as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(f'Backfilled {inserted} rates from {start} to {end}'))
+            return
+
+        try:
+            while True:
+                try:
+                    inserted = sync_latest(provider=provider, pairs=pairs)
+                except RateProviderError as e:
+                    if not options['loop']:
+                        raise CommandError(str(e))
+                    self.stderr.write(f'Sync failed: {e}')
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'{provider.name}: {inserted} new rates'))
+
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:25
+
+from django.db import migrations, models
+
+
+def delete_duplicate_rates(apps, schema_editor):
+    """Keep the last created rate of each (pair, effective_date)."""
+    ExchangeRate = apps.get_model('payments', 'ExchangeRate')
+    seen = set()
+    duplicates = []
+    rows = ExchangeRate.objects.order_by(
+        'from_currency', 'to_currency', 'effective_date', '-created_at',
+    ).values_list('pk', 'from_currency', 'to_currency', 'effective_date')
+    for pk, from_currency, to_currency, effective_date in rows.iterator():
+        key = (from_currency, to_currency, effective_date)
+        if key in seen:
+            duplicates.append(pk)
+        else:
+            seen.add(key)
+    for start in range(0, len(duplicates), 1000):
+        ExchangeRate.objects.filter(pk__in=duplicates[start:start + 1000]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_rates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='exchangerate',
+            constraint=models.UniqueConstraint(fields=('from_currency', 'to_currency', 'effective_date'), name='exchange_rate_pair_date_uniq'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0002_exchange_rate_pair_date_uniq'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exchangerate',
+            name='from_currency',
+            field=models.CharField(choices=[('USD', 'US Dollar'), ('COP', 'Colombian Peso'), ('EUR', 'Euro'), ('MXN', 'Mexican Peso')], default='USD', max_length=3, verbose_name='Moneda Origen'),
+        ),
+        migrations.AlterField(
+            model_name='exchangerate',
+            name='to_currency',
+            field=models.CharField(choices=[('USD', 'US Dollar'), ('COP', 'Colombian Peso'), ('EUR', 'Euro'), ('MXN', 'Mexican Peso')], default='COP', max_length=3, verbose_name='Moneda Destino'),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='currency',
+            field=models.CharField(choices=[('USD', 'US Dollar'), ('COP', 'Colombian Peso'), ('EUR', 'Euro'), ('MXN', 'Mexican Peso')], max_length=3, verbose_name='Moneda'),
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='currency',
+            field=models.CharField(choices=[('USD', 'US Dollar'), ('COP', 'Colombian Peso'), ('EUR', 'Euro'), ('MXN', 'Mexican Peso')], max_length=3, verbose_name='Moneda'),
+        ),
+    ]
@@ -8,7 +8,7 @@ Arquitectura diseñada para manejar:
 from django.db import models
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
 from django.utils import timezone
 import uuid
 
@@ -19,6 +19,8 @@ class Currency(models.TextChoices):
     """Monedas soportadas en la plataforma"""
     USD = 'USD', 'US Dollar'
     COP = 'COP', 'Colombian Peso'
+    EUR = 'EUR', 'Euro'
+    MXN = 'MXN', 'Mexican Peso'
 
 
 class PaymentGateway(models.TextChoices):
@@ -112,25 +114,44 @@ class Service(models.Model):
         Obtiene el precio en la moneda solicitada
 
         Args:
-            currency: Currency.USD o Currency.COP
-            exchange_rate: Tasa de cambio USD->COP (si no se provee, usa base_price_cop)
+            currency: Cualquier Currency
+            exchange_rate: Tasa USD->currency explícita (si no se provee, COP usa
+                base_price_cop y el resto la matriz de tasas)
 
         Returns:
-            Decimal: Precio en la moneda solicitada
+            Decimal: Precio en la moneda solicitada, redondeado a centavos
+
+        Raises:
+            ExchangeRateUnavailable: Sin tasa directa ni cruzada hacia ``currency``
         """
         if currency == Currency.USD:
             return self.base_price_usd
 
-        # Para COP, usar precio manual o calcular con tasa de cambio
-        if self.base_price_cop:
+        # Para COP, precio manual si existe
+        if currency == Currency.COP and self.base_price_cop:
             return self.base_price_cop
 
         if exchange_rate:
-            return self.base_price_usd * Decimal(str(exchange_rate))
+            return (self.base_price_usd * Decimal(str(exchange_rate))).quantize(
+                Decimal('0.01'), rounding=ROUND_HALF_UP
+            )
+
+        # Tasa directa o cruzada, precalculada (ver payments/rate_matrix.py)
+        from .rate_matrix import get_matrix
+        return get_matrix().convert(self.base_price_usd, Currency.USD, currency)
+
+    def get_price_breakdown(self, currency, exchange_rate=None):
+        """
+        Precio, impuestos y total en la moneda solicitada
+
+        El IVA solo aplica a COP (Colombia).
 
-        # Fallback: usar tasa de cambio por defecto (4000 COP/USD aproximadamente)
-        DEFAULT_EXCHANGE_RATE = Decimal('4000.00')
-        return self.base_price_usd * DEFAULT_EXCHANGE_RATE
+        Returns:
+            tuple: (precio, impuestos, total) en Decimal
+        """
+        price = self.get_price(currency, exchange_rate)
+        tax = self.calculate_tax(price) if currency == Currency.COP else Decimal('0.00')
+        return price, tax, price + tax
 
     def calculate_tax(self, base_amount):
         """
@@ -270,23 +291,22 @@ class Order(models.Model):
 
         Args:
             service: Instancia de Service
-            exchange_rate: Tasa de cambio si la moneda es COP
+            exchange_rate: Tasa USD->moneda de la orden (por defecto la vigente,
+                salvo para COP con precio manual)
         """
-        # Obtener precio base en la moneda correcta
-        self.subtotal = service.get_price(self.currency, exchange_rate)
-
-        # Calcular impuestos solo para COP (Colombia)
-        if self.currency == Currency.COP:
-            self.tax_amount = service.calculate_tax(self.subtotal)
-        else:
-            self.tax_amount = Decimal('0.00')
+        manual_price = self.currency == Currency.COP and service.base_price_cop
+        if self.currency != Currency.USD and not exchange_rate and not manual_price:
+            from .rate_matrix import get_matrix
+            exchange_rate = get_matrix().rate(Currency.USD, self.currency)
 
-        # Calcular total
-        self.total = self.subtotal + self.tax_amount
+        # Redondear la tasa a la precisión guardada antes de usarla, para que
+        # subtotal = base_price_usd * exchange_rate se pueda reproducir
+        if self.currency != Currency.USD and exchange_rate:
+            exchange_rate = Decimal(str(exchange_rate)).quantize(Decimal('0.0001'), rounding=ROUND_HALF_UP)
+            self.exchange_rate = exchange_rate
 
-        # Guardar tasa de cambio si es COP
-        if self.currency == Currency.COP and exchange_rate:
-            self.exchange_rate = Decimal(str(exchange_rate))
+        # Precio en la moneda de la orden, IVA (solo COP) y total
+        self.subtotal, self.tax_amount, self.total = service.get_price_breakdown(self.currency, exchange_rate)
 
     def mark_as_paid(self):
         """Marca la orden como pagada"""
@@ -494,16 +514,28 @@ class ExchangeRate(models.Model):
         indexes = [
             models.Index(fields=['from_currency', 'to_currency', '-effective_date']),
         ]
+        constraints = [
+            # Una tasa por par y fecha efectiva: la sincronización con el
+            # proveedor se puede repetir sin duplicar (ver payments/rate_sync.py)
+            models.UniqueConstraint(
+                fields=['from_currency', 'to_currency', 'effective_date'],
+                name='exchange_rate_pair_date_uniq',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.from_currency}/{self.to_currency}: {self.rate} ({self.effective_date.date()})"
 
     @classmethod
     def get_latest_rate(cls, from_currency=Currency.USD, to_currency=Currency.COP):
-        """Obtiene la tasa de cambio más reciente"""
-        rate_obj = cls.objects.filter(
-            from_currency=from_currency,
-            to_currency=to_currency
-        ).first()
+        """
+        Obtiene la tasa de cambio más reciente (cacheada)
+
+        Tasas viejas o ausentes siguen EXCHANGE_RATE_STALE_POLICY y
+        EXCHANGE_RATE_FALLBACKS (ver payments/rates.py)
 
-        return rate_obj.rate if rate_obj else Decimal('4000.00')  # Fallback
+        Raises:
+            ExchangeRateUnavailable: Sin tasa utilizable ni respaldo configurado
+        """
+        from .rates import get_rate
+        return get_rate(from_currency, to_currency)
@@ -0,0 +1,161 @@
+"""
+Proveedores de Tasas de Cambio
+
+Un proveedor entrega cotizaciones (RateQuote) que rate_sync.py guarda como
+ExchangeRate. EXCHANGE_RATE_PROVIDER elige la clase (ruta de import):
+
+- StaticRateProvider: tasas fijas locales, sin red (desarrollo y tests)
+- OpenExchangeRatesProvider: API de Open Exchange Rates (base USD; otros
+  pares se calculan cruzando contra USD)
+
+Para agregar otro proveedor basta una subclase de RateProvider con
+``fetch_latest`` (y ``fetch_history`` si soporta backfill).
+"""
+
+from collections import namedtuple
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+import requests
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+RATE_PLACES = Decimal('0.0001')  # ExchangeRate.rate tiene 4 decimales
+
+RateQuote = namedtuple('RateQuote', ['from_currency', 'to_currency', 'rate', 'effective_date'])
+
+
+class RateProviderError(Exception):
+    """El proveedor no respondió o respondió algo inválido."""
+
+
+def parse_pair(value):
+    """'USD:COP' -> ('USD', 'COP')"""
+    from_currency, _, to_currency = value.strip().upper().partition(':')
+    if not from_currency or not to_currency:
+        raise ValueError(f'Par de monedas inválido: {value!r} (formato ORIGEN:DESTINO)')
+    return from_currency, to_currency
+
+
+def _days(start, end):
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+class RateProvider:
+    """Interfaz de un proveedor de tasas."""
+
+    name = ''
+
+    def fetch_latest(self, pairs):
+        """
+        Tasas actuales.
+
+        Args:
+            pairs (list): [(from_currency, to_currency), ...]
+
+        Returns:
+            list: RateQuote por cada par disponible
+
+        Raises:
+            RateProviderError
+        """
+        raise NotImplementedError
+
+    def fetch_history(self, pairs, start, end):
+        """Tasas diarias entre las fechas ``start`` y ``end`` (inclusive)."""
+        raise NotImplementedError(f'{type(self).__name__} no soporta backfill')
+
+
+class StaticRateProvider(RateProvider):
+    """
+    Tasas fijas, sin red. Una cotización por día (medianoche UTC), así que
+    sincronizar varias veces el mismo día no agrega filas.
+
+    Args:
+        rates (dict): {'USD:COP': Decimal} (por defecto EXCHANGE_RATE_FALLBACKS)
+    """
+
+    name = 'Static'
+
+    def __init__(self, rates=None):
+        self.rates = {parse_pair(pair): Decimal(rate) for pair, rate in (rates or settings.EXCHANGE_RATE_FALLBACKS).items()}
+
+    def _quotes(self, pairs, day):
+        effective_date = datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+        return [
+            RateQuote(*pair, self.rates[pair].quantize(RATE_PLACES), effective_date)
+            for pair in pairs if pair in self.rates
+        ]
+
+    def fetch_latest(self, pairs):
+        return self._quotes(pairs, timezone.now().date())
+
+    def fetch_history(self, pairs, start, end):
+        return [quote for day in _days(start, end) for quote in self._quotes(pairs, day)]
+
+
+class OpenExchangeRatesProvider(RateProvider):
+    """
+    https://openexchangerates.org (OPENEXCHANGERATES_APP_ID).
+
+    Las tasas vienen con base USD; un par X:Y se calcula como Y/X.
+    Timeouts separados de conexión y lectura: un proveedor colgado nunca
+    bloquea la sincronización indefinidamente.
+    """
+
+    name = 'OpenExchangeRates'
+
+    def __init__(self, app_id=None, api_url=None, timeout=None):
+        self.app_id = app_id or settings.OPENEXCHANGERATES_APP_ID
+        self.api_url = (api_url or settings.OPENEXCHANGERATES_API_URL).rstrip('/')
+        self.timeout = timeout or (settings.EXCHANGE_RATE_PROVIDER_CONNECT_TIMEOUT,
+                                   settings.EXCHANGE_RATE_PROVIDER_READ_TIMEOUT)
+        self.session = requests.Session()
+
+    def _get(self, path, pairs):
+        symbols = sorted({currency for pair in pairs for currency in pair})
+        try:
+            response = self.session.get(
+                f'{self.api_url}/{path}',
+                params={'app_id': self.app_id, 'symbols': ','.join(symbols)},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            data = response.json()
+            effective_date = datetime.fromtimestamp(data['timestamp'], tz=dt_timezone.utc)
+            usd_rates = {code: Decimal(str(value)) for code, value in data['rates'].items()}
+        except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+            raise RateProviderError(f'{self.name}: {e}') from e
+
+        usd_rates['USD'] = Decimal('1')
+        return [
+            RateQuote(
+                from_currency, to_currency,
+                (usd_rates[to_currency] / usd_rates[from_currency]).quantize(RATE_PLACES),
+                effective_date,
+            )
+            for from_currency, to_currency in pairs
+            if from_currency in usd_rates and to_currency in usd_rates
+        ]
+
+    def fetch_latest(self, pairs):
+        return self._get('latest.json', pairs)
+
+    def fetch_history(self, pairs, start, end):
+        return [quote for day in _days(start, end) for quote in self._get(f'historical/{day:%Y-%m-%d}.json', pairs)]
+
+
+def get_provider():
+    """
+    Instancia del proveedor configurado.
+
+    Returns:
+        RateProvider: O None si EXCHANGE_RATE_PROVIDER está vacío
+    """
+    if not settings.EXCHANGE_RATE_PROVIDER:
+        return None
+    return import_string(settings.EXCHANGE_RATE_PROVIDER)()
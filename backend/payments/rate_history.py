@@ -0,0 +1,107 @@
+"""
+Tasas de Cambio Históricas (as-of)
+
+Para reportes financieros: la tasa vigente en un momento dado (la última
+con ``effective_date <= momento``), sin una consulta por fila.
+
+- ``rate_as_of`` / ``annotate_rate_as_of``: subconsulta correlacionada
+  ``ORDER BY effective_date DESC LIMIT 1`` dentro del mismo SELECT. En
+  Postgres se resuelve por fila con un index scan sobre
+  (from_currency, to_currency, -effective_date), igual que un LATERAL
+  join, en una sola consulta para todo el queryset
+- ``RateHistory``: el historial de un par en arreglos ordenados en memoria,
+  resuelto con bisect, para jobs por lotes que procesan millones de filas
+  o datos que no vienen de un queryset
+"""
+
+from bisect import bisect_right
+
+from django.db.models import OuterRef, Subquery
+
+from .models import Currency, ExchangeRate
+
+
+def rate_as_of(outer_field, from_currency=Currency.USD, to_currency=Currency.COP):
+    """
+    Expresión con la tasa vigente en ``outer_field`` de la fila externa.
+
+    Args:
+        outer_field (str): Campo datetime del queryset externo (ej: 'created_at')
+
+    Returns:
+        Subquery: Decimal, o NULL si no había tasa en ese momento
+    """
+    return Subquery(
+        ExchangeRate.objects
+        .filter(
+            from_currency=from_currency,
+            to_currency=to_currency,
+            effective_date__lte=OuterRef(outer_field),
+        )
+        .order_by('-effective_date')
+        .values('rate')[:1]
+    )
+
+
+def annotate_rate_as_of(queryset, date_field='created_at', name='rate_as_of',
+                        from_currency=Currency.USD, to_currency=Currency.COP):
+    """
+    Anota cada fila con la tasa vigente en ``date_field``.
+
+    Example:
+        annotate_rate_as_of(Order.objects.filter(status=OrderStatus.PAID))
+    """
+    return queryset.annotate(**{name: rate_as_of(date_field, from_currency, to_currency)})
+
+
+class RateHistory:
+    """
+    Historial de un par en memoria, consultado con bisect.
+
+    Args:
+        points (iterable): (effective_date, rate) en cualquier orden
+    """
+
+    def __init__(self, points):
+        points = sorted(points, key=lambda point: point[0])
+        self.dates = [date for date, _ in points]
+        self.rates = [rate for _, rate in points]
+
+    def __len__(self):
+        return len(self.dates)
+
+    @classmethod
+    def load(cls, from_currency=Currency.USD, to_currency=Currency.COP, start=None, end=None):
+        """
+        Carga las tasas del par que pueden estar vigentes entre ``start`` y ``end``.
+
+        Incluye la última tasa anterior a ``start`` (vigente al inicio del
+        rango). Dos consultas como máximo.
+        """
+        rates = ExchangeRate.objects.filter(from_currency=from_currency, to_currency=to_currency)
+        if end is not None:
+            rates = rates.filter(effective_date__lte=end)
+        if start is not None:
+            first = (
+                rates.filter(effective_date__lte=start)
+                .order_by('-effective_date')
+                .values_list('effective_date', flat=True)
+                .first()
+            )
+            if first is not None:
+                rates = rates.filter(effective_date__gte=first)
+        return cls(rates.order_by('effective_date').values_list('effective_date', 'rate').iterator())
+
+    def as_of(self, when):
+        """Tasa vigente en ``when``, o None si es anterior a la primera tasa."""
+        index = bisect_right(self.dates, when) - 1
+        return self.rates[index] if index >= 0 else None
+
+    def as_of_many(self, moments):
+        """Tasas vigentes para cada momento de ``moments`` (lista en el mismo orden)."""
+        dates, rates = self.dates, self.rates
+        result = []
+        for when in moments:
+            index = bisect_right(dates, when) - 1
+            result.append(rates[index] if index >= 0 else None)
+        return result
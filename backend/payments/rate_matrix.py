@@ -0,0 +1,171 @@
+"""
+Matriz de Tasas de Cambio
+
+RateMatrix precalcula la tasa entre todo par de monedas conectado por
+ExchangeRate, así un precio en cualquier moneda es un acceso a diccionario
+(``Service.get_price``), sin mantener N² pares a mano.
+
+- Tasas directas: la más reciente de cada par, con la política de valores
+  viejos y respaldos de rates.py (``get_rate``)
+- Inversas: 1 / tasa cuando el par inverso no tiene tasa propia
+- Cruzadas: producto por el camino más corto entre monedas, pasando
+  primero por EXCHANGE_RATE_PIVOT (USD); ej. EUR->COP = USD->COP / USD->EUR
+
+Las tasas se guardan con la precisión completa de Decimal (28 dígitos) y
+solo el monto convertido se redondea (ROUND_HALF_UP a centavos).
+
+Cada proceso guarda una matriz marcada con la versión global de tasas:
+guardar o borrar cualquier ExchangeRate (``rates.invalidate_rate``) cambia
+la versión y la siguiente consulta reconstruye la matriz. Los pares
+registrados se guardan en la cache compartida bajo esa misma versión, así
+que solo el primer worker que la ve consulta la base de datos.
+
+Sin cambios de versión la matriz se reconstruye una sola vez más por tasa:
+al llegar ``expires_at``, cuando la tasa vigente más antigua supera
+EXCHANGE_RATE_MAX_AGE_HOURS y pasa a la política de valores viejos. Entre
+tanto ``Service.get_price`` es un acceso a diccionario.
+"""
+
+import logging
+import threading
+from collections import deque
+from datetime import timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .providers import parse_pair
+from .rates import ExchangeRateUnavailable, get_matrix_version, get_rate, latest_rate
+
+logger = logging.getLogger(__name__)
+
+CENTS = Decimal('0.01')
+ONE = Decimal('1')
+
+PAIRS_KEY = 'payments:rate-pairs:{version}'
+
+_current = None  # (versión, pares registrados, RateMatrix)
+_build_lock = threading.Lock()
+
+
+class RateMatrix:
+    """
+    Tabla de tasas entre todos los pares alcanzables.
+
+    Args:
+        direct (dict): {(from_currency, to_currency): Decimal}
+        pivot (str): Moneda preferida para triangular
+        expires_at (datetime): Cuando alguna tasa directa deja de estar
+            vigente (None: ninguna vence)
+    """
+
+    def __init__(self, direct, pivot='USD', expires_at=None):
+        self.direct = dict(direct)
+        self.pivot = pivot
+        self.expires_at = expires_at
+
+        # Aristas: directas, e inversas cuando el par inverso no tiene tasa
+        edges = {}
+        for (from_currency, to_currency), rate in self.direct.items():
+            edges.setdefault(from_currency, {})[to_currency] = rate
+        for (from_currency, to_currency), rate in self.direct.items():
+            if (to_currency, from_currency) not in self.direct:
+                edges.setdefault(to_currency, {})[from_currency] = ONE / rate
+
+        self.currencies = sorted(edges)
+        self._table = {}
+        for source in self.currencies:
+            self._table.update(self._paths_from(source, edges))
+
+    def _paths_from(self, source, edges):
+        # BFS: el camino con menos conversiones; en empate, por el pivote
+        found = {(source, source): ONE}
+        queue = deque([(source, ONE)])
+        while queue:
+            currency, rate = queue.popleft()
+            for target in sorted(edges[currency], key=lambda code: (code != self.pivot, code)):
+                if (source, target) not in found:
+                    found[(source, target)] = rate * edges[currency][target]
+                    queue.append((target, found[(source, target)]))
+        return found
+
+    def __contains__(self, pair):
+        return pair in self._table
+
+    def rate(self, from_currency, to_currency):
+        """
+        Tasa de ``from_currency`` a ``to_currency`` (precisión completa).
+
+        Raises:
+            ExchangeRateUnavailable: Monedas no conectadas por ninguna tasa
+        """
+        try:
+            return self._table[(from_currency, to_currency)]
+        except KeyError:
+            raise ExchangeRateUnavailable(f'{from_currency}/{to_currency}: no direct or cross rate') from None
+
+    def convert(self, amount, from_currency, to_currency):
+        """Convierte ``amount`` y redondea a centavos (ROUND_HALF_UP)."""
+        return (amount * self.rate(from_currency, to_currency)).quantize(CENTS, rounding=ROUND_HALF_UP)
+
+    def is_expired(self):
+        return self.expires_at is not None and timezone.now() >= self.expires_at
+
+
+def registered_pairs(version):
+    """Pares con tasas registradas o con respaldo, cacheados bajo la versión de la matriz."""
+    from .models import ExchangeRate
+
+    key = PAIRS_KEY.format(version=version)
+    pairs = cache.get(key)
+    if pairs is None:
+        pairs = frozenset(ExchangeRate.objects.order_by().values_list('from_currency', 'to_currency').distinct())
+        cache.set(key, pairs, timeout=settings.EXCHANGE_RATE_CACHE_TIMEOUT)
+    return pairs | {parse_pair(pair) for pair in settings.EXCHANGE_RATE_FALLBACKS}
+
+
+def build_matrix(pairs):
+    """Construye la matriz con la tasa vigente de cada par de ``pairs``."""
+    max_age = timedelta(hours=settings.EXCHANGE_RATE_MAX_AGE_HOURS)
+    now = timezone.now()
+    direct = {}
+    deadlines = []
+    for from_currency, to_currency in sorted(pairs):
+        try:
+            direct[(from_currency, to_currency)] = get_rate(from_currency, to_currency)
+        except ExchangeRateUnavailable as e:
+            logger.warning('Exchange rate left out of the rate matrix: %s', e)
+            continue
+        # Las tasas ya vencidas solo cambian con una tasa nueva (nueva versión)
+        effective_date = latest_rate(from_currency, to_currency).effective_date
+        if effective_date is not None and effective_date + max_age > now:
+            deadlines.append(effective_date + max_age)
+    return RateMatrix(direct, pivot=settings.EXCHANGE_RATE_PIVOT, expires_at=min(deadlines, default=None))
+
+
+def get_matrix():
+    """
+    Matriz actual del proceso (reconstruida si cambió alguna tasa o venció una).
+
+    Returns:
+        RateMatrix
+    """
+    global _current
+    version = get_matrix_version()
+    current = _current
+    if current is not None and current[0] == version and not current[2].is_expired():
+        return current[2]
+
+    with _build_lock:
+        current = _current
+        if current is not None and current[0] == version:
+            if not current[2].is_expired():
+                return current[2]
+            pairs = current[1]  # Misma versión: los pares no cambiaron
+        else:
+            pairs = registered_pairs(version)
+        matrix = build_matrix(pairs)
+        _current = (version, pairs, matrix)
+    return matrix
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+Sincronización de Tasas de Cambio
+
+Trae cotizaciones del proveedor configurado (providers.py) y las guarda
+como ExchangeRate.
+
+- ``store_rates``: un solo ``bulk_create``; las tasas ya guardadas para el
+  mismo (par, effective_date) se omiten (restricción única
+  exchange_rate_pair_date_uniq), así que repetir una sincronización o un
+  backfill es seguro. Invalida la cache de rates.py de los pares tocados
+- ``sync_latest`` / ``backfill``: usados por ``sync_exchange_rates``
+  (comando periódico)
+- ``request_refresh``: stale-while-revalidate. Cuando el checkout lee una
+  tasa más vieja que EXCHANGE_RATE_REFRESH_SECONDS, se lanza una
+  sincronización en un hilo de fondo (una por par en todo el cluster, como
+  máximo una cada EXCHANGE_RATE_REFRESH_SECONDS) y el checkout sigue con la
+  tasa anterior: nunca espera al proveedor
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from .models import ExchangeRate
+from .providers import get_provider, parse_pair
+from .rates import invalidate_rate
+
+logger = logging.getLogger(__name__)
+
+REFRESH_LOCK_KEY = 'payments:rate-refresh:{from_currency}:{to_currency}'
+
+_next_refresh = {}
+
+
+def configured_pairs():
+    """Pares de EXCHANGE_RATE_PAIRS como [(from_currency, to_currency)]."""
+    return [parse_pair(pair) for pair in settings.EXCHANGE_RATE_PAIRS]
+
+
+def store_rates(quotes, source):
+    """
+    Guarda cotizaciones nuevas en un solo bulk_create.
+
+    Args:
+        quotes (iterable): RateQuote
+        source (str): Valor de ExchangeRate.source
+
+    Returns:
+        int: Tasas insertadas
+    """
+    # Una cotización por (par, fecha); la última gana
+    unique = {(q.from_currency, q.to_currency, q.effective_date): q for q in quotes}
+    if not unique:
+        return 0
+
+    pairs = {(from_currency, to_currency) for from_currency, to_currency, _ in unique}
+    dates = [effective_date for _, _, effective_date in unique]
+    existing = set()
+    for from_currency, to_currency in pairs:
+        existing.update(
+            ExchangeRate.objects.filter(
+                from_currency=from_currency, to_currency=to_currency,
+                effective_date__range=(min(dates), max(dates)),
+            ).values_list('from_currency', 'to_currency', 'effective_date')
+        )
+
+    new_rates = [
+        ExchangeRate(
+            from_currency=quote.from_currency, to_currency=quote.to_currency,
+            rate=quote.rate, effective_date=quote.effective_date, source=source,
+        )
+        for key, quote in unique.items() if key not in existing
+    ]
+    if new_rates:
+        # ignore_conflicts: otra sincronización concurrente pudo insertar las mismas
+        ExchangeRate.objects.bulk_create(new_rates, ignore_conflicts=True)
+        # bulk_create no envía post_save
+        for from_currency, to_currency in {(rate.from_currency, rate.to_currency) for rate in new_rates}:
+            invalidate_rate(from_currency, to_currency)
+    return len(new_rates)
+
+
+def sync_latest(provider=None, pairs=None):
+    """Trae y guarda las tasas actuales. Devuelve las tasas insertadas."""
+    provider = provider or get_provider()
+    pairs = pairs or configured_pairs()
+    return store_rates(provider.fetch_latest(pairs), provider.name)
+
+
+def backfill(start, end, provider=None, pairs=None):
+    """Trae y guarda las tasas diarias entre dos fechas. Devuelve las insertadas."""
+    provider = provider or get_provider()
+    pairs = pairs or configured_pairs()
+    return store_rates(provider.fetch_history(pairs, start, end), provider.name)
+
+
+def _refresh(pair):
+    try:
+        sync_latest(pairs=[pair])
+    except Exception:
+        logger.exception('Background exchange rate refresh failed for %s/%s', *pair)
+    finally:
+        # Conexiones abiertas por este hilo
+        connections.close_all()
+
+
+def request_refresh(from_currency, to_currency):
+    """
+    Sincroniza el par en segundo plano, sin esperar.
+
+    Returns:
+        bool: True si se lanzó una sincronización
+    """
+    interval = settings.EXCHANGE_RATE_REFRESH_SECONDS
+    if not settings.EXCHANGE_RATE_PROVIDER or interval <= 0:
+        return False
+
+    pair = (from_currency, to_currency)
+    now = time.monotonic()
+    if _next_refresh.get(pair, 0) > now:
+        return False
+    _next_refresh[pair] = now + interval
+
+    lock = REFRESH_LOCK_KEY.format(from_currency=from_currency, to_currency=to_currency)
+    if not cache.add(lock, 1, timeout=interval):
+        return False  # Otro worker ya la lanzó
+
+    threading.Thread(target=_refresh, args=(pair,), name='exchange-rate-refresh', daemon=True).start()
+    return True
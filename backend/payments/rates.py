@@ -0,0 +1,214 @@
+"""
+Cache de Tasas de Cambio
+
+``latest_rate`` sirve la tasa más reciente por par de monedas sin consultar
+la base de datos en cada checkout en COP.
+
+Niveles:
+- Diccionario por proceso (un par de monedas = una entrada)
+- Cache compartida de Django (EXCHANGE_RATE_CACHE_TIMEOUT segundos)
+
+Ambos niveles usan un sello de versión por par guardado en la cache
+compartida. Guardar o borrar un ExchangeRate (post_save / post_delete, ver
+signals.py) reemplaza el sello, así que todos los workers recargan en su
+siguiente consulta. Código que escriba tasas con ``bulk_create`` o
+``QuerySet.update()`` debe llamar ``invalidate_rate``.
+
+Single-flight: ante un fallo de cache un solo hilo por proceso (lock
+local) y un solo proceso (``cache.add`` como lock compartido) ejecuta el
+SELECT; los demás esperan su resultado hasta EXCHANGE_RATE_LOCK_WAIT_SECONDS.
+
+Política de valores viejos (``get_rate``):
+- Tasa con más de EXCHANGE_RATE_MAX_AGE_HOURS: EXCHANGE_RATE_STALE_POLICY
+  decide entre usarla ('serve'), usar la tasa de respaldo ('fallback') o
+  fallar ('error')
+- Sin ninguna tasa: tasa de respaldo de EXCHANGE_RATE_FALLBACKS, o
+  ExchangeRateUnavailable si el par no tiene respaldo configurado
+
+Una tasa con más de EXCHANGE_RATE_REFRESH_SECONDS pide además una
+sincronización en segundo plano al proveedor (rate_sync.request_refresh);
+la consulta nunca espera al proveedor.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'payments:rate-version:{pair}'
+MATRIX_VERSION_KEY = 'payments:rate-matrix-version'  # Cambia con cualquier par (rate_matrix.py)
+ENTRY_KEY = 'payments:rate:{pair}:{version}'
+LOCK_TIMEOUT = 10  # segundos; libera el lock si el proceso que carga muere
+POLL_INTERVAL = 0.02
+
+# rate/effective_date en None: el par no tiene tasas registradas
+RateSnapshot = namedtuple('RateSnapshot', ['rate', 'effective_date'])
+NO_RATE = RateSnapshot(None, None)
+
+_local = {}
+_pair_locks = defaultdict(threading.Lock)
+
+
+class ExchangeRateUnavailable(Exception):
+    """No hay una tasa utilizable para el par (ni respaldo configurado)."""
+
+
+def pair_key(from_currency, to_currency):
+    return f'{from_currency}:{to_currency}'
+
+
+def version_key(from_currency, to_currency):
+    """Clave de la cache compartida con el sello de versión del par."""
+    return VERSION_KEY.format(pair=pair_key(from_currency, to_currency))
+
+
+def _get_stamp(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _get_version(from_currency, to_currency):
+    return _get_stamp(version_key(from_currency, to_currency))
+
+
+def get_matrix_version():
+    """Sello de versión compartido por todas las tasas."""
+    return _get_stamp(MATRIX_VERSION_KEY)
+
+
+def _query(from_currency, to_currency):
+    from .models import ExchangeRate
+
+    row = (
+        ExchangeRate.objects
+        .filter(from_currency=from_currency, to_currency=to_currency)
+        .order_by('-effective_date')
+        .values_list('rate', 'effective_date')
+        .first()
+    )
+    return RateSnapshot(*row) if row else NO_RATE
+
+
+def _load_shared(from_currency, to_currency, version):
+    key = ENTRY_KEY.format(pair=pair_key(from_currency, to_currency), version=version)
+    snapshot = cache.get(key)
+    if snapshot is not None:
+        return snapshot
+
+    lock = f'{key}:lock'
+    if cache.add(lock, 1, timeout=LOCK_TIMEOUT):
+        try:
+            snapshot = _query(from_currency, to_currency)
+            cache.set(key, snapshot, timeout=settings.EXCHANGE_RATE_CACHE_TIMEOUT)
+        finally:
+            cache.delete(lock)
+        return snapshot
+
+    # Otro worker está cargando esta versión: esperar su resultado
+    deadline = time.monotonic() + settings.EXCHANGE_RATE_LOCK_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        snapshot = cache.get(key)
+        if snapshot is not None:
+            return snapshot
+    # El worker que carga tardó demasiado (o murió): consultar directamente
+    return _query(from_currency, to_currency)
+
+
+def latest_rate(from_currency, to_currency):
+    """
+    Tasa más reciente del par, desde cache.
+
+    Returns:
+        RateSnapshot: (rate, effective_date); NO_RATE si el par no tiene tasas
+    """
+    pair = pair_key(from_currency, to_currency)
+    version = _get_version(from_currency, to_currency)
+
+    entry = _local.get(pair)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    with _pair_locks[pair]:
+        # Otro hilo pudo cargarla mientras esperábamos el lock
+        entry = _local.get(pair)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        snapshot = _load_shared(from_currency, to_currency, version)
+        _local[pair] = (version, snapshot)
+    return snapshot
+
+
+def _fallback(from_currency, to_currency, reason):
+    rate = settings.EXCHANGE_RATE_FALLBACKS.get(pair_key(from_currency, to_currency))
+    if rate is None:
+        raise ExchangeRateUnavailable(f'{from_currency}/{to_currency}: {reason}')
+    logger.warning('Using fallback exchange rate %s/%s = %s (%s)', from_currency, to_currency, rate, reason)
+    return rate
+
+
+def _revalidate(from_currency, to_currency):
+    # Sincronización en segundo plano; esta consulta sigue con la tasa actual
+    from .rate_sync import request_refresh
+    request_refresh(from_currency, to_currency)
+
+
+def get_rate(from_currency, to_currency):
+    """
+    Tasa a usar para el par, aplicando la política de valores viejos.
+
+    Returns:
+        Decimal
+
+    Raises:
+        ExchangeRateUnavailable: Sin tasa utilizable ni respaldo configurado
+    """
+    snapshot = latest_rate(from_currency, to_currency)
+    if snapshot.rate is None:
+        _revalidate(from_currency, to_currency)
+        return _fallback(from_currency, to_currency, 'no exchange rate recorded')
+
+    age = timezone.now() - snapshot.effective_date
+    if age.total_seconds() > settings.EXCHANGE_RATE_REFRESH_SECONDS:
+        _revalidate(from_currency, to_currency)
+
+    if age <= timedelta(hours=settings.EXCHANGE_RATE_MAX_AGE_HOURS):
+        return snapshot.rate
+
+    reason = f'latest exchange rate is from {snapshot.effective_date.isoformat()}'
+    policy = settings.EXCHANGE_RATE_STALE_POLICY
+    if policy == 'serve':
+        logger.warning('Using stale exchange rate %s/%s = %s (%s)', from_currency, to_currency, snapshot.rate, reason)
+        return snapshot.rate
+    if policy == 'fallback':
+        return _fallback(from_currency, to_currency, reason)
+    raise ExchangeRateUnavailable(f'{from_currency}/{to_currency}: {reason}')
+
+
+def invalidate_rate(from_currency, to_currency):
+    """
+    Invalida la tasa cacheada del par (y la matriz de tasas) en todos los workers.
+
+    La versión se reemplaza de inmediato y otra vez al confirmar la
+    transacción, para que un lector concurrente no cachee datos previos al
+    commit bajo la nueva versión.
+    """
+    key = version_key(from_currency, to_currency)
+
+    def bump():
+        cache.set_many({key: uuid.uuid4().hex, MATRIX_VERSION_KEY: uuid.uuid4().hex}, timeout=None)
+
+    bump()
+    transaction.on_commit(bump)
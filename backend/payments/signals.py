@@ -0,0 +1,24 @@
+"""
+Signal handlers para los modelos de pagos.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .catalog import invalidate_catalog
+from .models import ExchangeRate, Service
+from .rates import invalidate_rate
+
+
+@receiver(post_save, sender=ExchangeRate)
+@receiver(post_delete, sender=ExchangeRate)
+def invalidate_cached_rate(sender, instance, **kwargs):
+    """Invalida la tasa cacheada del par cuando se guarda o borra una tasa."""
+    invalidate_rate(instance.from_currency, instance.to_currency)
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def invalidate_cached_catalog(sender, instance, **kwargs):
+    """Invalida el catálogo cacheado cuando se guarda o borra un servicio."""
+    invalidate_catalog()
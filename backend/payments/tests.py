@@ -1,3 +1,443 @@
-from django.test import TestCase
+"""
+Tests de la app de pagos
+"""
 
-# Create your tests here.
+import io
+import json
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.utils import timezone
+
+from . import rate_matrix, rate_sync, rates
+from .models import Currency, ExchangeRate, Order, PaymentGateway, Service
+from .providers import OpenExchangeRatesProvider, RateQuote, StaticRateProvider
+from .rate_history import RateHistory, annotate_rate_as_of
+from .rate_matrix import RateMatrix, get_matrix
+from .rates import ExchangeRateUnavailable
+
+
+class ExchangeRateCacheTestCase(TestCase):
+    """Tasa más reciente cacheada, invalidación y política de valores viejos"""
+
+    def setUp(self):
+        cache.clear()  # Nuevos sellos de versión entre tests
+        self.service = Service.objects.create(
+            name='Mezcla', description='Mezcla de una canción', base_price_usd=Decimal('100.00'),
+        )
+
+    def test_latest_rate_is_cached(self):
+        ExchangeRate.objects.create(rate=Decimal('4100.5000'))
+        with self.assertNumQueries(1):
+            self.assertEqual(ExchangeRate.get_latest_rate(), Decimal('4100.5000'))
+        with self.assertNumQueries(0):
+            self.assertEqual(ExchangeRate.get_latest_rate(), Decimal('4100.5000'))
+
+    def test_saving_a_rate_invalidates_the_pair(self):
+        ExchangeRate.objects.create(rate=Decimal('4100.0000'))
+        self.assertEqual(ExchangeRate.get_latest_rate(), Decimal('4100.0000'))
+
+        ExchangeRate.objects.create(rate=Decimal('4200.0000'))
+        self.assertEqual(ExchangeRate.get_latest_rate(), Decimal('4200.0000'))
+
+        ExchangeRate.objects.order_by('-effective_date').first().delete()
+        self.assertEqual(ExchangeRate.get_latest_rate(), Decimal('4100.0000'))
+
+    def test_missing_rate_uses_configured_fallback(self):
+        with override_settings(EXCHANGE_RATE_FALLBACKS={'USD:COP': Decimal('3900.00')}):
+            self.assertEqual(ExchangeRate.get_latest_rate(), Decimal('3900.00'))
+        with override_settings(EXCHANGE_RATE_FALLBACKS={}):
+            with self.assertRaises(ExchangeRateUnavailable):
+                ExchangeRate.get_latest_rate()
+
+    def test_stale_rate_policy(self):
+        ExchangeRate.objects.create(rate=Decimal('4100.0000'), effective_date=timezone.now() - timedelta(days=5))
+        fallbacks = {'USD:COP': Decimal('3900.00')}
+
+        with override_settings(EXCHANGE_RATE_MAX_AGE_HOURS=24, EXCHANGE_RATE_FALLBACKS=fallbacks):
+            with override_settings(EXCHANGE_RATE_STALE_POLICY='serve'):
+                self.assertEqual(ExchangeRate.get_latest_rate(), Decimal('4100.0000'))
+            with override_settings(EXCHANGE_RATE_STALE_POLICY='fallback'):
+                self.assertEqual(ExchangeRate.get_latest_rate(), Decimal('3900.00'))
+            with override_settings(EXCHANGE_RATE_STALE_POLICY='error'):
+                with self.assertRaises(ExchangeRateUnavailable):
+                    ExchangeRate.get_latest_rate()
+
+        with override_settings(EXCHANGE_RATE_MAX_AGE_HOURS=24 * 7, EXCHANGE_RATE_STALE_POLICY='error'):
+            self.assertEqual(ExchangeRate.get_latest_rate(), Decimal('4100.0000'))
+
+    def test_concurrent_misses_query_once(self):
+        calls = []
+
+        def slow_query(from_currency, to_currency):
+            calls.append((from_currency, to_currency))
+            time.sleep(0.05)
+            return rates.RateSnapshot(Decimal('4100.0000'), timezone.now())
+
+        results = []
+        with mock.patch.object(rates, '_query', side_effect=slow_query):
+            threads = [
+                threading.Thread(target=lambda: results.append(rates.latest_rate('USD', 'COP')))
+                for _ in range(10)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual({snapshot.rate for snapshot in results}, {Decimal('4100.0000')})
+
+    def test_waits_for_the_worker_holding_the_load_lock(self):
+        ExchangeRate.objects.create(rate=Decimal('4100.0000'))
+        version = rates._get_version('USD', 'COP')
+        entry = rates.ENTRY_KEY.format(pair='USD:COP', version=version)
+        cache.add(f'{entry}:lock', 1)  # Otro worker está consultando
+
+        def other_worker_finishes(seconds):
+            cache.set(entry, rates.RateSnapshot(Decimal('4300.0000'), timezone.now()))
+
+        with mock.patch.object(rates.time, 'sleep', side_effect=other_worker_finishes):
+            with self.assertNumQueries(0):
+                self.assertEqual(rates.latest_rate('USD', 'COP').rate, Decimal('4300.0000'))
+
+    def test_cop_price_and_order_use_latest_rate(self):
+        ExchangeRate.objects.create(rate=Decimal('4000.0000'))
+        self.assertEqual(self.service.get_price(Currency.COP), Decimal('400000.00'))
+
+        order = Order(currency=Currency.COP)
+        order.calculate_totals(self.service)
+        self.assertEqual(order.subtotal, Decimal('400000.00'))
+        self.assertEqual(order.tax_amount, Decimal('76000.00'))
+        self.assertEqual(order.exchange_rate, Decimal('4000.0000'))
+
+
+class RateAsOfTestCase(TestCase):
+    """Tasa vigente en la fecha de cada orden"""
+
+    def setUp(self):
+        self.now = timezone.now()
+        for days, rate in ((30, '3900.0000'), (20, '4000.0000'), (10, '4100.0000')):
+            ExchangeRate.objects.create(rate=Decimal(rate), effective_date=self.now - timedelta(days=days))
+        ExchangeRate.objects.create(
+            to_currency=Currency.USD, from_currency=Currency.COP, rate=Decimal('0.0003'),
+            effective_date=self.now - timedelta(days=15),
+        )
+
+        user = get_user_model().objects.create_user(email='finanzas@example.com', password='TestPass123!')
+        service = Service.objects.create(name='Master', description='Master', base_price_usd=Decimal('50.00'))
+        self.orders = {}
+        for days in (40, 25, 20, 5):
+            order = Order.objects.create(
+                user=user, service=service, currency=Currency.COP, payment_gateway=PaymentGateway.BOLD,
+                subtotal=Decimal('1.00'), total=Decimal('1.00'),
+                customer_email=user.email, customer_name='Finanzas',
+            )
+            Order.objects.filter(pk=order.pk).update(created_at=self.now - timedelta(days=days))
+            self.orders[order.pk] = days
+        self.expected = {40: None, 25: Decimal('3900.0000'), 20: Decimal('4000.0000'), 5: Decimal('4100.0000')}
+
+    def test_annotate_resolves_all_orders_in_one_query(self):
+        with self.assertNumQueries(1):
+            rates = dict(annotate_rate_as_of(Order.objects.all()).values_list('pk', 'rate_as_of'))
+        self.assertEqual(
+            {pk: rates[pk] for pk in self.orders},
+            {pk: self.expected[days] for pk, days in self.orders.items()},
+        )
+
+    def test_rate_history_bisect(self):
+        history = RateHistory.load()
+        self.assertEqual(len(history), 3)
+        moments = [self.now - timedelta(days=days) for days in (40, 25, 20, 5)]
+        self.assertEqual(history.as_of_many(moments), [self.expected[days] for days in (40, 25, 20, 5)])
+        self.assertEqual(history.as_of(self.now - timedelta(days=20, seconds=1)), Decimal('3900.0000'))
+
+    def test_rate_history_range_keeps_the_rate_in_force_at_start(self):
+        history = RateHistory.load(start=self.now - timedelta(days=15), end=self.now - timedelta(days=12))
+        self.assertEqual(history.rates, [Decimal('4000.0000')])
+        self.assertEqual(history.as_of(self.now - timedelta(days=13)), Decimal('4000.0000'))
+
+
+@override_settings(
+    EXCHANGE_RATE_PROVIDER='payments.providers.StaticRateProvider',
+    EXCHANGE_RATE_FALLBACKS={'USD:COP': Decimal('4123.45')},
+    EXCHANGE_RATE_PAIRS=['USD:COP'],
+    EXCHANGE_RATE_REFRESH_SECONDS=0,  # Sin hilos de fondo salvo en el test de revalidación
+)
+class RateSyncTestCase(TestCase):
+    """Sincronización con el proveedor, deduplicación y stale-while-revalidate"""
+
+    def setUp(self):
+        cache.clear()
+        rate_sync._next_refresh.clear()
+
+    def test_sync_is_idempotent_and_invalidates_cache(self):
+        ExchangeRate.objects.create(rate=Decimal('4000.0000'), effective_date=timezone.now() - timedelta(days=1))
+        self.assertEqual(ExchangeRate.get_latest_rate(), Decimal('4000.0000'))
+
+        self.assertEqual(rate_sync.sync_latest(), 1)
+        self.assertEqual(rate_sync.sync_latest(), 0)
+        self.assertEqual(ExchangeRate.objects.count(), 2)
+        self.assertEqual(ExchangeRate.get_latest_rate(), Decimal('4123.4500'))
+        self.assertEqual(ExchangeRate.objects.order_by('-effective_date').first().source, 'Static')
+
+    def test_backfill_is_one_insert(self):
+        with CaptureQueriesContext(connection) as queries:
+            inserted = rate_sync.backfill(date(2026, 1, 1), date(2026, 1, 10))
+        self.assertEqual(inserted, 10)
+        inserts = [q for q in queries.captured_queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+
+        # Repetir el backfill no duplica
+        self.assertEqual(rate_sync.backfill(date(2026, 1, 5), date(2026, 1, 12)), 2)
+        self.assertEqual(ExchangeRate.objects.count(), 12)
+
+    def test_store_rates_deduplicates_input(self):
+        when = datetime(2026, 3, 1, tzinfo=dt_timezone.utc)
+        quotes = [
+            RateQuote('USD', 'COP', Decimal('4000.0000'), when),
+            RateQuote('USD', 'COP', Decimal('4001.0000'), when),
+        ]
+        self.assertEqual(rate_sync.store_rates(quotes, 'Test'), 1)
+        self.assertEqual(ExchangeRate.objects.get().rate, Decimal('4001.0000'))
+
+    @override_settings(EXCHANGE_RATE_REFRESH_SECONDS=3600)
+    def test_stale_rate_is_served_while_refreshing_in_background(self):
+        ExchangeRate.objects.create(rate=Decimal('4000.0000'), effective_date=timezone.now() - timedelta(hours=2))
+
+        with mock.patch.object(rate_sync.threading, 'Thread') as thread:
+            self.assertEqual(ExchangeRate.get_latest_rate(), Decimal('4000.0000'))
+            self.assertEqual(ExchangeRate.get_latest_rate(), Decimal('4000.0000'))
+        # Una sola sincronización lanzada, sin esperar al proveedor
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once()
+
+        # Otro worker (sin throttle local) tampoco lanza otra: lock compartido
+        rate_sync._next_refresh.clear()
+        self.assertFalse(rate_sync.request_refresh('USD', 'COP'))
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command('sync_exchange_rates', stdout=out)
+        self.assertIn('1 new rates', out.getvalue())
+
+        call_command('sync_exchange_rates', '--backfill-from', '2026-02-01', '--backfill-to', '2026-02-03', stdout=out)
+        self.assertIn('Backfilled 3 rates', out.getvalue())
+
+    def test_open_exchange_rates_cross_rates(self):
+        provider = OpenExchangeRatesProvider(app_id='test', api_url='https://rates.example.com/api', timeout=(1, 1))
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {'timestamp': 1767225600, 'rates': {'COP': 4000.5, 'EUR': 0.8}}
+        with mock.patch.object(provider.session, 'get', return_value=response) as get:
+            quotes = provider.fetch_latest([('USD', 'COP'), ('EUR', 'COP')])
+
+        self.assertEqual(get.call_args.args[0], 'https://rates.example.com/api/latest.json')
+        self.assertEqual([q.rate for q in quotes], [Decimal('4000.5000'), Decimal('5000.6250')])
+        self.assertEqual(quotes[0].effective_date, datetime(2026, 1, 1, tzinfo=dt_timezone.utc))
+
+    def test_static_provider_defaults_to_fallbacks(self):
+        quotes = StaticRateProvider().fetch_latest([('USD', 'COP'), ('USD', 'EUR')])
+        self.assertEqual([(q.from_currency, q.to_currency, q.rate) for q in quotes], [('USD', 'COP', Decimal('4123.4500'))])
+
+
+@override_settings(EXCHANGE_RATE_FALLBACKS={}, EXCHANGE_RATE_REFRESH_SECONDS=0)
+class RateMatrixTestCase(TestCase):
+    """Tasas directas, inversas y cruzadas; precisión y redondeo"""
+
+    def setUp(self):
+        cache.clear()
+        ExchangeRate.objects.create(from_currency=Currency.USD, to_currency=Currency.COP, rate=Decimal('4000.0000'))
+        ExchangeRate.objects.create(from_currency=Currency.USD, to_currency=Currency.EUR, rate=Decimal('0.9200'))
+        ExchangeRate.objects.create(from_currency=Currency.MXN, to_currency=Currency.USD, rate=Decimal('0.0500'))
+        self.service = Service.objects.create(name='Mezcla', description='Mezcla', base_price_usd=Decimal('100.00'))
+
+    def test_direct_inverse_and_cross_rates(self):
+        matrix = get_matrix()
+        self.assertEqual(matrix.rate('USD', 'COP'), Decimal('4000.0000'))
+        self.assertEqual(matrix.rate('COP', 'USD'), Decimal('0.00025'))
+        self.assertEqual(matrix.rate('USD', 'MXN'), Decimal('20'))
+        # EUR -> USD -> COP, con la precisión completa de Decimal
+        self.assertEqual(matrix.rate('EUR', 'COP'), Decimal(1) / Decimal('0.92') * Decimal('4000'))
+        self.assertEqual(matrix.rate('MXN', 'EUR'), Decimal('0.0500') * Decimal('0.9200'))
+        self.assertEqual(matrix.rate('EUR', 'EUR'), Decimal('1'))
+
+    def test_direct_rate_wins_over_cross_rate(self):
+        matrix = RateMatrix({('USD', 'COP'): Decimal('4000'), ('USD', 'EUR'): Decimal('0.8'), ('EUR', 'COP'): Decimal('4900')})
+        self.assertEqual(matrix.rate('EUR', 'COP'), Decimal('4900'))
+        self.assertEqual(matrix.rate('COP', 'EUR'), Decimal(1) / Decimal('4900'))  # Inversa, no vía USD
+
+    def test_conversion_rounds_half_up_to_cents(self):
+        matrix = RateMatrix({('USD', 'COP'): Decimal('3999.9850')})
+        self.assertEqual(matrix.convert(Decimal('1.00'), 'USD', 'COP'), Decimal('3999.99'))
+        self.assertEqual(matrix.convert(Decimal('100.00'), 'COP', 'USD'), Decimal('0.03'))
+        # 100 EUR -> COP: 434782.6086... (sin redondear la tasa cruzada)
+        self.assertEqual(get_matrix().convert(Decimal('100.00'), 'EUR', 'COP'), Decimal('434782.61'))
+
+    def test_get_price_any_currency_without_queries_when_warm(self):
+        self.assertEqual(self.service.get_price(Currency.EUR), Decimal('92.00'))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.service.get_price(Currency.MXN), Decimal('2000.00'))
+            self.assertEqual(self.service.get_price(Currency.COP), Decimal('400000.00'))
+
+    def test_matrix_refreshes_when_a_rate_changes(self):
+        self.assertEqual(self.service.get_price(Currency.EUR), Decimal('92.00'))
+        ExchangeRate.objects.create(from_currency=Currency.USD, to_currency=Currency.EUR, rate=Decimal('0.8000'))
+        self.assertEqual(self.service.get_price(Currency.EUR), Decimal('80.00'))
+
+    def test_warm_matrix_survives_without_rate_changes(self):
+        self.assertEqual(self.service.get_price(Currency.EUR), Decimal('92.00'))
+        later = timezone.now() + timedelta(hours=1)
+        with mock.patch('payments.rate_matrix.timezone.now', return_value=later), self.assertNumQueries(0):
+            self.assertEqual(self.service.get_price(Currency.EUR), Decimal('92.00'))
+
+    def test_pairs_shared_under_matrix_version(self):
+        get_matrix()
+        rate_matrix._current = None  # Otro worker, misma versión
+        with self.assertNumQueries(0):
+            self.assertEqual(get_matrix().rate('USD', 'COP'), Decimal('4000.0000'))
+
+    @override_settings(
+        EXCHANGE_RATE_MAX_AGE_HOURS=72, EXCHANGE_RATE_STALE_POLICY='fallback',
+        EXCHANGE_RATE_FALLBACKS={'USD:EUR': Decimal('0.8500')},
+    )
+    def test_matrix_rebuilt_when_a_rate_expires(self):
+        ExchangeRate.objects.filter(to_currency=Currency.EUR).update(
+            effective_date=timezone.now() - timedelta(hours=71),
+        )
+        matrix = get_matrix()
+        self.assertEqual(matrix.rate('USD', 'EUR'), Decimal('0.9200'))
+        self.assertAlmostEqual(matrix.expires_at, timezone.now() + timedelta(hours=1), delta=timedelta(seconds=5))
+
+        later = timezone.now() + timedelta(hours=1, seconds=1)
+        with mock.patch('django.utils.timezone.now', return_value=later), self.assertNumQueries(0):
+            rebuilt = get_matrix()
+            self.assertEqual(rebuilt.rate('USD', 'EUR'), Decimal('0.8500'))
+            # Las demás tasas vencen a las 72 h de su creación
+            self.assertGreater(rebuilt.expires_at, later)
+            self.assertIs(get_matrix(), rebuilt)
+
+    def test_unconnected_currency_is_unavailable(self):
+        ExchangeRate.objects.filter(to_currency=Currency.EUR).delete()
+        with self.assertRaises(ExchangeRateUnavailable):
+            self.service.get_price(Currency.EUR)
+
+    def test_order_records_cross_rate(self):
+        order = Order(currency=Currency.EUR)
+        order.calculate_totals(self.service)
+        self.assertEqual(order.subtotal, Decimal('92.00'))
+        self.assertEqual(order.tax_amount, Decimal('0.00'))
+        self.assertEqual(order.exchange_rate, Decimal('0.9200'))
+
+    def test_order_subtotal_reproduces_from_recorded_rate(self):
+        # Solo EUR->USD: la inversa 1/1.0870 = 0.91996... se guarda como 0.9200
+        ExchangeRate.objects.filter(to_currency=Currency.EUR).delete()
+        ExchangeRate.objects.create(from_currency=Currency.EUR, to_currency=Currency.USD, rate=Decimal('1.0870'))
+        service = Service.objects.create(name='Master', description='Master', base_price_usd=Decimal('1500.00'))
+        order = Order(currency=Currency.EUR)
+        order.calculate_totals(service)
+        self.assertEqual(order.exchange_rate, Decimal('0.9200'))
+        self.assertEqual(order.subtotal, Decimal('1380.00'))
+        self.assertEqual(order.subtotal, (service.base_price_usd * order.exchange_rate).quantize(Decimal('0.01')))
+
+
+@override_settings(EXCHANGE_RATE_FALLBACKS={}, EXCHANGE_RATE_REFRESH_SECONDS=0)
+class ServiceCatalogAPITestCase(APITestCase):
+    """Catálogo cacheado con ETag"""
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('payments:service_catalog')
+        ExchangeRate.objects.create(rate=Decimal('4000.0000'))
+        self.mixing = Service.objects.create(
+            name='Mezcla', description='Mezcla por stems', base_price_usd=Decimal('150.00'),
+            base_price_cop=Decimal('600000.00'),
+        )
+        self.mastering = Service.objects.create(
+            name='Master', description='Masterización', base_price_usd=Decimal('60.00'),
+        )
+        Service.objects.create(name='Oculto', description='Inactivo', base_price_usd=Decimal('1.00'), is_active=False)
+
+    def test_catalog_payload(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        services = {service['name']: service for service in json.loads(response.content)}
+
+        self.assertEqual(set(services), {'Mezcla', 'Master'})
+        self.assertEqual(services['Mezcla']['prices'], {
+            'USD': {'price': '150.00', 'tax': '0.00', 'total': '150.00'},
+            'COP': {'price': '600000.00', 'tax': '114000.00', 'total': '714000.00'},
+        })
+        self.assertEqual(services['Master']['prices']['COP'], {
+            'price': '240000.00', 'tax': '45600.00', 'total': '285600.00',
+        })
+        self.assertEqual(services['Master']['id'], str(self.mastering.pk))
+
+    def test_warm_catalog_does_not_query_the_database(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_etag_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertTrue(etag.startswith('"'))
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=f'W/{etag}').status_code, 304)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+    def test_service_save_invalidates_catalog(self):
+        etag = self.client.get(self.url)['ETag']
+        self.mastering.base_price_usd = Decimal('70.00')
+        self.mastering.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b'"70.00"', response.content)
+
+    def test_exchange_rate_save_invalidates_catalog(self):
+        etag = self.client.get(self.url)['ETag']
+        ExchangeRate.objects.create(rate=Decimal('4100.0000'))
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b'"246000.00"', response.content)
+
+    @override_settings(
+        EXCHANGE_RATE_MAX_AGE_HOURS=72, EXCHANGE_RATE_STALE_POLICY='fallback',
+        EXCHANGE_RATE_FALLBACKS={'USD:COP': Decimal('4200.00')},
+    )
+    def test_rate_aging_past_max_age_refreshes_catalog(self):
+        ExchangeRate.objects.update(effective_date=timezone.now() - timedelta(hours=71, minutes=59, seconds=30))
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # La tasa supera EXCHANGE_RATE_MAX_AGE_HOURS sin que cambie ningún sello
+        with mock.patch('django.utils.timezone.now', return_value=timezone.now() + timedelta(seconds=60)):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b'"252000.00"', response.content)  # 60 USD a la tasa de respaldo
+
+    def test_warm_catalog_does_not_expire_on_a_timer(self):
+        etag = self.client.get(self.url)['ETag']
+        with mock.patch('django.utils.timezone.now', return_value=timezone.now() + timedelta(hours=1)), \
+                self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
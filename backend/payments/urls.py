@@ -0,0 +1,15 @@
+"""
+URL Configuration for the Payments API
+
+Endpoints:
+- GET /api/services/ - Active service catalog with USD/COP prices
+"""
+
+from django.urls import path
+from . import views
+
+app_name = 'payments'
+
+urlpatterns = [
+    path('services/', views.service_catalog, name='service_catalog'),
+]
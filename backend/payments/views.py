@@ -1,3 +1,41 @@
-from django.shortcuts import render
+"""
+Vistas de la API de pagos
 
-# Create your views here.
+- GET /api/services/ - Catálogo de servicios activos (ver catalog.py)
+"""
+
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import AllowAny
+
+from .catalog import get_catalog
+
+
+@api_view(['GET'])
+@authentication_classes([])  # Público: no se lee el token ni el usuario
+@permission_classes([AllowAny])
+def service_catalog(request):
+    """
+    Catálogo de servicios activos con precio, IVA y total en USD y COP.
+
+    El cuerpo sale ya serializado de la cache, con ETag fuerte; un
+    If-None-Match con el ETag vigente recibe 304 sin cuerpo.
+    """
+    etag, body = get_catalog()
+
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        # Comparación débil (RFC 9110): W/"x" equivale a "x"
+        if '*' in etags or etag in {tag.removeprefix('W/') for tag in etags}:
+            response = HttpResponseNotModified()
+            response['ETag'] = etag
+            response['Cache-Control'] = 'no-cache'
+            return response
+
+    response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    # El navegador revalida siempre: un 304 cuesta un par de lecturas de cache
+    response['Cache-Control'] = 'no-cache'
+    return response